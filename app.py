@@ -1,7 +1,23 @@
-from flask import Flask, render_template, request, redirect, url_for, jsonify, g
+from flask import Flask, Response, render_template, request, redirect, url_for, jsonify, g, stream_with_context
+import click
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from hashlib import sha1
+import json
 import mysql.connector
+import os
 import random
 import re
+from cache import ResponseCache
+from importer import IMPORT_FORMATS, import_tickets, iter_records
+from payout import GAIN_PERCENTAGES, distribute_payout
+from pool import ConnectionPool
+from simulator import simulate_draws
+from storage import DuplicatePlayerError, create_storage
+from scoring import (
+    NUMBER_PENALTY, STAR_PENALTY, build_players, counting_sort_players, greedy_distance, group_end, ranking_order,
+    score_pool, score_tickets_numpy, score_tickets_parallel, tie_groups
+)
 
 app = Flask(__name__)
 
@@ -11,18 +27,123 @@ app.config['DB_USER'] = 'root'
 app.config['DB_PASSWORD'] = ''
 app.config['DB_NAME'] = 'loto_db'
 
+# Pool de connexions (désactivé par défaut, une instance par worker)
+app.config['DB_POOL_ENABLED'] = False
+app.config['DB_POOL_SIZE'] = 5
+app.config['DB_POOL_MAX_OVERFLOW'] = 10
+app.config['DB_POOL_RECYCLE'] = 3600  # secondes avant de renouveler une connexion
+app.config['DB_POOL_PRE_PING'] = True
+app.config['DB_POOL_TIMEOUT'] = 30  # secondes d'attente maximale quand le pool est épuisé
+
+# Stockage des données : 'mysql', 'sqlite' (fichier en mode WAL) ou 'memory'
+app.config['STORAGE_BACKEND'] = 'mysql'
+app.config['SQLITE_PATH'] = 'loto.db'
+app.config['BULK_INSERT_BATCH_SIZE'] = 1000  # lignes par instruction INSERT multi-lignes
+app.config['GENERATE_PLAYERS_RETRIES'] = 2  # nouvelles tentatives de /generate_players si un nom est déjà pris
+
+# Taille maximale d'une page de /all_players
+app.config['PLAYERS_PAGE_MAX'] = 1000
+
+# Réponses JSON en flux (/ranking, /all_players) : toujours, ou seulement sur ?stream=1 / ?format=ndjson
+app.config['STREAM_JSON'] = False
+app.config['STREAM_CHUNK_SIZE'] = 1000  # lignes lues par fetchmany
+
+# Tirages exécutés en arrière-plan (POST /draws) : nombre de tirages calculés simultanément par worker
+app.config['DRAW_WORKERS'] = 1
+
+# Nombre maximal de participants (les chemins de comptage, d'inscription, de calcul et de lecture
+# sont prévus pour plusieurs millions de grilles, voir benchmarks/bench_capacity.py)
+app.config['MAX_PLAYERS'] = 100
+
+# Nombre maximal de joueurs affichés sur la page de classement
+app.config['CLASSEMENT_MAX_ROWS'] = 1000
+
+# Nombre maximal de grilles acceptées par requête sur /add_players
+app.config['BATCH_MAX_TICKETS'] = 10000
+
+# Import de fichiers de grilles (CSV ou NDJSON) : lignes par transaction, erreurs détaillées renvoyées
+app.config['IMPORT_BATCH_SIZE'] = 5000
+app.config['IMPORT_MAX_ERRORS'] = 100
+
+# Cache des réponses JSON (/ranking, /all_players) indexé par la version des données
+app.config['RESPONSE_CACHE_ENABLED'] = True
+app.config['RESPONSE_CACHE_MAX_ENTRIES'] = 256
+app.config['RESPONSE_CACHE_TTL'] = 60  # secondes
+app.config['RESPONSE_CACHE_MAX_BYTES'] = 64 * 1024 * 1024  # total par worker
+app.config['RESPONSE_CACHE_MAX_ENTRY_BYTES'] = 1024 * 1024  # réponses plus grosses jamais gardées
+
+# Encodage des grilles : 'csv' (colonnes texte) ou 'bitmask' (masques entiers, voir « flask migrate-bitmask »).
+# Un masque ne garde pas l'ordre de saisie : les numéros sont relus en ordre croissant.
+app.config['TICKET_ENCODING'] = 'csv'
+
+# Moteur de calcul des résultats : 'python' (historique), 'numpy' (vectorisé)
+# ou 'parallel' (vectorisé, réparti sur plusieurs processus, voir benchmarks/bench_parallel.py).
+# Avec 'numpy' et 'parallel', run_draw classe les tableaux de mesures sans construire tout le classement (score_draw)
+app.config['SCORING_ENGINE'] = 'python'
+app.config['SCORING_WORKERS'] = None  # None : un processus par cœur
+app.config['SCORING_MIN_SHARD'] = 50000  # grilles minimum par processus
+
+# Tri du classement du moteur 'python' : 'sort' (list.sort sur un tuple) ou 'counting'
+# (tri par paquets sur une clé entière, voir benchmarks/bench_ranking.py)
+app.config['RANKING_SORT'] = 'sort'
+
+# Calcul des montants : 'float' (historique, arrondi par groupe d'égalité) ou 'cents' (centimes entiers,
+# tables de pourcentages précalculées, voir payout.py)
+app.config['PAYOUT_ENGINE'] = 'float'
+
+# Simulation de tirages sur les grilles enregistrées (GET /simulate, « flask simulate »)
+app.config['SIMULATION_MAX_DRAWS'] = 100000  # par requête HTTP
+app.config['SIMULATION_BATCH_ROWS'] = 500000  # couples (tirage, grille) évalués par lot
+
 # Charger une configuration spécifique si nécessaire
 app.config.from_pyfile('config.py', silent=True)
 
+# Ouvrir une nouvelle connexion MySQL
+def connect_db():
+    return mysql.connector.connect(
+        host=app.config['DB_HOST'],
+        user=app.config['DB_USER'],
+        password=app.config['DB_PASSWORD'],
+        database=app.config['DB_NAME']
+    )
+
+# Pool du processus courant (recréé après un fork pour que chaque worker ait le sien)
+_pool = None
+_pool_pid = None
+
+def get_pool():
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = ConnectionPool(
+            connect_db,
+            size=app.config['DB_POOL_SIZE'],
+            max_overflow=app.config['DB_POOL_MAX_OVERFLOW'],
+            recycle=app.config['DB_POOL_RECYCLE'],
+            pre_ping=app.config['DB_POOL_PRE_PING'],
+            timeout=app.config['DB_POOL_TIMEOUT']
+        )
+        _pool_pid = os.getpid()
+    return _pool
+
+# Exécuteur des tirages en arrière-plan, recréé dans chaque processus (comme le pool)
+_draw_executor = None
+_draw_executor_pid = None
+
+def get_draw_executor():
+    global _draw_executor, _draw_executor_pid
+    if _draw_executor is None or _draw_executor_pid != os.getpid():
+        _draw_executor = ThreadPoolExecutor(max_workers=app.config['DRAW_WORKERS'], thread_name_prefix='draw')
+        _draw_executor_pid = os.getpid()
+    return _draw_executor
+
 # Fonction pour obtenir la connexion à la base de données
 def get_db():
     if 'db' not in g:
-        g.db = mysql.connector.connect(
-            host=app.config['DB_HOST'],
-            user=app.config['DB_USER'],
-            password=app.config['DB_PASSWORD'],
-            database=app.config['DB_NAME']
-        )
+        if app.config['DB_POOL_ENABLED']:
+            g.db = get_pool().checkout()
+            g.db_pooled = True
+        else:
+            g.db = connect_db()
     return g.db
 
 # Fonction pour obtenir un curseur
@@ -33,11 +154,179 @@ def get_cursor():
 @app.teardown_appcontext
 def close_db(exception):
     db = g.pop('db', None)
+    pooled = g.pop('db_pooled', False)
     if db is not None:
-        db.close()
+        if pooled:
+            get_pool().checkin(db)
+        else:
+            db.close()
+
+# Stockage des joueurs, de la cagnotte et des tirages (créé une fois par application)
+def get_storage():
+    if 'loto_storage' not in app.extensions:
+        app.extensions['loto_storage'] = create_storage(app.config, get_db)
+    return app.extensions['loto_storage']
+
+# Recréer le stockage après un changement de configuration (tests, benchmarks)
+def reset_storage():
+    app.extensions.pop('loto_storage', None)
+    app.extensions.pop('loto_response_cache', None)
+    return get_storage()
+
+# Cache des réponses du worker courant
+def get_response_cache():
+    if 'loto_response_cache' not in app.extensions:
+        app.extensions['loto_response_cache'] = ResponseCache(
+            max_entries=app.config['RESPONSE_CACHE_MAX_ENTRIES'],
+            ttl=app.config['RESPONSE_CACHE_TTL'],
+            max_bytes=app.config['RESPONSE_CACHE_MAX_BYTES'],
+            max_entry_bytes=app.config['RESPONSE_CACHE_MAX_ENTRY_BYTES']
+        )
+    return app.extensions['loto_response_cache']
+
+# Créer les tables MySQL si elles n'existent pas
+@app.cli.command('init-db')
+def init_db_command():
+    get_storage().init_schema()
+    print("Base de données initialisée.")
+
+# Ajouter et remplir les colonnes de masques à partir des grilles CSV
+@app.cli.command('migrate-bitmask')
+def migrate_bitmask_command():
+    migrated = get_storage().migrate_bitmask()
+    print(f"{migrated} joueurs migrés vers l'encodage par masques.")
+
+# Importer un fichier de grilles avec les règles de add_player
+def run_import(stream, fmt):
+    return import_tickets(
+        get_storage(),
+        iter_records(stream, fmt),
+        validate_ticket,
+        capacity=app.config['MAX_PLAYERS'],
+        batch_size=app.config['IMPORT_BATCH_SIZE'],
+        max_errors=app.config['IMPORT_MAX_ERRORS']
+    )
 
-# Définir les pourcentages de gain
-GAIN_PERCENTAGES = [40, 20, 12, 7, 6, 5, 4, 3, 2, 1]  # Pour les 10 premiers
+# Importer un fichier CSV (name,chosen_numbers,chosen_stars) ou NDJSON
+@app.cli.command('import-players')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS), help="Format du fichier (déduit de l'extension par défaut).")
+def import_players_command(path, fmt):
+    fmt = fmt or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+    with open(path, 'rb') as stream:
+        try:
+            report = run_import(stream, fmt)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+    for error in report['errors']:
+        print(f"Ligne {error['line']} : {error['error_message']}")
+    print(f"{report['inserted']} joueurs importés, {report['rejected']} lignes rejetées sur {report['read']} "
+          f"en {report['elapsed']:.2f} s ({report['rows_per_second']:.0f} lignes/s).")
+
+# Simuler des tirages sur les grilles enregistrées, sans en publier aucun
+def run_simulation(draws, seed=None, top=20):
+    storage = get_storage()
+    return simulate_draws(
+        storage.get_tickets(),
+        storage.ticket_encoding,
+        get_total_prize(),
+        draws,
+        seed=seed,
+        batch_rows=app.config['SIMULATION_BATCH_ROWS'],
+        top=top
+    )
+
+# Estimer la répartition des gains sur N tirages aléatoires (rapport JSON)
+@app.cli.command('simulate')
+@click.option('--draws', type=click.IntRange(min=1), default=10000, show_default=True, help="Nombre de tirages simulés.")
+@click.option('--seed', type=int, help="Graine du générateur aléatoire.")
+@click.option('--top', type=click.IntRange(min=0), default=20, show_default=True, help="Joueurs listés.")
+def simulate_command(draws, seed, top):
+    try:
+        report = run_simulation(draws, seed, top)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+# Statistiques du pool de connexions du worker courant
+@app.route('/pool_stats', methods=['GET'])
+def pool_stats():
+    if not app.config['DB_POOL_ENABLED']:
+        return jsonify({'enabled': False})
+    stats = get_pool().stats()
+    stats['enabled'] = True
+    stats['pid'] = os.getpid()
+    return jsonify(stats)
+
+# Statistiques du cache de réponses du worker courant
+@app.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    if not app.config['RESPONSE_CACHE_ENABLED']:
+        return jsonify({'enabled': False})
+    stats = get_response_cache().stats()
+    stats['enabled'] = True
+    stats['pid'] = os.getpid()
+    return jsonify(stats)
+
+# Réponses conditionnelles pilotées par la version des données : une ressource inchangée est servie
+# en 304 sans lire la table players. Seul l'ETag est comparé : Last-Modified n'a qu'une précision
+# à la seconde, et une écriture dans la même seconde qu'une réponse ne le changerait pas.
+def versioned(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version, updated_at = get_storage().get_data_version()
+        g.data_version = version
+        digest = sha1(f"{request.endpoint}?{request.query_string.decode()}".encode()).hexdigest()[:12]
+        etag = f"{version}-{digest}"
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        if updated_at is not None:
+            response.last_modified = updated_at
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return wrapper
+
+# Réponses JSON gardées en mémoire sous forme sérialisée, par route, paramètres et version :
+# une écriture change la version, les anciennes entrées ne sont donc plus jamais servies
+def cached(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not app.config['RESPONSE_CACHE_ENABLED']:
+            return view(*args, **kwargs)
+        version = g.get('data_version')
+        if version is None:
+            version = get_storage().get_data_version()[0]
+        key = (request.endpoint, request.query_string, version)
+        cache = get_response_cache()
+        entry = cache.get(key)
+        if entry is not None:
+            body, mimetype, headers = entry
+            return Response(body, mimetype=mimetype, headers=headers)
+
+        response = app.make_response(view(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed:
+            headers = [(name, value) for name, value in response.headers if name.startswith('X-')]
+            cache.put(key, (response.get_data(), response.mimetype, headers))
+        return response
+    return wrapper
+
+# Vider le cache de réponses après une route d'écriture
+def invalidates_cache(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            return view(*args, **kwargs)
+        finally:
+            if 'loto_response_cache' in app.extensions:
+                get_response_cache().clear()
+    return wrapper
 
 # Page d'accueil
 @app.route('/')
@@ -51,186 +340,366 @@ def regles():
 
 # Page de tirage
 @app.route('/index')
+@versioned
 def index():
-    cursor = get_cursor()
     # Vérifier le nombre total de joueurs
-    cursor.execute("SELECT COUNT(*) FROM players")
-    total_players = cursor.fetchone()[0]
+    total_players = get_storage().count_players()
 
-    # Calculer combien de places restent avant d'atteindre 100, minimum à 0
-    remaining_slots = max(0, 100 - total_players)
+    # Calculer combien de places restent avant d'atteindre la capacité, minimum à 0
+    remaining_slots = max(0, app.config['MAX_PLAYERS'] - total_players)
 
     return render_template('index.html', total_players=total_players, remaining_slots=remaining_slots)
 
 # Page de classement
 @app.route('/classement')
+@versioned
 def classement():
-    cursor = get_cursor()
-    query = "SELECT amount FROM prize LIMIT 1"
-    cursor.execute(query)
-    result = cursor.fetchone()
-    prize_amount = result[0] if result else 3000000  # Si non défini, valeur par défaut
+    storage = get_storage()
+    prize_amount = storage.get_prize()  # Si non défini, valeur par défaut
 
-    # Récupérer la liste des joueurs
-    cursor.execute("SELECT * FROM players")
-    players = cursor.fetchall()
+    # Récupérer la liste des joueurs, bornée pour rester affichable avec un grand nombre de grilles
+    players = storage.get_players(limit=app.config['CLASSEMENT_MAX_ROWS'])
 
-    # Vérifier s'il y a des joueurs
-    total_players = len(players)
+    # Vérifier s'il y a des joueurs (compteur maintenu, sans parcourir la table)
+    total_players = storage.count_players()
 
     # Passer la liste des joueurs et le total au template
     return render_template('classement.html', prize=prize_amount, players=players, total_players=total_players)
 
+# Expression régulière pour n'autoriser que les lettres et les espaces (compilée une seule fois)
+NAME_PATTERN = re.compile(r'^[A-Za-zÀ-ÖØ-öø-ÿ\s]+$')
+
+# Numéros d'une grille : chaîne "3,12,27" (formulaire) ou liste d'entiers (JSON)
+def ticket_values(value):
+    if isinstance(value, str):
+        return [int(v) for v in value.split(',') if v]
+    if isinstance(value, list) and all(type(v) is int for v in value):
+        return value
+    raise ValueError(value)
+
+# Valider une grille avec les règles de add_player, en un seul parcours des numéros.
+# Renvoie (message d'erreur, None) ou (None, (numéros, étoiles)) au format CSV normalisé.
+def validate_ticket(name, chosen_numbers, chosen_stars):
+    if not isinstance(name, str) or not NAME_PATTERN.match(name):
+        return "Le nom doit contenir uniquement des lettres.", None
+
+    try:
+        numbers = ticket_values(chosen_numbers)
+        stars = ticket_values(chosen_stars)
+    except ValueError:
+        return "Veuillez entrer des numéros valides.", None
+
+    if len(numbers) != 5 or len(stars) != 2:
+        return "Vous devez choisir exactement 5 numéros et 2 étoiles.", None
+
+    # Bornes et unicité vérifiées ensemble, l'unicité à l'aide d'un masque de bits
+    numbers_in_range = numbers_unique = True
+    mask = 0
+    for n in numbers:
+        if not 1 <= n <= 49:
+            numbers_in_range = False
+        elif mask >> n & 1:
+            numbers_unique = False
+        else:
+            mask |= 1 << n
+    stars_in_range = stars_unique = True
+    mask = 0
+    for s in stars:
+        if not 1 <= s <= 9:
+            stars_in_range = False
+        elif mask >> s & 1:
+            stars_unique = False
+        else:
+            mask |= 1 << s
+
+    # Même ordre de priorité des messages que les vérifications successives d'origine
+    if not numbers_in_range:
+        return "Les numéros doivent être entre 1 et 49.", None
+    if not stars_in_range:
+        return "Les étoiles doivent être entre 1 et 9.", None
+    if not numbers_unique:
+        return "Les numéros doivent être uniques.", None
+    if not stars_unique:
+        return "Les étoiles doivent être uniques.", None
+
+    return None, (",".join(map(str, numbers)), ",".join(map(str, stars)))
+
 # Route pour ajouter un joueur dans la base de données
 @app.route('/add_player', methods=['POST'])
+@invalidates_cache
 def add_player():
     name = request.form['name']
     chosen_numbers = request.form['chosen_numbers']
     chosen_stars = request.form['chosen_stars']
 
-    # Expression régulière pour n'autoriser que les lettres et les espaces
-    if not re.match(r'^[A-Za-zÀ-ÖØ-öø-ÿ\s]+$', name):
-        return render_template('index.html', error_message="Le nom doit contenir uniquement des lettres.", remaining_slots=get_remaining_slots())
-
-    # Validation des numéros et étoiles choisis
-    try:
-        chosen_numbers_list = [int(n) for n in chosen_numbers.split(',') if n]
-        chosen_stars_list = [int(s) for s in chosen_stars.split(',') if s]
-    except ValueError:
-        return render_template('index.html', error_message="Veuillez entrer des numéros valides.", remaining_slots=get_remaining_slots())
-
-    if len(chosen_numbers_list) != 5 or len(chosen_stars_list) != 2:
-        return render_template('index.html', error_message="Vous devez choisir exactement 5 numéros et 2 étoiles.", remaining_slots=get_remaining_slots())
+    # Validation du nom, des numéros et des étoiles en un seul passage
+    error_message, ticket = validate_ticket(name, chosen_numbers, chosen_stars)
+    if error_message:
+        return render_template('index.html', error_message=error_message, remaining_slots=get_remaining_slots())
+    chosen_numbers, chosen_stars = ticket
 
-    if not all(1 <= n <= 49 for n in chosen_numbers_list):
-        return render_template('index.html', error_message="Les numéros doivent être entre 1 et 49.", remaining_slots=get_remaining_slots())
+    storage = get_storage()
 
-    if not all(1 <= s <= 9 for s in chosen_stars_list):
-        return render_template('index.html', error_message="Les étoiles doivent être entre 1 et 9.", remaining_slots=get_remaining_slots())
+    # Vérifier le nombre total de joueurs dans la base de données
+    total_players = storage.count_players()
 
-    if len(set(chosen_numbers_list)) != 5:
-        return render_template('index.html', error_message="Les numéros doivent être uniques.", remaining_slots=get_remaining_slots())
+    # Limite du nombre de participants
+    max_players = app.config['MAX_PLAYERS']
+    if total_players >= max_players:
+        return render_template('index.html', error_message=f"Le nombre maximum de {max_players} participants a été atteint.", remaining_slots=get_remaining_slots())
 
-    if len(set(chosen_stars_list)) != 2:
-        return render_template('index.html', error_message="Les étoiles doivent être uniques.", remaining_slots=get_remaining_slots())
+    gains = 0.00
 
-    cursor = get_cursor()
+    # Insérer le joueur directement : l'index unique sur le nom détecte les doublons
+    try:
+        storage.add_player(name, chosen_numbers, chosen_stars, gains)
+    except DuplicatePlayerError:
+        return render_template('index.html', error_message=f"Un joueur avec le nom '{name}' existe déjà.", remaining_slots=max(0, max_players - total_players))
 
-    # Vérifier si un joueur avec ce nom existe déjà
-    cursor.execute("SELECT * FROM players WHERE name = %s", (name,))
-    existing_player = cursor.fetchone()
+    # Recalculer le nombre de places restantes, sans nouvelle requête
+    remaining_slots = max(0, max_players - (total_players + 1))
 
-    if existing_player:
-        return render_template('index.html', error_message=f"Un joueur avec le nom '{name}' existe déjà.", remaining_slots=get_remaining_slots())
+    return render_template('index.html', success_message=f"Le joueur '{name}' a été ajouté avec succès.", remaining_slots=remaining_slots)
 
-    # Vérifier le nombre total de joueurs dans la base de données
-    cursor.execute("SELECT COUNT(*) FROM players")
-    total_players = cursor.fetchone()[0]
 
-    # Limite de 100 participants
-    if total_players >= 100:
-        return render_template('index.html', error_message="Le nombre maximum de 100 participants a été atteint.", remaining_slots=get_remaining_slots())
+# Route JSON pour enregistrer un lot de grilles : [{"name", "chosen_numbers", "chosen_stars"}, ...]
+# Les grilles valides sont insérées dans une seule transaction, les autres sont signalées une par une
+@app.route('/add_players', methods=['POST'])
+@invalidates_cache
+def add_players():
+    tickets = request.get_json(silent=True)
+    if not isinstance(tickets, list):
+        return jsonify({'error_message': 'Le corps de la requête doit être une liste de grilles'}), 400
+    if len(tickets) > app.config['BATCH_MAX_TICKETS']:
+        return jsonify({'error_message': f"Un lot ne peut pas dépasser {app.config['BATCH_MAX_TICKETS']} grilles"}), 400
+
+    storage = get_storage()
+    total_players = storage.count_players()
+    max_players = app.config['MAX_PLAYERS']
+    remaining_slots = max(0, max_players - total_players)
+
+    errors = []
+    rows = []
+    indexes = []
+    seen = set()
+    for index, ticket in enumerate(tickets):
+        if not isinstance(ticket, dict):
+            errors.append({'index': index, 'error_message': 'Grille invalide'})
+            continue
+        name = ticket.get('name')
+        error_message, values = validate_ticket(name, ticket.get('chosen_numbers'), ticket.get('chosen_stars'))
+        if error_message is None and name in seen:
+            error_message = f"Un joueur avec le nom '{name}' existe déjà."
+        if error_message:
+            errors.append({'index': index, 'name': name, 'error_message': error_message})
+            continue
+        seen.add(name)
+        rows.append((name, values[0], values[1], 0.00))
+        indexes.append(index)
+
+    # Noms déjà enregistrés : une requête par lot au lieu d'une par grille
+    existing = storage.existing_names(seen)
+    accepted = []
+    for index, row in zip(indexes, rows):
+        if row[0] in existing:
+            errors.append({'index': index, 'name': row[0],
+                           'error_message': f"Un joueur avec le nom '{row[0]}' existe déjà."})
+        elif len(accepted) >= remaining_slots:
+            errors.append({'index': index, 'name': row[0],
+                           'error_message': f"Le nombre maximum de {max_players} participants a été atteint."})
+        else:
+            accepted.append(row)
+    errors.sort(key=lambda error: error['index'])
 
-    gains = 0.00
+    try:
+        inserted = storage.add_players(accepted) if accepted else 0
+    except DuplicatePlayerError:
+        # Un nom a été pris entre la vérification et l'insertion : rien n'a été inséré
+        return jsonify({'error_message': "Un des noms du lot vient d'être enregistré, veuillez réessayer.",
+                        'inserted': 0}), 409
 
-    # Requête SQL pour insérer le joueur dans la base de données
-    query = "INSERT INTO players (name, chosen_numbers, chosen_stars, gains) VALUES (%s, %s, %s, %s)"
-    cursor.execute(query, (name, chosen_numbers, chosen_stars, gains))
-    get_db().commit()
+    return jsonify({
+        'inserted': inserted,
+        'rejected': len(errors),
+        'errors': errors,
+        'remaining_slots': remaining_slots - inserted
+    })
 
-    # Recalculer le nombre de places restantes
-    remaining_slots = get_remaining_slots()
 
-    return render_template('index.html', success_message=f"Le joueur '{name}' a été ajouté avec succès.", remaining_slots=remaining_slots)
+# Route pour importer un fichier de grilles envoyé en multipart (champ 'file') ou brut (?format=csv|ndjson)
+@app.route('/import_players', methods=['POST'])
+@invalidates_cache
+def import_players():
+    upload = request.files.get('file')
+    fmt = request.args.get('format')
+    if fmt is None:
+        filename = upload.filename if upload else ''
+        ndjson = filename.endswith(('.ndjson', '.jsonl')) or request.mimetype == 'application/x-ndjson'
+        fmt = 'ndjson' if ndjson else 'csv'
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({'error_message': 'Format de fichier invalide'}), 400
+
+    # Le fichier est lu par blocs : la mémoire ne dépend pas de sa taille
+    try:
+        report = run_import(upload.stream if upload else request.stream, fmt)
+    except ValueError as e:
+        return jsonify({'error_message': str(e)}), 400
+    return jsonify(report)
 
 
 def get_remaining_slots():
-    cursor = get_cursor()
-    cursor.execute("SELECT COUNT(*) FROM players")
-    total_players = cursor.fetchone()[0]
-    remaining_slots = max(0, 100 - total_players)
+    total_players = get_storage().count_players()
+    remaining_slots = max(0, app.config['MAX_PLAYERS'] - total_players)
     return remaining_slots
 
 
-# Route pour récupérer le classement
+# Convertir une ligne du classement en dictionnaire
+def ranking_entry(storage, row):
+    return {
+        'name': row[0],
+        'chosen_numbers': storage.decode(row[1]),
+        'chosen_stars': storage.decode(row[2]),
+        'gains': float(row[3]),
+        'matching_numbers': storage.decode(row[4]),
+        'matching_stars': storage.decode(row[5]),
+        'proximity_numbers': int(row[6]),
+        'proximity_stars': int(row[7])
+    }
+
+# Convertir une ligne de la liste des joueurs en dictionnaire
+def player_entry(storage, row):
+    return {
+        'name': row[1],
+        'chosen_numbers': storage.decode(row[2]),
+        'chosen_stars': storage.decode(row[3])
+    }
+
+# La réponse doit-elle être envoyée au fil de la lecture ? (?stream=1 ou ?format=ndjson)
+def wants_stream():
+    return (
+        app.config['STREAM_JSON'] or
+        request.args.get('stream') == '1' or
+        request.args.get('format') == 'ndjson'
+    )
+
+# Réponse JSON générée paquet par paquet : tableau JSON découpé, ou NDJSON (un objet par ligne)
+def stream_json(storage, chunks, to_entry):
+    ndjson = request.args.get('format') == 'ndjson'
+
+    def generate():
+        dumps = app.json.dumps
+        if ndjson:
+            for rows in chunks:
+                yield "".join(dumps(to_entry(storage, row)) + "\n" for row in rows)
+            return
+        separator = "["
+        for rows in chunks:
+            yield separator + ",".join(dumps(to_entry(storage, row)) for row in rows)
+            separator = ","
+        yield "[]" if separator == "[" else "]"
+
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+# Route pour récupérer le classement (?limit=<n>, 10 par défaut) du tirage courant ou d'un tirage passé (?draw=<id>)
 @app.route('/ranking', methods=['GET'])
+@versioned
+@cached
 def get_ranking():
-    cursor = get_cursor()
-    query = """
-        SELECT 
-            name, 
-            chosen_numbers, 
-            chosen_stars, 
-            gains, 
-            IFNULL(matching_numbers, ''), 
-            IFNULL(matching_stars, ''), 
-            IFNULL(proximity_numbers, 0), 
-            IFNULL(proximity_stars, 0) 
-        FROM players 
-        ORDER BY gains DESC, proximity_numbers ASC, proximity_stars ASC
-    """
-    cursor.execute(query)
-    results = cursor.fetchall()
+    try:
+        limit = int(request.args.get('limit', 10))
+        draw_id = request.args.get('draw')
+        draw_id = int(draw_id) if draw_id is not None else None
+    except ValueError:
+        return jsonify({'error_message': 'Limite invalide'}), 400
+    # Réponse complète (mise en cache) bornée comme les pages de /all_players ; le flux n'a pas de plafond
+    if limit < 1 or (limit > app.config['PLAYERS_PAGE_MAX'] and not wants_stream()):
+        return jsonify({'error_message': 'Limite invalide'}), 400
+
+    storage = get_storage()
+    if draw_id is not None:
+        # Un tirage non publié (en attente, en cours ou en échec) n'a pas de classement consultable
+        draw = storage.get_draw(draw_id)
+        if draw is None or draw['status'] != 'published':
+            return jsonify({'error_message': 'Tirage introuvable'}), 404
+    if wants_stream():
+        chunks = storage.iter_ranking(limit, app.config['STREAM_CHUNK_SIZE'], draw_id=draw_id)
+        return stream_json(storage, chunks, ranking_entry)
+
+    results = storage.get_ranking(limit=limit, draw_id=draw_id)
 
     ranking = []
     for row in results:
-        chosen_numbers = [int(num) for num in row[1].split(',') if num]
-        chosen_stars = [int(star) for star in row[2].split(',') if star]
-        matching_numbers = [int(num) for num in row[4].split(',') if num]
-        matching_stars = [int(star) for star in row[5].split(',') if star]
+        ranking.append(ranking_entry(storage, row))
 
-        ranking.append({
-            'name': row[0],
-            'chosen_numbers': chosen_numbers,
-            'chosen_stars': chosen_stars,
-            'gains': float(row[3]),
-            'matching_numbers': matching_numbers,
-            'matching_stars': matching_stars,
-            'proximity_numbers': int(row[6]),
-            'proximity_stars': int(row[7])
-        })
+    return jsonify(ranking)
 
-    # Limiter à 10 joueurs pour le classement
-    ranking = ranking[:10]
+# Route pour lister les tirages publiés, du plus récent au plus ancien (?before=<id>&limit=<n>)
+@app.route('/draws', methods=['GET'])
+@versioned
+@cached
+def get_draws():
+    try:
+        before = request.args.get('before')
+        before = int(before) if before is not None else None
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return jsonify({'error_message': 'Paramètres de pagination invalides'}), 400
+    if not 1 <= limit <= app.config['PLAYERS_PAGE_MAX']:
+        return jsonify({'error_message': 'Paramètres de pagination invalides'}), 400
 
-    return jsonify(ranking)
+    draws = get_storage().list_draws(before=before, limit=limit)
+    response = jsonify(draws)
+    if len(draws) == limit:
+        response.headers['X-Next-Cursor'] = str(draws[-1]['id'])
+    return response
 
-# Route pour récupérer tous les joueurs (sans limite)
+# Route pour récupérer les joueurs, tous ou par pages (?after=<curseur>&limit=<n>)
 @app.route('/all_players', methods=['GET'])
+@versioned
+@cached
 def get_all_players():
-    cursor = get_cursor()
-    # Utilisation de CAST pour extraire le numéro dans le nom
-    query = """
-        SELECT name, chosen_numbers, chosen_stars 
-        FROM players 
-        ORDER BY CAST(SUBSTRING(name, 8) AS UNSIGNED) ASC
-    """
-    cursor.execute(query)
-    results = cursor.fetchall()
+    try:
+        after = int(request.args.get('after', 0))
+        limit = request.args.get('limit')
+        limit = int(limit) if limit is not None else None
+    except ValueError:
+        return jsonify({'error_message': 'Paramètres de pagination invalides'}), 400
+    if after < 0 or (limit is not None and not 1 <= limit <= app.config['PLAYERS_PAGE_MAX']):
+        return jsonify({'error_message': 'Paramètres de pagination invalides'}), 400
+
+    # Joueurs triés par clé primaire, à partir du curseur
+    storage = get_storage()
+
+    # Liste complète : lecture par paquets sans tout charger en mémoire
+    if limit is None and wants_stream():
+        return stream_json(storage, storage.iter_players(after, None, app.config['STREAM_CHUNK_SIZE']), player_entry)
+
+    results = storage.list_players(after=after, limit=limit)
 
     players = []
     for row in results:
-        players.append({
-            'name': row[0],
-            'chosen_numbers': list(map(int, row[1].split(','))),
-            'chosen_stars': list(map(int, row[2].split(',')))
-        })
+        players.append(player_entry(storage, row))
 
-    return jsonify(players)
+    response = jsonify(players)
+    # Curseur de la page suivante (absent sur la dernière page)
+    if limit is not None and len(results) == limit:
+        response.headers['X-Next-Cursor'] = str(results[-1][0])
+    return response
 
 # Route pour générer aléatoirement des joueurs avec des numéros et étoiles
 @app.route('/generate_players', methods=['POST'])
+@invalidates_cache
 def generate_players():
     num_players = int(request.form['num_players'])
 
-    cursor = get_cursor()
+    storage = get_storage()
 
     # Vérifier le nombre total de joueurs actuels
-    cursor.execute("SELECT COUNT(*) FROM players")
-    total_players = cursor.fetchone()[0]
+    total_players = storage.count_players()
 
     # Calculer combien de joueurs peuvent encore être ajoutés
-    remaining_slots = max(0, 100 - total_players)
+    remaining_slots = max(0, app.config['MAX_PLAYERS'] - total_players)
 
     # Si aucune place disponible, afficher un message d'erreur
     if remaining_slots == 0:
@@ -248,25 +717,33 @@ def generate_players():
             remaining_slots=remaining_slots
         )
 
-    # Ajouter les joueurs si toutes les conditions sont satisfaites
-    for i in range(1, num_players + 1):
-        player_num = total_players + i
-        name = f"Joueur_{player_num}"
-        chosen_numbers_list = random.sample(range(1, 50), 5)
-        chosen_numbers = ",".join(map(str, chosen_numbers_list))
-        chosen_stars_list = random.sample(range(1, 10), 2)
-        chosen_stars = ",".join(map(str, chosen_stars_list))
-        gains = 0.00
-
-        query = "INSERT INTO players (name, chosen_numbers, chosen_stars, gains) VALUES (%s, %s, %s, %s)"
-        cursor.execute(query, (name, chosen_numbers, chosen_stars, gains))
-
-    get_db().commit()
+    # Joueurs générés à la volée et insérés par lots en une seule transaction : la mémoire reste bornée
+    # quelle que soit la capacité, et un échec n'insère aucun joueur
+    def generated_rows(first):
+        for player_num in range(first, first + num_players):
+            chosen_numbers = ",".join(map(str, random.sample(range(1, 50), 5)))
+            chosen_stars = ",".join(map(str, random.sample(range(1, 10), 2)))
+            yield f"Joueur_{player_num}", chosen_numbers, chosen_stars, 0.00
+
+    # Deux requêtes simultanées lisent le même nombre de joueurs et génèrent les mêmes noms :
+    # la seconde recommence avec des numéros pris après le plus grand id enregistré
+    first = total_players + 1
+    for _ in range(app.config['GENERATE_PLAYERS_RETRIES'] + 1):
+        try:
+            inserted = storage.add_players(generated_rows(first))
+            break
+        except DuplicatePlayerError:
+            first = storage.max_player_id() + 1
+    else:
+        return render_template(
+            'index.html',
+            error_message="Certains noms de joueurs générés existent déjà, aucun joueur n'a été ajouté. Veuillez réessayer.",
+            remaining_slots=remaining_slots
+        )
 
-    # Recalculer après l'ajout
-    cursor.execute("SELECT COUNT(*) FROM players")
-    total_players = cursor.fetchone()[0]
-    remaining_slots = max(0, 100 - total_players)
+    # Recalculer après l'ajout, sans nouvelle requête
+    total_players += inserted
+    remaining_slots = max(0, app.config['MAX_PLAYERS'] - total_players)
 
     # Créer le message de succès
     success_message = f"{num_players} joueurs ont été générés avec succès."
@@ -279,20 +756,20 @@ def generate_players():
 
 # Route pour supprimer tous les joueurs
 @app.route('/delete_players', methods=['POST'])
+@invalidates_cache
 def delete_players():
-    cursor = get_cursor()
     # Suppression de tous les joueurs
-    cursor.execute("DELETE FROM players")
-    get_db().commit()
+    get_storage().delete_players()
 
-    # Recalculer le nombre de places restantes (ici 100 après suppression)
-    remaining_slots = 100  # Après suppression, il reste 100 places
+    # Après suppression, toutes les places sont de nouveau disponibles
+    remaining_slots = app.config['MAX_PLAYERS']
 
     # Rendre la page index avec les grilles réinitialisées
     return render_template('index.html', success_message="Tous les joueurs ont été supprimés avec succès.", remaining_slots=remaining_slots)
 
 # Route pour modifier la cagnotte
 @app.route('/update_prize', methods=['POST'])
+@invalidates_cache
 def update_prize():
     try:
         new_prize = request.json.get('prize')
@@ -301,11 +778,8 @@ def update_prize():
         if not new_prize or not new_prize.isdigit():
             return jsonify({'error_message': 'Montant invalide'}), 400
 
-        cursor = get_cursor()
         # Vérification et mise à jour de la cagnotte dans la base de données
-        query = "UPDATE prize SET amount = %s WHERE id = 1"
-        cursor.execute(query, (new_prize,))
-        get_db().commit()
+        get_storage().set_prize(new_prize)
 
         # Retourner la nouvelle cagnotte et un message de succès
         return jsonify({'prize': new_prize, 'success_message': 'Cagnotte modifiée avec succès'}), 200
@@ -314,10 +788,7 @@ def update_prize():
 
 # Fonction pour obtenir le montant total de la cagnotte
 def get_total_prize():
-    cursor = get_cursor()
-    cursor.execute("SELECT amount FROM prize LIMIT 1")
-    result = cursor.fetchone()
-    return result[0] if result else 3000000  # Par défaut 3 000 000 si non défini
+    return get_storage().get_prize()  # Par défaut 3 000 000 si non défini
 
 # Fonction pour vérifier si deux joueurs sont égaux selon les critères
 def are_players_equal(player1, player2):
@@ -371,54 +842,173 @@ def distribute_gains(players):
 
     return players
 
-# Route pour générer le jackpot et le stocker dans la base de données
-@app.route('/generate_jackpot', methods=['GET'])
-def generate_jackpot():
-    cursor = get_cursor()
-    # Générer les numéros gagnants
+# Répartir la cagnotte sur un classement trié, avec le moteur configuré
+def pay_players(players):
+    if app.config['PAYOUT_ENGINE'] == 'cents':
+        return distribute_payout(players, get_total_prize(), are_players_equal)
+    return distribute_gains(players)
+
+# Attribuer à chaque joueur sa position finale et le rang de son groupe d'égalité
+def assign_ranks(players):
+    for position, player in enumerate(players, start=1):
+        if position > 1 and are_players_equal(players[position - 2], player):
+            player['tie_group'] = players[position - 2]['tie_group']
+        else:
+            player['tie_group'] = position
+        player['rank_position'] = position
+    return players
+
+# Créer un tirage (état 'pending') avec de nouveaux numéros gagnants
+def new_draw():
     winning_numbers = random.sample(range(1, 50), 5)
     winning_stars = random.sample(range(1, 10), 2)
+    storage = get_storage()
+    draw_id = storage.create_draw(
+        ",".join(map(str, winning_numbers)),
+        ",".join(map(str, winning_stars)),
+        get_total_prize(),
+        storage.count_players()
+    )
+    return draw_id, winning_numbers, winning_stars
+
+# Résultats d'un tirage avec les moteurs 'numpy' et 'parallel' : classement, rangs et groupes d'égalité
+# sont calculés sur les tableaux de mesures. Seuls les joueurs payés sont construits avant la répartition ;
+# les autres le sont par paquets, au fil de l'écriture. Renvoie le nombre de grilles et l'itérable des joueurs.
+def score_draw(winning_numbers, winning_stars):
+    storage = get_storage()
+    results = storage.get_tickets()
+    workers = app.config['SCORING_WORKERS'] if app.config['SCORING_ENGINE'] == 'parallel' else 1
+    numbers, stars, metrics = score_pool(results, winning_numbers, winning_stars, storage.ticket_encoding,
+                                         workers, app.config['SCORING_MIN_SHARD'])
+    order = ranking_order(metrics)
+    groups = tie_groups(metrics, order)
+    paid = group_end(groups, len(GAIN_PERCENTAGES))
+    paid_players = pay_players(build_players(results, numbers, stars, metrics, order[:paid]))
+
+    def ranked_players():
+        bounds = [0] + list(range(paid, len(order), app.config['BULK_INSERT_BATCH_SIZE'])) + [len(order)]
+        for start, end in zip(bounds, bounds[1:]):
+            chunk = paid_players if start == 0 else build_players(results, numbers, stars, metrics, order[start:end])
+            for position, (player, tie_group) in enumerate(zip(chunk, groups[start:end].tolist()), start=start + 1):
+                player['rank_position'] = position
+                player['tie_group'] = tie_group
+                yield player
+
+    return len(results), ranked_players()
+
+# Calculer, enregistrer puis publier un tirage. Les résultats sont écrits sous un tirage non publié :
+# /ranking ne change qu'à la publication, et un échec ne laisse aucun tirage à moitié visible.
+def run_draw(draw_id, winning_numbers, winning_stars):
+    storage = get_storage()
+    try:
+        storage.set_draw_status(draw_id, 'running')
+
+        # Comparer les résultats des joueurs avec le jackpot
+        if app.config['SCORING_ENGINE'] != 'python':
+            ticket_count, players_with_gains = score_draw(winning_numbers, winning_stars)
+        else:
+            players = compareResultsWithJackpot(winning_numbers, winning_stars)
+            players_with_gains = assign_ranks(pay_players(players))
+            ticket_count = len(players_with_gains)
+
+        # Ajouter les résultats du tirage (les grilles ne sont pas réécrites), puis publier.
+        # L'avancement se mesure sur les grilles évaluées, pas sur le compte pris à la création du tirage.
+        storage.set_ticket_count(draw_id, ticket_count)
+        storage.add_results(draw_id, players_with_gains)
+        storage.publish_draw(draw_id)
+    except Exception as e:
+        app.logger.exception("Échec du tirage %s", draw_id)
+        storage.delete_results(draw_id)
+        storage.set_draw_status(draw_id, 'failed', str(e))
+        raise
+
+# Exécuter un tirage dans un thread de l'exécuteur, avec son propre contexte d'application
+def run_draw_in_background(draw_id, winning_numbers, winning_stars):
+    with app.app_context():
+        run_draw(draw_id, winning_numbers, winning_stars)
+
+# Route pour simuler des tirages (?draws=<n>&seed=<graine>&top=<n>) : lecture seule, aucun tirage enregistré
+@app.route('/simulate', methods=['GET'])
+def simulate():
+    try:
+        draws = int(request.args.get('draws', 1000))
+        seed = request.args.get('seed')
+        seed = int(seed) if seed is not None else None
+        top = int(request.args.get('top', 20))
+    except ValueError:
+        return jsonify({'error_message': 'Paramètres de simulation invalides'}), 400
+    if not 1 <= draws <= app.config['SIMULATION_MAX_DRAWS'] or top < 0 or (seed is not None and seed < 0):
+        return jsonify({'error_message': 'Paramètres de simulation invalides'}), 400
 
-    # Mettre à jour le jackpot dans la base de données
-    query = "UPDATE jackpot SET winning_numbers = %s, winning_stars = %s WHERE id = 1"
-    cursor.execute(query, (",".join(map(str, winning_numbers)), ",".join(map(str, winning_stars))))
-    get_db().commit()
-
-    # Comparer les résultats des joueurs avec le jackpot
-    players = compareResultsWithJackpot(winning_numbers, winning_stars)
-    players_with_gains = distribute_gains(players)
-
-    # Mettre à jour les gains des joueurs
-    for player in players_with_gains:
-        cursor.execute("""
-            UPDATE players SET gains = %s, matching_numbers = %s, matching_stars = %s, proximity_numbers = %s, proximity_stars = %s WHERE name = %s
-        """, (
-            player['gains'],
-            ",".join(map(str, player['matching_numbers'])),
-            ",".join(map(str, player['matching_stars'])),
-            player['proximity_numbers'],
-            player['proximity_stars'],
-            player['name']
-        ))
-    get_db().commit()
+    try:
+        return jsonify(run_simulation(draws, seed, top))
+    except ValueError as e:
+        return jsonify({'error_message': str(e)}), 400
+
+# Route pour générer le jackpot et calculer le tirage avant de répondre (voir POST /draws)
+@app.route('/generate_jackpot', methods=['GET'])
+@invalidates_cache
+def generate_jackpot():
+    draw_id, winning_numbers, winning_stars = new_draw()
+    run_draw(draw_id, winning_numbers, winning_stars)
 
     return jsonify({
+        'draw_id': draw_id,
+        'winning_numbers': winning_numbers,
+        'winning_stars': winning_stars
+    })
+
+# Route pour lancer un tirage en arrière-plan : réponse immédiate quelle que soit la taille du pool
+@app.route('/draws', methods=['POST'])
+def submit_draw():
+    draw_id, winning_numbers, winning_stars = new_draw()
+    get_draw_executor().submit(run_draw_in_background, draw_id, winning_numbers, winning_stars)
+
+    status_url = url_for('get_draw_status', draw_id=draw_id)
+    response = jsonify({
+        'draw_id': draw_id,
+        'status': 'pending',
+        'status_url': status_url,
         'winning_numbers': winning_numbers,
         'winning_stars': winning_stars
     })
+    response.status_code = 202
+    response.headers['Location'] = status_url
+    return response
+
+# Route pour suivre un tirage : état et avancement de l'écriture des résultats
+@app.route('/draws/<int:draw_id>', methods=['GET'])
+def get_draw_status(draw_id):
+    draw = get_storage().get_draw(draw_id)
+    if draw is None:
+        return jsonify({'error_message': 'Tirage introuvable'}), 404
+    if draw['status'] == 'published' or not draw['ticket_count']:
+        draw['progress'] = 1.0 if draw['status'] == 'published' else 0.0
+    else:
+        draw['progress'] = draw['player_count'] / draw['ticket_count']
+    return jsonify(draw)
 
 # Fonction pour comparer les résultats des joueurs avec le jackpot
 def compareResultsWithJackpot(winning_numbers, winning_stars):
-    cursor = get_cursor()
-    cursor.execute("SELECT name, chosen_numbers, chosen_stars FROM players")
-    results = cursor.fetchall()
+    storage = get_storage()
+    results = storage.get_tickets()
+
+    if app.config['SCORING_ENGINE'] == 'numpy':
+        return score_tickets_numpy(results, winning_numbers, winning_stars, storage.ticket_encoding)
+    if app.config['SCORING_ENGINE'] == 'parallel':
+        return score_tickets_parallel(
+            results, winning_numbers, winning_stars, storage.ticket_encoding,
+            workers=app.config['SCORING_WORKERS'],
+            min_shard=app.config['SCORING_MIN_SHARD']
+        )
 
     players = []
 
     for row in results:
-        player_name = row[0]
-        chosen_numbers = list(map(int, row[1].split(',')))
-        chosen_stars = list(map(int, row[2].split(',')))
+        player_id = row[0]
+        player_name = row[1]
+        chosen_numbers = storage.decode(row[2])
+        chosen_stars = storage.decode(row[3])
 
         # Correspondances exactes
         matching_numbers = [num for num in chosen_numbers if num in winning_numbers]
@@ -431,27 +1021,9 @@ def compareResultsWithJackpot(winning_numbers, winning_stars):
         remaining_winning_stars = [star for star in winning_stars if star not in matching_stars]
         remaining_player_stars = [star for star in chosen_stars if star not in matching_stars]
 
-        # Calcul de la proximité des numéros
-        proximity_numbers = 0
-        temp_player_numbers = remaining_player_numbers.copy()
-        for win_num in remaining_winning_numbers:
-            if not temp_player_numbers:
-                proximity_numbers += 49  # Valeur maximale
-                continue
-            closest_num = min(temp_player_numbers, key=lambda x: abs(win_num - x))
-            proximity_numbers += abs(win_num - closest_num)
-            temp_player_numbers.remove(closest_num)
-
-        # Calcul de la proximité des étoiles
-        proximity_stars = 0
-        temp_player_stars = remaining_player_stars.copy()
-        for win_star in remaining_winning_stars:
-            if not temp_player_stars:
-                proximity_stars += 9  # Valeur maximale
-                continue
-            closest_star = min(temp_player_stars, key=lambda x: abs(win_star - x))
-            proximity_stars += abs(win_star - closest_star)
-            temp_player_stars.remove(closest_star)
+        # Calcul de la proximité des numéros et des étoiles (valeur maximale si plus rien à rapprocher)
+        proximity_numbers = greedy_distance(remaining_player_numbers, remaining_winning_numbers, NUMBER_PENALTY)
+        proximity_stars = greedy_distance(remaining_player_stars, remaining_winning_stars, STAR_PENALTY)
 
         # Somme des numéros pour départager
         sum_winning_numbers = sum(winning_numbers)
@@ -459,6 +1031,7 @@ def compareResultsWithJackpot(winning_numbers, winning_stars):
         sum_proximity = abs(sum_winning_numbers - sum_player_numbers)
 
         players.append({
+            'id': player_id,
             'name': player_name,
             'chosen_numbers': chosen_numbers,
             'chosen_stars': chosen_stars,
@@ -470,6 +1043,13 @@ def compareResultsWithJackpot(winning_numbers, winning_stars):
             'gains': 0.00,
         })
 
+    return sort_players(players)
+
+# Trier les joueurs dans l'ordre du classement
+def sort_players(players):
+    if app.config['RANKING_SORT'] == 'counting':
+        return counting_sort_players(players)
+
     # Déterminer si des correspondances existent
     any_matches = any(
         len(player['matching_numbers']) > 0 or len(player['matching_stars']) > 0
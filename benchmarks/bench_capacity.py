@@ -0,0 +1,78 @@
+"""Vérifier à grande capacité chaque chemin qui dépend du nombre de participants :
+comptage, inscription, calcul des résultats, répartition des gains et routes de lecture.
+
+Usage : python benchmarks/bench_capacity.py --sizes 10000 100000 1000000 --backends memory sqlite --engine numpy
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app, reset_storage, compareResultsWithJackpot, distribute_gains, assign_ranks, get_total_prize  # noqa: E402
+
+
+def timed(label, func, count=1):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else float('inf')
+    print(f"  {label:<24} {elapsed * 1000:12.1f} ms  {rate:12.0f} op/s")
+    return result
+
+
+def bench_capacity(backend, size):
+    app.config['STORAGE_BACKEND'] = backend
+    app.config['MAX_PLAYERS'] = size
+    client = app.test_client()
+    print(f"[{backend}/{app.config['SCORING_ENGINE']}] capacité {size}")
+    with app.app_context():
+        storage = reset_storage()
+        storage.init_schema()
+        storage.delete_players()
+
+        timed("generate_players", lambda: client.post('/generate_players', data={'num_players': str(size - 1)}), size - 1)
+        timed("add_player", lambda: client.post('/add_player', data={
+            'name': 'Dernier', 'chosen_numbers': '1,2,3,4,5', 'chosen_stars': '1,2'}))
+        timed("add_player (complet)", lambda: client.post('/add_player', data={
+            'name': 'Refuse', 'chosen_numbers': '1,2,3,4,5', 'chosen_stars': '1,2'}))
+        timed("count_players x1000", lambda: [storage.count_players() for _ in range(1000)], 1000)
+
+        winning_numbers = random.sample(range(1, 50), 5)
+        winning_stars = random.sample(range(1, 10), 2)
+        players = timed("calcul des résultats", lambda: compareResultsWithJackpot(winning_numbers, winning_stars), size)
+        players = timed("répartition des gains", lambda: assign_ranks(distribute_gains(players)), size)
+        timed("écriture des résultats", lambda: storage.record_draw(
+            ','.join(map(str, winning_numbers)), ','.join(map(str, winning_stars)), get_total_prize(), players), size)
+
+        timed("GET /index", lambda: client.get('/index'))
+        timed("GET /ranking", lambda: client.get('/ranking'))
+        timed("GET /all_players (page)", lambda: client.get(f'/all_players?after={size - 500}&limit=500'), 500)
+        timed("GET /all_players (flux)", lambda: client.get('/all_players?format=ndjson').get_data(), size)
+        timed("GET /classement", lambda: client.get('/classement'))
+        storage.delete_players()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--backends', nargs='+', default=['memory', 'sqlite'])
+    parser.add_argument('--engine', default='numpy', choices=['python', 'numpy', 'parallel'])
+    args = parser.parse_args()
+
+    app.config['SCORING_ENGINE'] = args.engine
+    # Mesurer les requêtes elles-mêmes, pas le cache de réponses
+    app.config['RESPONSE_CACHE_ENABLED'] = False
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app.config['SQLITE_PATH'] = os.path.join(tmpdir, 'bench.db')
+        for backend in args.backends:
+            for size in args.sizes:
+                bench_capacity(backend, size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Mesurer la durée d'un tirage (calcul des résultats puis écriture) selon la taille du pool.
+
+Usage : python benchmarks/bench_draw.py --sizes 10000 100000 1000000 --backends memory sqlite --engine numpy
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app, reset_storage, compareResultsWithJackpot, distribute_gains, get_total_prize  # noqa: E402
+
+
+def seed(storage, size):
+    storage.delete_players()
+    rows = [
+        (f"Joueur_{i}",
+         ",".join(map(str, random.sample(range(1, 50), 5))),
+         ",".join(map(str, random.sample(range(1, 10), 2))),
+         0.0)
+        for i in range(1, size + 1)
+    ]
+    storage.add_players(rows)
+
+
+def bench_draw(backend, size):
+    app.config['STORAGE_BACKEND'] = backend
+    with app.app_context():
+        storage = reset_storage()
+        storage.init_schema()
+        seed(storage, size)
+
+        start = time.perf_counter()
+        players = compareResultsWithJackpot(random.sample(range(1, 50), 5), random.sample(range(1, 10), 2))
+        players = distribute_gains(players)
+        scored = time.perf_counter()
+        storage.record_draw('1,2,3,4,5', '1,2', get_total_prize(), players)
+        written = time.perf_counter()
+
+        score_time = scored - start
+        write_time = written - scored
+        total = written - start
+        print(f"[{backend}/{app.config['SCORING_ENGINE']}] {size:>9} joueurs  calcul {score_time:8.2f} s  écriture {write_time:8.2f} s "
+              f"({size / write_time:10.0f} lignes/s)  total {total:8.2f} s ({size / total:10.0f} lignes/s)")
+        storage.delete_players()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--backends', nargs='+', default=['memory', 'sqlite'])
+    parser.add_argument('--engine', default='python', choices=['python', 'numpy', 'parallel'])
+    args = parser.parse_args()
+
+    app.config['SCORING_ENGINE'] = args.engine
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app.config['SQLITE_PATH'] = os.path.join(tmpdir, 'bench.db')
+        for backend in args.backends:
+            for size in args.sizes:
+                bench_draw(backend, size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Mesurer le calcul des résultats sur plusieurs cœurs (moteur 'parallel') selon le nombre de processus.
+
+Les grilles sont enregistrées dans le stockage 'memory'. Pour chaque nombre de processus :
+  - lecture et mesure des grilles (score_pool, réparti entre les processus) ;
+  - tri du classement (ranking_order, dans le processus principal) ;
+  - compareResultsWithJackpot complet (dictionnaires de tous les joueurs) ;
+  - run_draw complet : classement, gains, rangs et écriture des résultats.
+
+Usage : python benchmarks/bench_parallel.py --sizes 1000000 5000000 --workers 1 2 4 8
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+
+from app import app, compareResultsWithJackpot, get_storage, new_draw, reset_storage, run_draw  # noqa: E402
+from scoring import get_scoring_executor, ranking_order, score_pool  # noqa: E402
+from simulator import random_draws  # noqa: E402
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_parallel(size, workers_list, repeat):
+    app.config['STORAGE_BACKEND'] = 'memory'
+    app.config['MAX_PLAYERS'] = size
+    app.config['SCORING_ENGINE'] = 'parallel'
+    app.config['SCORING_MIN_SHARD'] = 1
+    numbers, stars = random_draws(np.random.default_rng(size), size)
+    winning_numbers = random.sample(range(1, 50), 5)
+    winning_stars = random.sample(range(1, 10), 2)
+    print(f"[{size} grilles] {os.cpu_count()} cœurs disponibles")
+
+    with app.app_context():
+        storage = reset_storage()
+        storage.add_players([
+            (f"Joueur_{i + 1}", ",".join(map(str, n)), ",".join(map(str, s)), 0.0)
+            for i, (n, s) in enumerate(zip(numbers.tolist(), stars.tolist()))
+        ])
+        results = get_storage().get_tickets()
+        del numbers, stars
+
+        baseline = None
+        for workers in workers_list:
+            app.config['SCORING_WORKERS'] = workers
+            if workers > 1:
+                # Démarrer les processus avant la mesure (coût payé une seule fois par worker)
+                executor = get_scoring_executor(workers)
+                list(executor.map(abs, range(workers)))
+            scoring = best_of(repeat, lambda: score_pool(results, winning_numbers, winning_stars, workers=workers,
+                                                         min_shard=1))
+            metrics = score_pool(results, winning_numbers, winning_stars, workers=workers, min_shard=1)[2]
+            ordering = best_of(repeat, lambda: ranking_order(metrics))
+            compare = best_of(repeat, lambda: compareResultsWithJackpot(winning_numbers, winning_stars))
+
+            def draw():
+                draw_id, _, _ = new_draw()
+                run_draw(draw_id, winning_numbers, winning_stars)
+            total = best_of(repeat, draw)
+            baseline = baseline or total
+            print(f"  {workers:>3} processus  lecture+mesures {scoring * 1000:9.1f} ms  tri {ordering * 1000:7.1f} ms  "
+                  f"compareResultsWithJackpot {compare * 1000:9.1f} ms  run_draw {total * 1000:9.1f} ms "
+                  f"(x{baseline / total:4.2f})  {size / total:10.0f} grilles/s")
+        storage.delete_players()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        bench_parallel(size, args.workers, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Comparer le tri du classement : list.sort sur un tuple (historique) et tri par paquets sur une clé entière.
+
+Les joueurs sont construits à partir de grilles aléatoires, dans l'ordre d'inscription, puis triés
+une fois pour un tirage avec correspondances et une fois sans aucune correspondance.
+
+Usage : python benchmarks/bench_ranking.py --sizes 100000 1000000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+
+from scoring import build_players, counting_sort_players, score_grids  # noqa: E402
+
+
+# Tri historique de compareResultsWithJackpot
+def list_sort_players(players):
+    if any(player['matching_numbers'] or player['matching_stars'] for player in players):
+        players.sort(key=lambda x: (
+            -len(x['matching_numbers']),
+            -len(x['matching_stars']),
+            x['proximity_numbers'],
+            x['proximity_stars']
+        ))
+    else:
+        players.sort(key=lambda x: x['sum_proximity'])
+    return players
+
+
+def random_players(size, winning_numbers, winning_stars, rng):
+    numbers = np.argsort(rng.random((size, 49)), axis=1)[:, :5].astype(np.int16) + 1
+    stars = np.argsort(rng.random((size, 9)), axis=1)[:, :2].astype(np.int16) + 1
+    results = [(i, f"Joueur_{i}") for i in range(1, size + 1)]
+    metrics = score_grids(numbers, stars, winning_numbers, winning_stars)
+    return build_players(results, numbers, stars, metrics, np.arange(size))
+
+
+def bench_ranking(size):
+    rng = np.random.default_rng(size)
+    cases = [
+        ("avec correspondances", [3, 14, 25, 36, 47], [2, 7]),
+        # Aucune grille ne contient 50 : seul le tri par somme de proximité s'applique
+        ("sans correspondance", [50, 50, 50, 50, 50], [10, 10]),
+    ]
+    print(f"[{size} joueurs]")
+    for label, winning_numbers, winning_stars in cases:
+        players = random_players(size, winning_numbers, winning_stars, rng)
+
+        # Collecter avant chaque mesure : le ramasse-miettes ne doit pas parcourir les joueurs du cas précédent
+        gc.collect()
+        start = time.perf_counter()
+        expected = list_sort_players(list(players))
+        sorted_at = time.perf_counter()
+        gc.collect()
+        resumed_at = time.perf_counter()
+        actual = counting_sort_players(players)
+        counted_at = time.perf_counter()
+
+        assert [p['id'] for p in actual] == [p['id'] for p in expected]
+        list_sort = sorted_at - start
+        counting = counted_at - resumed_at
+        print(f"  {label:<22} list.sort {list_sort * 1000:10.1f} ms  "
+              f"paquets {counting * 1000:10.1f} ms  (x{list_sort / counting:4.2f})")
+        del players, expected, actual
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        bench_ranking(size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Comparer le débit des stockages (insertion, classement, calcul des résultats).
+
+Usage : python benchmarks/bench_storage.py --players 1000 --backends memory sqlite
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import app, reset_storage, compareResultsWithJackpot, distribute_gains, assign_ranks, get_total_prize  # noqa: E402
+
+
+def random_ticket():
+    numbers = ",".join(map(str, random.sample(range(1, 50), 5)))
+    stars = ",".join(map(str, random.sample(range(1, 10), 2)))
+    return numbers, stars
+
+
+def timed(label, func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else float('inf')
+    print(f"  {label:<12} {elapsed * 1000:10.1f} ms  {rate:12.0f} op/s")
+
+
+def bench_backend(backend, num_players):
+    app.config['STORAGE_BACKEND'] = backend
+    with app.app_context():
+        storage = reset_storage()
+        storage.init_schema()
+        storage.delete_players()
+        print(f"[{backend}] {num_players} joueurs")
+
+        def insert():
+            for i in range(1, num_players + 1):
+                storage.add_player(f"Joueur_{i}", *random_ticket())
+
+        def draw():
+            players = compareResultsWithJackpot(random.sample(range(1, 50), 5), random.sample(range(1, 10), 2))
+            storage.record_draw('1,2,3,4,5', '1,2', get_total_prize(), assign_ranks(distribute_gains(players)))
+
+        timed('insertion', insert, num_players)
+        timed('tirage', draw, num_players)
+        timed('classement', storage.get_ranking, num_players)
+        timed('liste', storage.list_players, num_players)
+        storage.delete_players()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--players', type=int, default=1000)
+    parser.add_argument('--backends', nargs='+', default=['memory', 'sqlite'])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app.config['SQLITE_PATH'] = os.path.join(tmpdir, 'bench.db')
+        for backend in args.backends:
+            bench_backend(backend, args.players)
+
+
+if __name__ == '__main__':
+    main()
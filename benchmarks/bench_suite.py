@@ -0,0 +1,234 @@
+"""Suite de benchmarks à grande échelle, avec résultats JSON comparables d'une exécution à l'autre.
+
+Pour chaque taille de pool synthétique : calcul des résultats (compareResultsWithJackpot, par moteur),
+répartition des gains (distribute_gains et variantes), lecture des grilles, sérialisation JSON
+de /ranking et /all_players, et rendu de classement.html.
+
+Usage :
+  python benchmarks/bench_suite.py --sizes 100 1000 10000 100000 1000000 10000000 --output run.json
+  python benchmarks/bench_suite.py --output new.json --compare run.json --tolerance 0.2
+
+À 1e7 grilles, le stockage 'memory' demande plusieurs Go et le moteur 'python' plusieurs minutes :
+--engines numpy raccourcit l'exécution.
+
+Avec --compare, les mesures plus lentes que la référence au-delà de la tolérance sont signalées
+et le code de sortie vaut 1.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+
+from app import (  # noqa: E402
+    app, reset_storage, compareResultsWithJackpot, distribute_gains, assign_ranks,
+    are_players_equal, get_total_prize, validate_ticket
+)
+from payout import distribute_payout  # noqa: E402
+from scoring import parse_grid  # noqa: E402
+from simulator import random_draws  # noqa: E402
+
+SEED_CHUNK_SIZE = 100000
+
+
+# Remplir le stockage par paquets : grilles tirées comme random.sample, sans tout garder en mémoire
+def seed(storage, size, rng):
+    storage.delete_players()
+    for offset in range(0, size, SEED_CHUNK_SIZE):
+        numbers, stars = random_draws(rng, min(SEED_CHUNK_SIZE, size - offset))
+        storage.add_players([
+            (f"Joueur_{offset + i + 1}", ",".join(map(str, n)), ",".join(map(str, s)), 0.0)
+            for i, (n, s) in enumerate(zip(numbers.tolist(), stars.tolist()))
+        ])
+
+
+class Suite:
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.backend = None
+        self.results = []
+
+    # Mesurer func (repeat fois) ; setup prépare des entrées neuves avant chaque mesure, hors chrono
+    def measure(self, benchmark, size, func, setup=None, items=None):
+        timings = []
+        value = None
+        for _ in range(self.repeat):
+            argument = setup() if setup else None
+            # Le ramasse-miettes ne doit pas parcourir pendant la mesure ce qui reste de la précédente
+            gc.collect()
+            start = time.perf_counter()
+            value = func(argument) if setup else func()
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        items = size if items is None else items
+        result = {
+            'benchmark': benchmark,
+            'backend': self.backend,
+            'size': size,
+            'min': best,
+            'median': statistics.median(timings),
+            'repeat': self.repeat,
+            'items': items,
+            'items_per_second': items / best if best else None,
+        }
+        self.results.append(result)
+        print(f"  {benchmark:<36} {best * 1000:12.1f} ms  {result['items_per_second'] or 0:14.0f} /s", file=sys.stderr)
+        return value
+
+
+def bench_pool(suite, backend, size, engines):
+    app.config['STORAGE_BACKEND'] = backend
+    app.config['MAX_PLAYERS'] = size
+    client = app.test_client()
+    suite.backend = backend
+    rng = np.random.default_rng(size)
+    print(f"[{backend}] {size} grilles", file=sys.stderr)
+    with app.app_context():
+        storage = reset_storage()
+        storage.init_schema()
+        seed(storage, size, rng)
+        winning_numbers = random.Random(size).sample(range(1, 50), 5)
+        winning_stars = random.Random(size).sample(range(1, 10), 2)
+
+        # Lecture des grilles : validation d'une saisie, décodage du moteur 'python', tableau du moteur 'numpy'
+        tickets = storage.get_tickets()
+        sample = tickets[:min(size, SEED_CHUNK_SIZE)]
+        suite.measure('parse.validate_ticket', size, lambda: [validate_ticket('Joueur', row[2], row[3]) for row in sample],
+                      items=len(sample))
+        suite.measure('parse.decode', size, lambda: [(storage.decode(row[2]), storage.decode(row[3])) for row in tickets])
+        suite.measure('parse.parse_grid', size, lambda: (parse_grid([row[2] for row in tickets], 5),
+                                                         parse_grid([row[3] for row in tickets], 2)))
+        del tickets, sample
+
+        # Calcul des résultats, un moteur après l'autre ; le dernier sert à la suite
+        for engine in engines:
+            app.config['SCORING_ENGINE'] = engine
+            # Libérer le classement du moteur précédent avant la mesure
+            players = None
+            players = suite.measure(f'score.compareResultsWithJackpot.{engine}', size,
+                                    lambda: compareResultsWithJackpot(winning_numbers, winning_stars))
+
+        # Répartition des gains sur des copies fraîches du classement (les fonctions modifient les joueurs)
+        prize = get_total_prize()
+
+        def fresh():
+            return [dict(player) for player in players]
+        suite.measure('payout.distribute_gains', size, distribute_gains, setup=fresh)
+        suite.measure('payout.distribute_payout', size,
+                      lambda copy: distribute_payout(copy, prize, are_players_equal), setup=fresh)
+
+        storage.record_draw(",".join(map(str, winning_numbers)), ",".join(map(str, winning_stars)), prize,
+                            assign_ranks(distribute_gains(players)))
+        del players
+
+        # Réponses JSON complètes, puis en flux NDJSON ; /ranking complet est plafonné à PLAYERS_PAGE_MAX lignes
+        for benchmark, url in (
+            ('json.ranking', f'/ranking?stream=1&limit={size}'),
+            ('json.all_players', '/all_players'),
+            ('json.all_players.ndjson', '/all_players?format=ndjson'),
+        ):
+            body = suite.measure(benchmark, size, lambda: client.get(url).get_data())
+            suite.results[-1]['bytes'] = len(body)
+            del body
+
+        # Page de classement, bornée à CLASSEMENT_MAX_ROWS lignes
+        rows = min(size, app.config['CLASSEMENT_MAX_ROWS'])
+        body = suite.measure('render.classement', size, lambda: client.get('/classement').get_data(), items=rows)
+        suite.results[-1]['bytes'] = len(body)
+        storage.delete_players()
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Comparer deux exécutions : mesures communes (benchmark, stockage, taille), rapport de durées minimales.
+# Les mesures de référence plus courtes que min_duration sont trop bruitées pour être signalées.
+def compare(results, baseline, tolerance, min_duration):
+    reference = {(r['benchmark'], r['backend'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        previous = reference.get((result['benchmark'], result['backend'], result['size']))
+        if previous is None or previous['min'] < min_duration:
+            continue
+        ratio = result['min'] / previous['min']
+        flag = 'REGRESSION' if ratio > 1 + tolerance else ''
+        print(f"  {result['benchmark']:<36} {result['backend']:<7} {result['size']:>9}  x{ratio:5.2f}  {flag}",
+              file=sys.stderr)
+        if flag:
+            regressions.append({
+                'benchmark': result['benchmark'], 'backend': result['backend'], 'size': result['size'], 'ratio': ratio
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--backends', nargs='+', default=['memory'])
+    parser.add_argument('--engines', nargs='+', default=['python', 'numpy'], choices=['python', 'numpy', 'parallel'])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Fichier JSON des résultats (sortie standard par défaut).")
+    parser.add_argument('--compare', help="Fichier JSON d'une exécution de référence.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Ralentissement toléré (0.2 = 20 %%).")
+    parser.add_argument('--min-duration', type=float, default=0.005,
+                        help="Durée de référence minimale (s) pour signaler une régression.")
+    args = parser.parse_args()
+
+    # Mesurer les requêtes elles-mêmes, pas le cache de réponses
+    app.config['RESPONSE_CACHE_ENABLED'] = False
+    suite = Suite(args.repeat)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app.config['SQLITE_PATH'] = os.path.join(tmpdir, 'bench.db')
+        for backend in args.backends:
+            for size in args.sizes:
+                bench_pool(suite, backend, size, args.engines)
+
+    report = {
+        'meta': {
+            'created_at': int(time.time()),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'sizes': args.sizes,
+            'backends': args.backends,
+            'engines': args.engines,
+            'repeat': args.repeat,
+        },
+        'results': suite.results,
+    }
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(suite.results, json.load(f), args.tolerance, args.min_duration)
+        report['regressions'] = regressions
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+import threading
+import time
+
+
+# Cache de réponses en mémoire du processus, avec éviction LRU, durée de vie et budget en octets
+class ResponseCache:
+    def __init__(self, max_entries=256, ttl=60, max_bytes=64 * 1024 * 1024, max_entry_bytes=1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+
+        # Entrées : clé -> (valeur, date d'expiration) ; la valeur commence par le corps en octets
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # Compteurs pour mesurer l'efficacité du cache
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+            'oversized': 0,
+        }
+
+    # Lire une entrée ; None si absente ou expirée
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self._bytes -= len(value[0])
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    # Enregistrer une entrée, en évinçant les moins récemment utilisées si le cache est plein.
+    # Une réponse plus grosse que max_entry_bytes n'est pas gardée.
+    def put(self, key, value):
+        size = len(value[0])
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[0][0])
+            if self.max_entry_bytes is not None and size > self.max_entry_bytes:
+                self._stats['oversized'] += 1
+                return
+            self._entries[key] = (value, expires_at)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[0])
+                self._stats['evictions'] += 1
+
+    # Vider le cache (appelé après chaque écriture)
+    def clear(self):
+        with self._lock:
+            if self._entries:
+                self._stats['invalidations'] += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    # Statistiques d'utilisation du cache
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        stats['max_entries'] = self.max_entries
+        stats['max_bytes'] = self.max_bytes
+        stats['max_entry_bytes'] = self.max_entry_bytes
+        stats['ttl'] = self.ttl
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,120 @@
+import csv
+import json
+import time
+from storage import DuplicatePlayerError
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+IMPORT_COLUMNS = ('name', 'chosen_numbers', 'chosen_stars')
+
+
+# Découper un flux binaire en lignes de texte, par blocs de taille fixe
+def iter_lines(stream, chunk_size=65536):
+    pending = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line.decode('utf-8-sig', errors='replace').rstrip('\r')
+    if pending:
+        yield pending.decode('utf-8-sig', errors='replace').rstrip('\r')
+
+
+# Enregistrements (numéro de ligne, grille ou None) d'un fichier CSV avec en-tête
+# (name,chosen_numbers,chosen_stars ; numéros entre guillemets) ou NDJSON (un objet par ligne)
+def iter_records(stream, fmt):
+    lines = iter_lines(stream)
+    if fmt == 'ndjson':
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield line_number, record if isinstance(record, dict) else None
+        return
+
+    reader = csv.reader(lines)
+    header = [column.strip() for column in next(reader, [])]
+    if not set(IMPORT_COLUMNS).issubset(header):
+        raise ValueError(f"En-tête CSV attendu : {','.join(IMPORT_COLUMNS)}")
+    positions = [header.index(column) for column in IMPORT_COLUMNS]
+    for line_number, values in enumerate(reader, start=2):
+        if not values:
+            continue
+        if len(values) < len(header):
+            yield line_number, None
+            continue
+        yield line_number, dict(zip(IMPORT_COLUMNS, (values[p] for p in positions)))
+
+
+# Importer les grilles par lots : validation au fil de la lecture, une transaction par lot.
+# La mémoire utilisée ne dépend que de batch_size et max_errors, pas de la taille du fichier.
+def import_tickets(storage, records, validate, capacity, batch_size=5000, max_errors=100):
+    start = time.perf_counter()
+    report = {'read': 0, 'inserted': 0, 'rejected': 0, 'errors': []}
+    remaining = max(0, capacity - storage.count_players())
+
+    def reject(line_number, error_message):
+        report['rejected'] += 1
+        if len(report['errors']) < max_errors:
+            report['errors'].append({'line': line_number, 'error_message': error_message})
+
+    def flush(batch):
+        nonlocal remaining
+        # Noms déjà enregistrés, y compris par les lots précédents du même fichier
+        existing = storage.existing_names(row[0] for _, row in batch)
+        accepted = []
+        for line_number, row in batch:
+            if row[0] in existing:
+                reject(line_number, f"Un joueur avec le nom '{row[0]}' existe déjà.")
+            elif len(accepted) >= remaining:
+                reject(line_number, f"Le nombre maximum de {capacity} participants a été atteint.")
+            else:
+                accepted.append((line_number, row))
+        if not accepted:
+            return
+        try:
+            inserted = storage.add_players([row for _, row in accepted])
+        except DuplicatePlayerError:
+            # Un nom a été pris entre la vérification et l'insertion : on retire les doublons et on réessaie
+            taken = storage.existing_names(row[0] for _, row in accepted)
+            for line_number, row in accepted:
+                if row[0] in taken:
+                    reject(line_number, f"Un joueur avec le nom '{row[0]}' existe déjà.")
+            rows = [row for _, row in accepted if row[0] not in taken]
+            inserted = storage.add_players(rows) if rows else 0
+        report['inserted'] += inserted
+        remaining -= inserted
+
+    batch = []
+    batch_names = set()
+    for line_number, record in records:
+        report['read'] += 1
+        if record is None:
+            reject(line_number, "Ligne invalide")
+            continue
+        name = record.get('name')
+        error_message, ticket = validate(name, record.get('chosen_numbers'), record.get('chosen_stars'))
+        if error_message is None and name in batch_names:
+            error_message = f"Un joueur avec le nom '{name}' existe déjà."
+        if error_message:
+            reject(line_number, error_message)
+            continue
+        batch.append((line_number, (name, ticket[0], ticket[1], 0.00)))
+        batch_names.add(name)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+            batch_names = set()
+    if batch:
+        flush(batch)
+
+    report['errors'].sort(key=lambda error: error['line'])
+    elapsed = time.perf_counter() - start
+    report['elapsed'] = elapsed
+    report['rows_per_second'] = report['read'] / elapsed if elapsed > 0 else 0.0
+    return report
@@ -0,0 +1,58 @@
+from fractions import Fraction
+
+GAIN_PERCENTAGES = [40, 20, 12, 7, 6, 5, 4, 3, 2, 1]  # Pour les 10 premiers
+
+
+# Pourcentages de chaque place selon le nombre de participants : avec moins de places que de
+# pourcentages, la part non attribuée est redistribuée au prorata (calcul exact, sans flottants)
+def percentage_tables(percentages):
+    tables = [()]
+    for count in range(1, len(percentages) + 1):
+        allocated = sum(percentages[:count])
+        total = sum(percentages)
+        tables.append(tuple(Fraction(p * total, allocated) for p in percentages[:count]))
+    return tables
+
+
+PAYOUT_TABLES = percentage_tables(GAIN_PERCENTAGES)
+
+
+def to_cents(amount):
+    return int(round(amount * 100))
+
+
+# Gains en centimes des premières places d'un classement trié, en un seul passage sur les groupes d'égalité.
+# Chaque groupe partage les pourcentages des places qu'il occupe ; comme dans distribute_gains, les
+# membres classés au-delà des places payées n'obtiennent rien et les membres d'un même groupe reçoivent
+# le même montant. Chaque part est arrondie au centime inférieur ; les centimes restants sont rendus
+# par groupes entiers (un centime par membre), aux plus grands restes d'abord. Ce qui ne suffit pas
+# à un groupe entier n'est pas distribué : le total ne dépasse jamais la cagnotte.
+def payout_cents(players, prize_cents, same_group):
+    paid = len(GAIN_PERCENTAGES)
+    table = PAYOUT_TABLES[min(len(players), paid)]
+    groups = []
+    start = 0
+    while start < len(players) and start < paid:
+        end = start + 1
+        while end < len(players) and same_group(players[start], players[end]):
+            end += 1
+        share = prize_cents * sum(table[start:end]) / (100 * (end - start))
+        groups.append([share, int(share), min(end, paid) - start])
+        start = end
+
+    remainder = int(sum(share * size for share, _, size in groups)) - sum(cents * size for _, cents, size in groups)
+    for group in sorted(groups, key=lambda group: group[1] - group[0]):
+        if group[2] <= remainder:
+            group[1] += 1
+            remainder -= group[2]
+    return [cents for _, cents, size in groups for _ in range(size)]
+
+
+# Équivalent de distribute_gains en centimes entiers, avec la cagnotte passée en argument
+def distribute_payout(players, prize, same_group):
+    cents = payout_cents(players, to_cents(prize), same_group)
+    for player, amount in zip(players, cents):
+        player['gains'] = amount / 100
+    for player in players[len(cents):]:
+        player['gains'] = 0.00
+    return players
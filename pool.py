@@ -0,0 +1,156 @@
+import queue
+import threading
+import time
+
+
+class PoolTimeoutError(Exception):
+    """Levée quand aucune connexion n'a pu être obtenue dans le délai imparti."""
+
+
+# Pool de connexions avec débordement, recyclage et vérification avant usage
+class ConnectionPool:
+    def __init__(self, connect, size=5, max_overflow=10, recycle=3600, pre_ping=True, timeout=30):
+        self._connect = connect
+        self.size = size
+        self.max_overflow = max_overflow
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.timeout = timeout
+
+        # Connexions inactives : (connexion, date de création)
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._created_at = {}
+        self._lock = threading.Lock()
+        self._open = 0
+
+        # Compteurs pour dimensionner le pool par worker
+        self._stats = {
+            'checkouts': 0,
+            'checkins': 0,
+            'connections_created': 0,
+            'connections_recycled': 0,
+            'ping_failures': 0,
+            'exhausted': 0,
+            'timeouts': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+
+    # Ouvrir une nouvelle connexion si la limite le permet
+    def _try_create(self):
+        with self._lock:
+            if self._open >= self.size + self.max_overflow:
+                return None
+            self._open += 1
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+            raise
+        with self._lock:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats['connections_created'] += 1
+        return conn
+
+    # Fermer définitivement une connexion
+    def _discard(self, conn):
+        with self._lock:
+            self._open -= 1
+            self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    # Vérifier qu'une connexion inactive est encore utilisable
+    def _is_usable(self, conn):
+        created_at = self._created_at.get(id(conn), 0)
+        if self.recycle is not None and self.recycle >= 0 and time.monotonic() - created_at > self.recycle:
+            with self._lock:
+                self._stats['connections_recycled'] += 1
+            return False
+        if self.pre_ping:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                with self._lock:
+                    self._stats['ping_failures'] += 1
+                return False
+        return True
+
+    # Emprunter une connexion au pool
+    def checkout(self):
+        start = time.monotonic()
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._try_create()
+                if conn is None:
+                    # Pool épuisé : attendre qu'une connexion soit rendue
+                    with self._lock:
+                        self._stats['exhausted'] += 1
+                    remaining = self.timeout - (time.monotonic() - start)
+                    try:
+                        conn = self._idle.get(timeout=max(0, remaining))
+                    except queue.Empty:
+                        with self._lock:
+                            self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"Aucune connexion disponible après {self.timeout} s "
+                            f"(taille {self.size}, débordement {self.max_overflow})."
+                        )
+                else:
+                    break
+
+            if self._is_usable(conn):
+                break
+            self._discard(conn)
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._stats['wait_time_total'] += waited
+            self._stats['wait_time_max'] = max(self._stats['wait_time_max'], waited)
+        return conn
+
+    # Rendre une connexion au pool
+    def checkin(self, conn):
+        with self._lock:
+            self._stats['checkins'] += 1
+        try:
+            # Terminer la transaction en cours pour ne pas garder un instantané périmé
+            conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            # Connexion de débordement : on la ferme
+            self._discard(conn)
+
+    # Fermer toutes les connexions inactives
+    def dispose(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    # Statistiques d'utilisation du pool
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['open'] = self._open
+        stats['idle'] = self._idle.qsize()
+        stats['in_use'] = stats['open'] - stats['idle']
+        stats['size'] = self.size
+        stats['max_overflow'] = self.max_overflow
+        if stats['checkouts']:
+            stats['wait_time_avg'] = stats['wait_time_total'] / stats['checkouts']
+        else:
+            stats['wait_time_avg'] = 0.0
+        return stats
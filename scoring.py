@@ -0,0 +1,364 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : seul le moteur 'numpy' en a besoin
+    np = None
+
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+import os
+
+# Valeurs ajoutées à la proximité quand il ne reste plus de numéro ou d'étoile à rapprocher
+NUMBER_PENALTY = 49
+STAR_PENALTY = 9
+
+# Décalage des numéros déjà rapprochés dans la proximité vectorisée (supérieur à toute distance)
+UNAVAILABLE = 1024
+
+
+# Positions correspondant à chaque motif binaire de correspondances (bit k = position k)
+MATCH_POSITIONS = [tuple(k for k in range(5) if pattern >> k & 1) for pattern in range(32)]
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("Le moteur de calcul 'numpy' nécessite le paquet numpy (pip install numpy).")
+
+
+# Proximité gloutonne d'une grille, sans min(key=lambda) ni list.remove : pour chaque numéro gagnant
+# restant (dans l'ordre du tirage), le plus proche des numéros restants du joueur est retiré.
+# Dans la liste triée, seuls les deux voisins du point d'insertion peuvent être les plus proches ;
+# à distance égale, le premier dans l'ordre de la grille l'emporte, comme avec min().
+def greedy_distance(player_values, winning_values, penalty):
+    candidates = sorted(player_values)
+    positions = {}
+    for position, value in enumerate(player_values):
+        positions.setdefault(value, position)
+
+    total = 0
+    for win in winning_values:
+        if not candidates:
+            total += penalty
+            continue
+        i = bisect_left(candidates, win)
+        if i == len(candidates):
+            i -= 1
+        elif i > 0:
+            below = win - candidates[i - 1]
+            above = candidates[i] - win
+            if below < above or (below == above and positions[candidates[i - 1]] < positions[candidates[i]]):
+                i -= 1
+        total += abs(win - candidates[i])
+        del candidates[i]
+    return total
+
+
+# Clé de classement sur un seul entier : correspondances décroissantes, puis proximités croissantes.
+# Bornes : proximité des numéros <= 5 * 49 (8 bits), des étoiles <= 2 * 9 (5 bits)
+def ranking_key(count_numbers, count_stars, proximity_numbers, proximity_stars):
+    return (((5 - count_numbers) * 3 + 2 - count_stars) << 13) | (proximity_numbers << 5) | proximity_stars
+
+
+# Tri par paquets, stable et en O(n) : les clés distinctes sont en nombre borné
+def bucket_sort(items, keys):
+    buckets = {}
+    for item, key in zip(items, keys):
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [item]
+        else:
+            bucket.append(item)
+    return [item for key in sorted(buckets) for item in buckets[key]]
+
+
+# Même ordre que le tri de compareResultsWithJackpot, y compris le tri par somme de proximité
+# quand personne n'a de correspondance
+def counting_sort_players(players):
+    if any(player['matching_numbers'] or player['matching_stars'] for player in players):
+        keys = [
+            ranking_key(len(player['matching_numbers']), len(player['matching_stars']),
+                        player['proximity_numbers'], player['proximity_stars'])
+            for player in players
+        ]
+    else:
+        keys = [player['sum_proximity'] for player in players]
+    return bucket_sort(players, keys)
+
+
+# Convertir les grilles CSV en tableau (n, size) avec un seul split global
+def parse_grid(values, size):
+    if not values:
+        return np.zeros((0, size), dtype=np.int16)
+    flat = np.array(",".join(values).split(','), dtype=np.int16)
+    return flat.reshape(len(values), size)
+
+
+# Convertir des masques (bit k = numéro k) en tableau (n, size), numéros croissants
+def mask_grid(masks, size, max_value):
+    if not len(masks):
+        return np.zeros((0, size), dtype=np.int16)
+    values = np.array(masks, dtype=np.uint64)
+    bits = (values[:, None] >> np.arange(1, max_value + 1, dtype=np.uint64)) & np.uint64(1)
+    positions = np.nonzero(bits)[1].astype(np.int16) + 1
+    return positions.reshape(len(masks), size)
+
+
+# Proximité gloutonne vectorisée : même ordre de parcours que compareResultsWithJackpot.
+# winning : numéros du tirage, ou colonnes de numéros (un tirage par ligne, voir simulator.py)
+def greedy_proximity(chosen, matched, winning, winning_found, penalty):
+    n = chosen.shape[0]
+    chosen = chosen.astype(np.int16)
+    # Décalage ajouté aux numéros déjà utilisés : distances sur 16 bits, sans masque à réécrire
+    blocked = np.where(matched, UNAVAILABLE, 0).astype(np.int16)
+    proximity = np.zeros(n, dtype=np.int64)
+    for j, win in enumerate(winning):
+        # Seuls les numéros gagnants non trouvés par le joueur sont rapprochés
+        active = ~winning_found[:, j]
+        distances = np.abs(chosen - np.reshape(win, (-1, 1)).astype(np.int16))
+        distances += blocked
+        # argmin renvoie la première position en cas d'égalité, comme min() sur la liste
+        closest = np.argmin(distances, axis=1)[:, None]
+        distance = np.take_along_axis(distances, closest, axis=1)[:, 0]
+        has_candidate = distance < UNAVAILABLE
+        proximity += np.where(active, np.where(has_candidate, distance, penalty), 0)
+        used = np.flatnonzero(active & has_candidate)
+        blocked[used, closest[used, 0]] = UNAVAILABLE
+    return proximity
+
+
+# Colonnes du tableau de mesures calculé pour chaque grille
+COUNT_NUMBERS, COUNT_STARS, PROXIMITY_NUMBERS, PROXIMITY_STARS, SUM_PROXIMITY, PATTERN_NUMBERS, PATTERN_STARS = range(7)
+METRIC_COLUMNS = 7
+
+
+# Grilles (n, 5) et (n, 2) à partir des valeurs brutes (chaînes CSV ou masques)
+def value_grids(numbers_values, stars_values, ticket_encoding='csv'):
+    if ticket_encoding == 'bitmask':
+        return mask_grid(numbers_values, 5, 49), mask_grid(stars_values, 2, 9)
+    return parse_grid(numbers_values, 5), parse_grid(stars_values, 2)
+
+
+# Grilles (n, 5) et (n, 2) des tickets lus par get_tickets
+def ticket_grids(results, ticket_encoding='csv'):
+    return value_grids([row[2] for row in results], [row[3] for row in results], ticket_encoding)
+
+
+# Mesures (n, METRIC_COLUMNS) de chaque grille : correspondances, proximités, écart de somme et motifs
+def score_grids(numbers, stars, winning_numbers, winning_stars):
+    winning_n = np.array(winning_numbers, dtype=np.int16)
+    winning_s = np.array(winning_stars, dtype=np.int16)
+
+    # Correspondances exactes, côté joueur et côté tirage
+    matched_n = (numbers[:, :, None] == winning_n[None, None, :]).any(axis=2)
+    matched_s = (stars[:, :, None] == winning_s[None, None, :]).any(axis=2)
+    found_n = (winning_n[None, :, None] == numbers[:, None, :]).any(axis=2)
+    found_s = (winning_s[None, :, None] == stars[:, None, :]).any(axis=2)
+
+    metrics = np.empty((numbers.shape[0], METRIC_COLUMNS), dtype=np.int64)
+    metrics[:, COUNT_NUMBERS] = matched_n.sum(axis=1)
+    metrics[:, COUNT_STARS] = matched_s.sum(axis=1)
+    metrics[:, PROXIMITY_NUMBERS] = greedy_proximity(numbers, matched_n, winning_numbers, found_n, NUMBER_PENALTY)
+    metrics[:, PROXIMITY_STARS] = greedy_proximity(stars, matched_s, winning_stars, found_s, STAR_PENALTY)
+    metrics[:, SUM_PROXIMITY] = np.abs(int(sum(winning_numbers)) - numbers.sum(axis=1, dtype=np.int64))
+    metrics[:, PATTERN_NUMBERS] = matched_n @ np.array([1, 2, 4, 8, 16])
+    metrics[:, PATTERN_STARS] = matched_s @ np.array([1, 2])
+    return metrics
+
+
+# Ordre du classement : tri stable, identique à list.sort() sur les mêmes clés
+def ranking_order(metrics):
+    if not (metrics[:, COUNT_NUMBERS].any() or metrics[:, COUNT_STARS].any()):
+        return np.argsort(metrics[:, SUM_PROXIMITY], kind='stable')
+    return np.lexsort((
+        metrics[:, PROXIMITY_STARS],
+        metrics[:, PROXIMITY_NUMBERS],
+        -metrics[:, COUNT_STARS],
+        -metrics[:, COUNT_NUMBERS],
+    ))
+
+
+# Groupe d'égalité de chaque place du classement (position de son premier membre, à partir de 1),
+# comme assign_ranks : mêmes correspondances et mêmes proximités que la place précédente
+def tie_groups(metrics, order):
+    ranked = metrics[order]
+    keys = ranking_key(ranked[:, COUNT_NUMBERS], ranked[:, COUNT_STARS],
+                       ranked[:, PROXIMITY_NUMBERS], ranked[:, PROXIMITY_STARS])
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = keys[1:] != keys[:-1]
+    return np.maximum.accumulate(np.where(starts, np.arange(1, len(order) + 1), 0))
+
+
+# Nombre de places jusqu'à la fin du groupe d'égalité à cheval sur la k-ième place (les places payées)
+def group_end(groups, k):
+    if len(groups) <= k:
+        return len(groups)
+    later = np.flatnonzero(groups[k:] != groups[k - 1])
+    return k + int(later[0]) if later.size else len(groups)
+
+
+# Dictionnaires des joueurs, dans l'ordre du classement (format de compareResultsWithJackpot).
+# Seules les lignes de order sont converties : appelable par tranches d'un même classement.
+def build_players(results, numbers, stars, metrics, order):
+    order = np.asarray(order)
+    numbers_list = numbers[order].tolist()
+    stars_list = stars[order].tolist()
+    ranked = metrics[order]
+    pattern_n = ranked[:, PATTERN_NUMBERS].tolist()
+    pattern_s = ranked[:, PATTERN_STARS].tolist()
+    proximity_numbers = ranked[:, PROXIMITY_NUMBERS].tolist()
+    proximity_stars = ranked[:, PROXIMITY_STARS].tolist()
+    sum_proximity = ranked[:, SUM_PROXIMITY].tolist()
+
+    players = []
+    for j, i in enumerate(order.tolist()):
+        chosen_numbers = numbers_list[j]
+        chosen_stars = stars_list[j]
+        players.append({
+            'id': results[i][0],
+            'name': results[i][1],
+            'chosen_numbers': chosen_numbers,
+            'chosen_stars': chosen_stars,
+            'matching_numbers': [chosen_numbers[k] for k in MATCH_POSITIONS[pattern_n[j]]],
+            'matching_stars': [chosen_stars[k] for k in MATCH_POSITIONS[pattern_s[j]]],
+            'proximity_numbers': proximity_numbers[j],
+            'proximity_stars': proximity_stars[j],
+            'sum_proximity': sum_proximity[j],
+            'gains': 0.00,
+        })
+    return players
+
+
+# Moteur NumPy : mêmes résultats et même ordre que compareResultsWithJackpot
+def score_tickets_numpy(results, winning_numbers, winning_stars, ticket_encoding='csv'):
+    require_numpy()
+    numbers, stars, metrics = score_pool(results, winning_numbers, winning_stars, ticket_encoding, workers=1)
+    return build_players(results, numbers, stars, metrics, ranking_order(metrics))
+
+
+# Processus de calcul, recréés dans chaque worker. 'spawn' : pas de fork d'un processus
+# qui a déjà des threads (tirages en arrière-plan, pool de connexions)
+_scoring_executor = None
+_scoring_executor_key = None
+
+
+def get_scoring_executor(workers):
+    global _scoring_executor, _scoring_executor_key
+    if _scoring_executor is None or _scoring_executor_key != (os.getpid(), workers):
+        if _scoring_executor is not None and _scoring_executor_key[0] == os.getpid():
+            _scoring_executor.shutdown()
+        _scoring_executor = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+        _scoring_executor_key = (os.getpid(), workers)
+    return _scoring_executor
+
+
+# Chaînes CSV -> tableau (n, largeur) d'octets, complété par des zéros (copiable en mémoire partagée)
+def fixed_width(values):
+    chars = np.array(values, dtype='S')
+    return chars.view(np.uint8).reshape(len(values), chars.dtype.itemsize)
+
+
+# Grilles (n, size) à partir de chaînes CSV en octets de largeur fixe, sans découpage en chaînes :
+# chaque numéro (un ou deux chiffres) se termine sur un chiffre suivi d'un séparateur ou du bourrage
+def parse_fixed_grid(chars, size):
+    digits = (chars >= ord('0')) & (chars <= ord('9'))
+    values = chars.astype(np.int16) - ord('0')
+    ends = digits.copy()
+    ends[:, :-1] &= ~digits[:, 1:]
+    tens = np.zeros_like(values)
+    tens[:, 1:] = np.where(digits[:, :-1], values[:, :-1] * 10, 0)
+    grid = (values + tens)[ends]
+    if grid.size != chars.shape[0] * size:
+        raise ValueError("Grille invalide")
+    return grid.reshape(-1, size)
+
+
+# Grilles brutes de tous les tickets, dans le format copié en mémoire partagée :
+# masques (n, 2) en uint64, ou chaînes CSV des numéros puis des étoiles en octets de largeur fixe.
+# Renvoie aussi la colonne où commencent les étoiles.
+def ticket_buffer(results, ticket_encoding):
+    if ticket_encoding == 'bitmask':
+        return np.array([(row[2], row[3]) for row in results], dtype=np.uint64), 1
+    numbers = fixed_width([row[2] for row in results])
+    stars = fixed_width([row[3] for row in results])
+    return np.hstack((numbers, stars)), numbers.shape[1]
+
+
+# Lire puis mesurer une tranche [start, end) dans un processus de calcul. Les grilles brutes sont lues,
+# grilles et mesures écrites en mémoire partagée : seuls les noms des segments et les bornes sont envoyés.
+def score_shard(tickets_name, tickets_layout, grid_name, metrics_name, size, start, end,
+                ticket_encoding, winning_numbers, winning_stars):
+    dtype, width, split = tickets_layout
+    tickets_memory = SharedMemory(name=tickets_name)
+    grid_memory = SharedMemory(name=grid_name)
+    metrics_memory = SharedMemory(name=metrics_name)
+    try:
+        tickets = np.ndarray((size, width), dtype=dtype, buffer=tickets_memory.buf)
+        grid = np.ndarray((size, 7), dtype=np.int16, buffer=grid_memory.buf)
+        metrics = np.ndarray((size, METRIC_COLUMNS), dtype=np.int64, buffer=metrics_memory.buf)
+        rows = tickets[start:end]
+        if ticket_encoding == 'bitmask':
+            numbers, stars = mask_grid(rows[:, 0], 5, 49), mask_grid(rows[:, 1], 2, 9)
+        else:
+            numbers, stars = parse_fixed_grid(rows[:, :split], 5), parse_fixed_grid(rows[:, split:], 2)
+        grid[start:end, :5] = numbers
+        grid[start:end, 5:] = stars
+        metrics[start:end] = score_grids(numbers, stars, winning_numbers, winning_stars)
+        # Les vues doivent être libérées avant de fermer les segments
+        del tickets, rows, grid, metrics
+    finally:
+        tickets_memory.close()
+        grid_memory.close()
+        metrics_memory.close()
+
+
+# Grilles et mesures de tous les tickets, lues et calculées par tranches dans plusieurs processus.
+# Les grilles brutes sont copiées une seule fois en mémoire partagée, rien n'est sérialisé.
+def score_grids_parallel(results, winning_numbers, winning_stars, ticket_encoding, workers):
+    size = len(results)
+    buffer, split = ticket_buffer(results, ticket_encoding)
+    layout = (buffer.dtype.str, buffer.shape[1], split)
+    tickets_memory = SharedMemory(create=True, size=buffer.nbytes)
+    grid_memory = SharedMemory(create=True, size=size * 7 * np.dtype(np.int16).itemsize)
+    metrics_memory = SharedMemory(create=True, size=size * METRIC_COLUMNS * np.dtype(np.int64).itemsize)
+    try:
+        tickets = np.ndarray(buffer.shape, dtype=buffer.dtype, buffer=tickets_memory.buf)
+        tickets[:] = buffer
+        del buffer, tickets
+        bounds = np.linspace(0, size, workers + 1, dtype=np.int64).tolist()
+        executor = get_scoring_executor(workers)
+        futures = [
+            executor.submit(score_shard, tickets_memory.name, layout, grid_memory.name, metrics_memory.name,
+                            size, start, end, ticket_encoding, list(winning_numbers), list(winning_stars))
+            for start, end in zip(bounds, bounds[1:]) if end > start
+        ]
+        for future in futures:
+            future.result()
+        grid = np.ndarray((size, 7), dtype=np.int16, buffer=grid_memory.buf)
+        numbers = grid[:, :5].copy()
+        stars = grid[:, 5:].copy()
+        metrics = np.ndarray((size, METRIC_COLUMNS), dtype=np.int64, buffer=metrics_memory.buf).copy()
+        del grid
+    finally:
+        for memory in (tickets_memory, grid_memory, metrics_memory):
+            memory.close()
+            memory.unlink()
+    return numbers, stars, metrics
+
+
+# Grilles et mesures de tous les tickets ; en dessous de min_shard grilles par processus,
+# le calcul reste dans le processus courant
+def score_pool(results, winning_numbers, winning_stars, ticket_encoding='csv', workers=None, min_shard=50000):
+    require_numpy()
+    workers = min(workers or os.cpu_count() or 1, len(results) // max(min_shard, 1))
+    if workers > 1:
+        return score_grids_parallel(results, winning_numbers, winning_stars, ticket_encoding, workers)
+    numbers, stars = ticket_grids(results, ticket_encoding)
+    return numbers, stars, score_grids(numbers, stars, winning_numbers, winning_stars)
+
+
+# Moteur parallèle : grilles lues et mesurées par tranches sur plusieurs cœurs, puis le classement
+# est trié une seule fois sur l'ensemble (le critère « personne n'a de correspondance » est global)
+def score_tickets_parallel(results, winning_numbers, winning_stars, ticket_encoding='csv', workers=None, min_shard=50000):
+    numbers, stars, metrics = score_pool(results, winning_numbers, winning_stars, ticket_encoding, workers, min_shard)
+    return build_players(results, numbers, stars, metrics, ranking_order(metrics))
@@ -0,0 +1,169 @@
+import time
+from operator import eq
+from payout import GAIN_PERCENTAGES, payout_cents, to_cents
+from scoring import NUMBER_PENALTY, STAR_PENALTY, greedy_proximity, np, ranking_key, require_numpy, ticket_grids
+
+
+# Tirages aléatoires (numéros dans l'ordre du tirage, comme random.sample)
+def random_draws(rng, count):
+    numbers = np.argsort(rng.random((count, 49)), axis=1)[:, :5].astype(np.int16) + 1
+    stars = np.argsort(rng.random((count, 9)), axis=1)[:, :2].astype(np.int16) + 1
+    return numbers, stars
+
+
+# Appartenance de chaque valeur à chaque ligne : tableau (lignes, max_value + 1) de booléens
+def membership(grid, max_value):
+    members = np.zeros((grid.shape[0], max_value + 1), dtype=bool)
+    members[np.arange(grid.shape[0])[:, None], grid] = True
+    return members
+
+
+# Mesures de toutes les grilles pour un lot de tirages : tableaux (tirages, grilles)
+def score_draws(numbers, stars, draws_numbers, draws_stars):
+    draws, tickets = draws_numbers.shape[0], numbers.shape[0]
+    rows = draws * tickets
+
+    # Correspondances côté joueur (la valeur est dans le tirage) et côté tirage (la valeur est sur la grille)
+    matched_n = membership(draws_numbers, 49)[:, numbers]
+    matched_s = membership(draws_stars, 9)[:, stars]
+    found_n = membership(numbers, 49)[:, draws_numbers].transpose(1, 0, 2)
+    found_s = membership(stars, 9)[:, draws_stars].transpose(1, 0, 2)
+
+    # Une ligne par couple (tirage, grille), avec les numéros gagnants de son tirage
+    proximity_numbers = greedy_proximity(
+        np.broadcast_to(numbers, (draws, tickets, 5)).reshape(rows, 5),
+        matched_n.reshape(rows, 5),
+        np.repeat(draws_numbers, tickets, axis=0).T,
+        found_n.reshape(rows, 5),
+        NUMBER_PENALTY
+    ).reshape(draws, tickets)
+    proximity_stars = greedy_proximity(
+        np.broadcast_to(stars, (draws, tickets, 2)).reshape(rows, 2),
+        matched_s.reshape(rows, 2),
+        np.repeat(draws_stars, tickets, axis=0).T,
+        found_s.reshape(rows, 2),
+        STAR_PENALTY
+    ).reshape(draws, tickets)
+
+    count_n = matched_n.sum(axis=2)
+    count_s = matched_s.sum(axis=2)
+    sum_proximity = np.abs(
+        draws_numbers.sum(axis=1, dtype=np.int64)[:, None] - numbers.sum(axis=1, dtype=np.int64)[None, :]
+    )
+    return count_n, count_s, proximity_numbers, proximity_stars, sum_proximity
+
+
+# Minimum, moyenne et centiles d'une série de montants ou de comptes
+def summary(values):
+    if not len(values):
+        return None
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]).tolist()
+    return {
+        'mean': float(np.mean(values)),
+        'min': float(np.min(values)),
+        'p50': p50,
+        'p90': p90,
+        'p99': p99,
+        'max': float(np.max(values)),
+    }
+
+
+# Simuler des tirages sur les grilles enregistrées, sans rien écrire : répartition des gains,
+# probabilité qu'aucune grille n'ait de correspondance et gain moyen de chaque joueur.
+# Les grilles sont évaluées par lots d'au plus batch_rows couples (tirage, grille) ; les gains
+# sont calculés en centimes (payout.py) avec la cagnotte donnée.
+def simulate_draws(results, ticket_encoding, prize, draws, seed=None, batch_rows=500000, top=20):
+    require_numpy()
+    if not results:
+        raise ValueError("Aucune grille à simuler")
+    if draws < 1:
+        raise ValueError("Nombre de tirages invalide")
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    numbers, stars = ticket_grids(results, ticket_encoding)
+    tickets = len(results)
+    prize_cents = to_cents(prize)
+    paid = min(tickets, len(GAIN_PERCENTAGES))
+
+    gains = np.zeros(tickets, dtype=np.int64)
+    wins = np.zeros(tickets, dtype=np.int64)
+    first_place = np.zeros(draws, dtype=np.int64)
+    paid_players = np.zeros(draws, dtype=np.int64)
+    total_paid = np.zeros(draws, dtype=np.int64)
+    zero_match_draws = 0
+    # Gains des premières places pour chaque suite de tailles de groupes d'égalité déjà rencontrée
+    payouts = {}
+
+    batch_size = max(1, batch_rows // tickets)
+    for offset in range(0, draws, batch_size):
+        count = min(batch_size, draws - offset)
+        count_n, count_s, proximity_numbers, proximity_stars, sum_proximity = score_draws(numbers, stars, *random_draws(rng, count))
+
+        # Même clé que le classement ; tri par somme de proximité pour les tirages sans aucune correspondance
+        keys = ranking_key(count_n, count_s, proximity_numbers, proximity_stars)
+        any_match = (count_n > 0).any(axis=1) | (count_s > 0).any(axis=1)
+        zero_match_draws += int(count - any_match.sum())
+        order = np.argsort(np.where(any_match[:, None], keys, sum_proximity), axis=1, kind='stable')
+
+        paid_index = []
+        paid_cents = []
+        for draw in range(count):
+            draw_order = order[draw]
+            draw_keys = keys[draw]
+            # Groupes d'égalité des places payées, prolongés au-delà de la dernière si nécessaire
+            ranked = draw_keys[draw_order[:paid]].tolist()
+            end = paid
+            while end < tickets and draw_keys[draw_order[end]] == ranked[-1]:
+                ranked.append(ranked[-1])
+                end += 1
+            groups = []
+            for key in ranked:
+                if groups and groups[-1][0] == key:
+                    groups[-1][1] += 1
+                else:
+                    groups.append([key, 1])
+            pattern = tuple(size for _, size in groups)
+            cents = payouts.get(pattern)
+            if cents is None:
+                cents = payouts[pattern] = payout_cents(ranked, prize_cents, eq)
+
+            index = offset + draw
+            first_place[index] = cents[0]
+            paid_players[index] = sum(1 for amount in cents if amount)
+            total_paid[index] = sum(cents)
+            paid_index.append(draw_order[:len(cents)])
+            paid_cents.append(cents)
+
+        paid_index = np.concatenate(paid_index)
+        paid_cents = np.array(paid_cents, dtype=np.int64).ravel()
+        np.add.at(gains, paid_index, paid_cents)
+        np.add.at(wins, paid_index, paid_cents > 0)
+
+    elapsed = time.perf_counter() - start
+    best = np.argsort(-gains, kind='stable')[:top].tolist()
+    gains = gains.tolist()
+    wins = wins.tolist()
+    return {
+        'draws': draws,
+        'tickets': tickets,
+        'prize': prize,
+        'seed': seed,
+        'zero_match_draws': zero_match_draws,
+        'zero_match_probability': zero_match_draws / draws,
+        'payout': {
+            'first_place': summary(first_place / 100),
+            'paid_players': summary(paid_players),
+            'total_paid': summary(total_paid / 100),
+        },
+        'players': [
+            {
+                'id': results[i][0],
+                'name': results[i][1],
+                'expected_gains': gains[i] / 100 / draws,
+                'win_probability': wins[i] / draws,
+            }
+            for i in best
+        ],
+        'elapsed': elapsed,
+        'draws_per_second': draws / elapsed if elapsed > 0 else 0.0,
+    }
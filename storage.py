@@ -0,0 +1,1216 @@
+import bisect
+import itertools
+import sqlite3
+import threading
+import time
+from tickets import csv_to_mask, from_mask, mask_count, parse_csv, to_mask
+
+# Cagnotte utilisée si aucune n'est définie
+DEFAULT_PRIZE = 3000000
+
+# Tables attendues par le stockage SQL (créées par init_schema)
+SCHEMA_TABLES = ('players', 'prize', 'loto_state', 'draws', 'draw_results')
+
+# Schéma MySQL de référence (utilisé par « flask init-db » et les tests)
+MYSQL_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS players (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        chosen_numbers VARCHAR(255) NOT NULL,
+        chosen_stars VARCHAR(255) NOT NULL,
+        gains FLOAT DEFAULT 0.0,
+        matching_numbers VARCHAR(255),
+        matching_stars VARCHAR(255),
+        proximity_numbers INT DEFAULT 0,
+        proximity_stars INT DEFAULT 0,
+        numbers_mask BIGINT UNSIGNED,
+        stars_mask SMALLINT UNSIGNED,
+        matching_numbers_mask BIGINT UNSIGNED,
+        matching_stars_mask SMALLINT UNSIGNED,
+        matching_numbers_count TINYINT UNSIGNED,
+        matching_stars_count TINYINT UNSIGNED,
+        UNIQUE INDEX uq_players_name (name)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS prize (
+        id INT PRIMARY KEY,
+        amount FLOAT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS loto_state (
+        id INT PRIMARY KEY,
+        player_count INT NOT NULL DEFAULT 0,
+        data_version BIGINT NOT NULL DEFAULT 0,
+        updated_at BIGINT NOT NULL DEFAULT 0,
+        current_draw_id INT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS draws (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        winning_numbers VARCHAR(255) NOT NULL,
+        winning_stars VARCHAR(255) NOT NULL,
+        prize FLOAT NOT NULL,
+        player_count INT NOT NULL DEFAULT 0,
+        created_at BIGINT NOT NULL,
+        published_at BIGINT,
+        status VARCHAR(16) NOT NULL DEFAULT 'pending',
+        ticket_count INT NOT NULL DEFAULT 0,
+        error VARCHAR(255)
+    )
+    ''',
+    # Résultats en ajout seul : un tirage n'écrit que ses propres lignes, partitionnées par tirage.
+    # Nom et grille y sont recopiés : l'historique survit à la suppression des joueurs.
+    '''
+    CREATE TABLE IF NOT EXISTS draw_results (
+        draw_id INT NOT NULL,
+        player_id INT NOT NULL,
+        name VARCHAR(255),
+        chosen_numbers VARCHAR(255),
+        chosen_stars VARCHAR(255),
+        numbers_mask BIGINT UNSIGNED,
+        stars_mask SMALLINT UNSIGNED,
+        gains FLOAT NOT NULL DEFAULT 0.0,
+        matching_numbers VARCHAR(255),
+        matching_stars VARCHAR(255),
+        matching_numbers_mask BIGINT UNSIGNED,
+        matching_stars_mask SMALLINT UNSIGNED,
+        matching_numbers_count TINYINT UNSIGNED,
+        matching_stars_count TINYINT UNSIGNED,
+        proximity_numbers INT NOT NULL DEFAULT 0,
+        proximity_stars INT NOT NULL DEFAULT 0,
+        rank_position INT,
+        tie_group INT,
+        PRIMARY KEY (draw_id, player_id),
+        INDEX idx_draw_results_rank (draw_id, rank_position)
+    )
+    PARTITION BY KEY (draw_id) PARTITIONS 16
+    ''',
+]
+
+SQLITE_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS players (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        chosen_numbers TEXT NOT NULL,
+        chosen_stars TEXT NOT NULL,
+        gains REAL DEFAULT 0.0,
+        matching_numbers TEXT,
+        matching_stars TEXT,
+        proximity_numbers INTEGER DEFAULT 0,
+        proximity_stars INTEGER DEFAULT 0,
+        numbers_mask INTEGER,
+        stars_mask INTEGER,
+        matching_numbers_mask INTEGER,
+        matching_stars_mask INTEGER,
+        matching_numbers_count INTEGER,
+        matching_stars_count INTEGER
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS prize (
+        id INTEGER PRIMARY KEY,
+        amount REAL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS loto_state (
+        id INTEGER PRIMARY KEY,
+        player_count INTEGER NOT NULL DEFAULT 0,
+        data_version INTEGER NOT NULL DEFAULT 0,
+        updated_at INTEGER NOT NULL DEFAULT 0,
+        current_draw_id INTEGER
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS draws (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        winning_numbers TEXT NOT NULL,
+        winning_stars TEXT NOT NULL,
+        prize REAL NOT NULL,
+        player_count INTEGER NOT NULL DEFAULT 0,
+        created_at INTEGER NOT NULL,
+        published_at INTEGER,
+        status TEXT NOT NULL DEFAULT 'pending',
+        ticket_count INTEGER NOT NULL DEFAULT 0,
+        error TEXT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS draw_results (
+        draw_id INTEGER NOT NULL,
+        player_id INTEGER NOT NULL,
+        name TEXT,
+        chosen_numbers TEXT,
+        chosen_stars TEXT,
+        numbers_mask INTEGER,
+        stars_mask INTEGER,
+        gains REAL NOT NULL DEFAULT 0.0,
+        matching_numbers TEXT,
+        matching_stars TEXT,
+        matching_numbers_mask INTEGER,
+        matching_stars_mask INTEGER,
+        matching_numbers_count INTEGER,
+        matching_stars_count INTEGER,
+        proximity_numbers INTEGER NOT NULL DEFAULT 0,
+        proximity_stars INTEGER NOT NULL DEFAULT 0,
+        rank_position INTEGER,
+        tie_group INTEGER,
+        PRIMARY KEY (draw_id, player_id)
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_draw_results_rank ON draw_results (draw_id, rank_position)',
+]
+
+# Colonnes de l'encodage par masques, ajoutées par migrate_bitmask() aux bases existantes
+MASK_COLUMNS = {
+    'mysql': [
+        ('numbers_mask', 'BIGINT UNSIGNED'),
+        ('stars_mask', 'SMALLINT UNSIGNED'),
+        ('matching_numbers_mask', 'BIGINT UNSIGNED'),
+        ('matching_stars_mask', 'SMALLINT UNSIGNED'),
+        ('matching_numbers_count', 'TINYINT UNSIGNED'),
+        ('matching_stars_count', 'TINYINT UNSIGNED'),
+    ],
+    'sqlite': [
+        ('numbers_mask', 'INTEGER'),
+        ('stars_mask', 'INTEGER'),
+        ('matching_numbers_mask', 'INTEGER'),
+        ('matching_stars_mask', 'INTEGER'),
+        ('matching_numbers_count', 'INTEGER'),
+        ('matching_stars_count', 'INTEGER'),
+    ],
+}
+
+
+# Version des données (ETag / Last-Modified) et tirage courant, ajoutés par init_schema() aux bases existantes
+STATE_COLUMNS = {
+    'mysql': [('data_version', 'BIGINT NOT NULL DEFAULT 0'), ('updated_at', 'BIGINT NOT NULL DEFAULT 0'),
+              ('current_draw_id', 'INT')],
+    'sqlite': [('data_version', 'INTEGER NOT NULL DEFAULT 0'), ('updated_at', 'INTEGER NOT NULL DEFAULT 0'),
+               ('current_draw_id', 'INTEGER')],
+}
+
+
+# Nom et grille recopiés dans chaque résultat, ajoutés par init_schema() aux bases existantes
+RESULT_COLUMNS = {
+    'mysql': [('name', 'VARCHAR(255)'), ('chosen_numbers', 'VARCHAR(255)'), ('chosen_stars', 'VARCHAR(255)'),
+              ('numbers_mask', 'BIGINT UNSIGNED'), ('stars_mask', 'SMALLINT UNSIGNED')],
+    'sqlite': [('name', 'TEXT'), ('chosen_numbers', 'TEXT'), ('chosen_stars', 'TEXT'),
+               ('numbers_mask', 'INTEGER'), ('stars_mask', 'INTEGER')],
+}
+
+
+class DuplicatePlayerError(Exception):
+    """Levée quand un joueur portant le même nom existe déjà (index unique sur name)."""
+
+
+DRAW_FIELDS = ('id', 'winning_numbers', 'winning_stars', 'prize', 'player_count', 'created_at', 'published_at',
+               'status', 'ticket_count', 'error')
+
+# États d'un tirage : créé, en cours de calcul, publié (tirage courant) ou en échec
+DRAW_STATUSES = ('pending', 'running', 'published', 'failed')
+
+
+# Résultat d'un joueur absent du tirage (inscrit depuis)
+NO_RESULT = {
+    'gains': 0.0, 'matching_numbers': '', 'matching_stars': '', 'matching_numbers_mask': 0, 'matching_stars_mask': 0,
+    'proximity_numbers': 0, 'proximity_stars': 0, 'rank_position': None, 'tie_group': None,
+}
+
+
+# Ligne de draws -> dictionnaire, numéros gagnants en listes
+def draw_entry(row):
+    draw = dict(zip(DRAW_FIELDS, row))
+    draw['winning_numbers'] = parse_csv(draw['winning_numbers'])
+    draw['winning_stars'] = parse_csv(draw['winning_stars'])
+    return draw
+
+
+# Interface commune aux différents stockages (joueurs, cagnotte, tirages)
+#
+# Les grilles sont lues sous forme brute selon ticket_encoding : chaînes CSV ('csv')
+# ou masques entiers ('bitmask') ; decode() les convertit en listes d'entiers.
+#
+# Chaque tirage est une ligne de draws et ses résultats des lignes de draw_results
+# (draw_id, player_id) : un tirage n'écrit jamais dans players et l'historique est conservé,
+# y compris après delete_players() (nom et grille sont recopiés dans les résultats).
+# Le tirage courant (lu par /ranking et /classement) est le dernier tirage publié.
+class Storage:
+    name = None
+    ticket_encoding = 'csv'
+
+    def decode(self, value):
+        if self.ticket_encoding == 'bitmask':
+            return from_mask(value)
+        return parse_csv(value)
+
+    def init_schema(self):
+        raise NotImplementedError
+
+    # Ajouter et remplir les colonnes de masques à partir des colonnes CSV
+    def migrate_bitmask(self):
+        raise NotImplementedError
+
+    # Nombre de joueurs, lu dans un compteur maintenu à chaque écriture
+    def count_players(self):
+        raise NotImplementedError
+
+    # Recalculer le compteur à partir de la table players
+    def recount_players(self):
+        raise NotImplementedError
+
+    # (version, horodatage en secondes) incrémentée à chaque écriture, sans lire la table players
+    def get_data_version(self):
+        raise NotImplementedError
+
+    # Insérer un joueur ; lève DuplicatePlayerError si le nom est déjà pris
+    def add_player(self, name, chosen_numbers, chosen_stars, gains=0.0):
+        raise NotImplementedError
+
+    # Insérer plusieurs joueurs (name, chosen_numbers, chosen_stars, gains ; liste ou itérable) en une seule
+    # transaction, renvoie le nombre inséré. Tout ou rien : DuplicatePlayerError si un nom est déjà pris
+    def add_players(self, rows):
+        raise NotImplementedError
+
+    # Plus grand id de joueur (0 sans joueur)
+    def max_player_id(self):
+        raise NotImplementedError
+
+    # Noms parmi `names` déjà utilisés par un joueur
+    def existing_names(self, names):
+        raise NotImplementedError
+
+    def delete_players(self):
+        raise NotImplementedError
+
+    # (id, name, numéros, étoiles, gains, numéros trouvés, étoiles trouvées, proximity_numbers,
+    # proximity_stars) selon le tirage courant (page de classement), les `limit` premiers par id
+    def get_players(self, limit=None):
+        raise NotImplementedError
+
+    # (id, name, numéros, étoiles) triés par clé primaire ; pagination par clé (id > after)
+    def list_players(self, after=None, limit=None):
+        return [row for chunk in self.iter_players(after, limit) for row in chunk]
+
+    # Même lecture que list_players, renvoyée par paquets de chunk_size lignes
+    def iter_players(self, after=None, limit=None, chunk_size=1000):
+        raise NotImplementedError
+
+    # (id, name, numéros, étoiles) pour le calcul des résultats
+    def get_tickets(self):
+        raise NotImplementedError
+
+    # (name, numéros, étoiles, gains, numéros trouvés, étoiles trouvées,
+    #  proximity_numbers, proximity_stars) des `limit` premiers selon le rang du tirage draw_id
+    # (le tirage courant par défaut) ; pour le tirage courant, complétés par les joueurs
+    # inscrits depuis (non classés)
+    def get_ranking(self, limit=10, draw_id=None):
+        return [row for chunk in self.iter_ranking(limit, draw_id=draw_id) for row in chunk]
+
+    # Même lecture que get_ranking, renvoyée par paquets de chunk_size lignes
+    def iter_ranking(self, limit=10, chunk_size=1000, draw_id=None):
+        raise NotImplementedError
+
+    # Créer un tirage non publié (état 'pending') portant sur ticket_count grilles et renvoyer son id
+    def create_draw(self, winning_numbers, winning_stars, prize, ticket_count=0):
+        raise NotImplementedError
+
+    # Fixer le nombre de grilles réellement évaluées, connu une fois le pool lu (des joueurs ont pu
+    # s'inscrire depuis create_draw) : player_count / ticket_count ne dépasse alors jamais 1
+    def set_ticket_count(self, draw_id, ticket_count):
+        raise NotImplementedError
+
+    # Ajouter les gains, correspondances, proximités et rangs d'un tirage (joueurs identifiés par id ;
+    # liste ou itérable, consommé une seule fois). Chaque lot est validé séparément : player_count
+    # indique l'avancement tant que le tirage n'est pas publié.
+    def add_results(self, draw_id, players):
+        raise NotImplementedError
+
+    # Faire du tirage le tirage courant (état 'published'), en une seule transaction
+    def publish_draw(self, draw_id):
+        raise NotImplementedError
+
+    # Changer l'état d'un tirage non publié ('running', 'failed' avec un message d'erreur)
+    def set_draw_status(self, draw_id, status, error=None):
+        raise NotImplementedError
+
+    # Supprimer les résultats d'un tirage non publié (échec en cours d'écriture)
+    def delete_results(self, draw_id):
+        raise NotImplementedError
+
+    # Enregistrer et publier un tirage complet, renvoie son id
+    def record_draw(self, winning_numbers, winning_stars, prize, players):
+        draw_id = self.create_draw(winning_numbers, winning_stars, prize, len(players))
+        self.add_results(draw_id, players)
+        self.publish_draw(draw_id)
+        return draw_id
+
+    # Id du tirage courant (None avant le premier tirage)
+    def current_draw_id(self):
+        raise NotImplementedError
+
+    # Tirage draw_id (le tirage courant par défaut) sous forme de dictionnaire, ou None
+    def get_draw(self, draw_id=None):
+        raise NotImplementedError
+
+    # Tirages publiés, du plus récent au plus ancien ; pagination par clé (id < before)
+    def list_draws(self, before=None, limit=20):
+        raise NotImplementedError
+
+    def get_prize(self):
+        raise NotImplementedError
+
+    def set_prize(self, amount):
+        raise NotImplementedError
+
+
+# Base commune aux stockages SQL (MySQL et SQLite)
+class SQLStorage(Storage):
+    placeholder = '%s'
+    schema = []
+    batch_size = 1000
+
+    def connection(self):
+        raise NotImplementedError
+
+    def cursor(self):
+        return self.connection().cursor()
+
+    # Curseur pour les lectures par paquets (fetchmany)
+    def stream_cursor(self):
+        return self.cursor()
+
+    def _fetch_chunks(self, query, params, chunk_size):
+        cursor = self.stream_cursor()
+        cursor.execute(self._sql(query), params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+    def _sql(self, query):
+        return query.replace('%s', self.placeholder)
+
+    def init_schema(self):
+        cursor = self.cursor()
+        for statement in self.schema:
+            cursor.execute(statement)
+        self._add_missing_columns(STATE_COLUMNS[self.name], table='loto_state')
+        self._add_missing_columns(RESULT_COLUMNS[self.name], table='draw_results')
+        # Résultats enregistrés avant la copie des grilles : recopiées depuis les joueurs encore présents
+        cursor.execute('''
+            UPDATE draw_results
+            SET name = (SELECT name FROM players WHERE players.id = draw_results.player_id),
+                chosen_numbers = (SELECT chosen_numbers FROM players WHERE players.id = draw_results.player_id),
+                chosen_stars = (SELECT chosen_stars FROM players WHERE players.id = draw_results.player_id),
+                numbers_mask = (SELECT numbers_mask FROM players WHERE players.id = draw_results.player_id),
+                stars_mask = (SELECT stars_mask FROM players WHERE players.id = draw_results.player_id)
+            WHERE name IS NULL
+        ''')
+        # Échoue si la table contient déjà des doublons : ils doivent être renommés avant
+        self._ensure_index('uq_players_name', 'name', unique=True)
+        cursor.execute("SELECT COUNT(*) FROM prize")
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(self._sql("INSERT INTO prize (id, amount) VALUES (1, %s)"), (DEFAULT_PRIZE,))
+        self.connection().commit()
+        self.recount_players()
+
+    def count_players(self):
+        cursor = self.cursor()
+        cursor.execute("SELECT player_count FROM loto_state WHERE id = 1")
+        result = cursor.fetchone()
+        if result is None:
+            return self.recount_players()
+        return result[0]
+
+    def recount_players(self):
+        cursor = self.cursor()
+        cursor.execute("SELECT COUNT(*) FROM players")
+        total = cursor.fetchone()[0]
+        cursor.execute("SELECT id FROM loto_state WHERE id = 1")
+        if cursor.fetchone() is None:
+            cursor.execute(self._sql(
+                "INSERT INTO loto_state (id, player_count, data_version, updated_at) VALUES (1, %s, 1, %s)"
+            ), (total, int(time.time())))
+        else:
+            cursor.execute(self._sql("UPDATE loto_state SET player_count = %s WHERE id = 1"), (total,))
+        self.connection().commit()
+        return total
+
+    def get_data_version(self):
+        cursor = self.cursor()
+        cursor.execute("SELECT data_version, updated_at FROM loto_state WHERE id = 1")
+        result = cursor.fetchone()
+        if result is None:
+            self.recount_players()
+            return self.get_data_version()
+        return result[0], result[1]
+
+    # Mise à jour du compteur et de la version, dans la même transaction que l'écriture
+    def _record_write(self, cursor, delta=0):
+        cursor.execute(self._sql("""
+            UPDATE loto_state
+            SET player_count = player_count + %s, data_version = data_version + 1, updated_at = %s
+            WHERE id = 1
+        """), (delta, int(time.time())))
+
+    # Colonnes lues pour les grilles et les correspondances selon l'encodage (préfixe d'alias optionnel)
+    def _ticket_columns(self, prefix=''):
+        if self.ticket_encoding == 'bitmask':
+            return f"{prefix}numbers_mask, {prefix}stars_mask"
+        return f"{prefix}chosen_numbers, {prefix}chosen_stars"
+
+    def _matching_columns(self, prefix=''):
+        if self.ticket_encoding == 'bitmask':
+            return f"IFNULL({prefix}matching_numbers_mask, 0), IFNULL({prefix}matching_stars_mask, 0)"
+        return f"IFNULL({prefix}matching_numbers, ''), IFNULL({prefix}matching_stars, '')"
+
+    def _insert_query(self):
+        if self.ticket_encoding == 'bitmask':
+            query = """
+                INSERT INTO players (name, chosen_numbers, chosen_stars, gains, numbers_mask, stars_mask)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """
+        else:
+            query = "INSERT INTO players (name, chosen_numbers, chosen_stars, gains) VALUES (%s, %s, %s, %s)"
+        return self._sql(query)
+
+    def _insert_rows(self, rows):
+        if self.ticket_encoding == 'bitmask':
+            return [
+                (name, chosen_numbers, chosen_stars, gains, csv_to_mask(chosen_numbers), csv_to_mask(chosen_stars))
+                for name, chosen_numbers, chosen_stars, gains in rows
+            ]
+        return rows
+
+    # Erreur levée par le pilote en cas de violation de l'index unique
+    def _is_duplicate(self, error):
+        raise NotImplementedError
+
+    def add_player(self, name, chosen_numbers, chosen_stars, gains=0.0):
+        cursor = self.cursor()
+        try:
+            cursor.execute(self._insert_query(), self._insert_rows([(name, chosen_numbers, chosen_stars, gains)])[0])
+        except Exception as error:
+            if self._is_duplicate(error):
+                self.connection().rollback()
+                raise DuplicatePlayerError(name) from error
+            raise
+        self._record_write(cursor, 1)
+        self.connection().commit()
+
+    def add_players(self, rows):
+        cursor = self.cursor()
+        query = self._insert_query()
+        inserted = 0
+        rows = iter(rows)
+        # executemany regroupe chaque lot en une seule instruction INSERT multi-lignes (MySQL)
+        try:
+            while True:
+                batch = self._insert_rows(list(itertools.islice(rows, self.batch_size)))
+                if not batch:
+                    break
+                cursor.executemany(query, batch)
+                inserted += len(batch)
+        except Exception as error:
+            self.connection().rollback()
+            if self._is_duplicate(error):
+                raise DuplicatePlayerError(str(error)) from error
+            raise
+        self._record_write(cursor, inserted)
+        self.connection().commit()
+        return inserted
+
+    def max_player_id(self):
+        cursor = self.cursor()
+        cursor.execute("SELECT IFNULL(MAX(id), 0) FROM players")
+        return cursor.fetchone()[0]
+
+    def existing_names(self, names):
+        names = list(names)
+        cursor = self.cursor()
+        found = set()
+        # Une requête IN par lot, servie par l'index unique sur le nom
+        for start in range(0, len(names), self.batch_size):
+            batch = names[start:start + self.batch_size]
+            placeholders = ", ".join([self.placeholder] * len(batch))
+            cursor.execute(f"SELECT name FROM players WHERE name IN ({placeholders})", batch)
+            found.update(row[0] for row in cursor.fetchall())
+        return found
+
+    def delete_players(self):
+        cursor = self.cursor()
+        cursor.execute("DELETE FROM players")
+        # Les tirages passés restent consultables (grilles recopiées) ; le classement courant repart de zéro
+        cursor.execute("UPDATE loto_state SET player_count = 0, current_draw_id = NULL WHERE id = 1")
+        self._record_write(cursor)
+        self.connection().commit()
+
+    def get_players(self, limit=None):
+        query = f"""
+            SELECT p.id, p.name, {self._ticket_columns('p.')}, IFNULL(r.gains, 0), {self._matching_columns('r.')},
+                   IFNULL(r.proximity_numbers, 0), IFNULL(r.proximity_stars, 0)
+            FROM players p
+            LEFT JOIN draw_results r ON r.draw_id = %s AND r.player_id = p.id
+            ORDER BY p.id
+        """
+        params = [self.current_draw_id() or 0]
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+        cursor = self.cursor()
+        cursor.execute(self._sql(query), params)
+        return cursor.fetchall()
+
+    def iter_players(self, after=None, limit=None, chunk_size=1000):
+        query = f"SELECT id, name, {self._ticket_columns()} FROM players WHERE id > %s ORDER BY id"
+        params = [after or 0]
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+        return self._fetch_chunks(query, params, chunk_size)
+
+    def get_tickets(self):
+        cursor = self.cursor()
+        cursor.execute(f"SELECT id, name, {self._ticket_columns()} FROM players")
+        return cursor.fetchall()
+
+    def iter_ranking(self, limit=10, chunk_size=1000, draw_id=None):
+        current = self.current_draw_id()
+        if draw_id is None:
+            draw_id = current
+        def columns(ticket):
+            return f"""
+                {ticket}name,
+                {self._ticket_columns(ticket)},
+                IFNULL(r.gains, 0),
+                {self._matching_columns('r.')},
+                IFNULL(r.proximity_numbers, 0),
+                IFNULL(r.proximity_stars, 0)
+            """
+        # Lecture par l'index (draw_id, rank_position), sans jointure : nom et grille sont dans le résultat
+        ranked = 0
+        for rows in self._fetch_chunks(f"""
+            SELECT {columns('r.')}
+            FROM draw_results r
+            WHERE r.draw_id = %s AND r.rank_position IS NOT NULL
+            ORDER BY r.rank_position
+            LIMIT %s
+        """, (draw_id or 0, limit), chunk_size):
+            ranked += len(rows)
+            yield rows
+        if ranked < limit:
+            if draw_id == current:
+                # Tirage courant : joueurs sans rang, y compris ceux inscrits depuis le tirage
+                query = f"""
+                    SELECT {columns('p.')}
+                    FROM players p
+                    LEFT JOIN draw_results r ON r.draw_id = %s AND r.player_id = p.id
+                    WHERE r.rank_position IS NULL
+                    ORDER BY p.id
+                    LIMIT %s
+                """
+            else:
+                query = f"""
+                    SELECT {columns('r.')}
+                    FROM draw_results r
+                    WHERE r.draw_id = %s AND r.rank_position IS NULL
+                    ORDER BY r.player_id
+                    LIMIT %s
+                """
+            yield from self._fetch_chunks(query, (draw_id or 0, limit - ranked), chunk_size)
+
+    # Colonnes écrites pour chaque résultat, après (draw_id, player_id, name, chosen_numbers, chosen_stars)
+    def _result_columns(self):
+        if self.ticket_encoding == 'bitmask':
+            return ['numbers_mask', 'stars_mask', 'gains', 'matching_numbers_mask', 'matching_stars_mask', 'matching_numbers_count',
+                    'matching_stars_count', 'proximity_numbers', 'proximity_stars', 'rank_position', 'tie_group']
+        return ['gains', 'matching_numbers', 'matching_stars', 'proximity_numbers', 'proximity_stars',
+                'rank_position', 'tie_group']
+
+    def _result_rows(self, draw_id, players):
+        if self.ticket_encoding == 'bitmask':
+            return [
+                (
+                    draw_id,
+                    player['id'],
+                    player['name'],
+                    ",".join(map(str, player['chosen_numbers'])),
+                    ",".join(map(str, player['chosen_stars'])),
+                    to_mask(player['chosen_numbers']),
+                    to_mask(player['chosen_stars']),
+                    player['gains'],
+                    to_mask(player['matching_numbers']),
+                    to_mask(player['matching_stars']),
+                    len(player['matching_numbers']),
+                    len(player['matching_stars']),
+                    player['proximity_numbers'],
+                    player['proximity_stars'],
+                    player.get('rank_position'),
+                    player.get('tie_group')
+                )
+                for player in players
+            ]
+        return [
+            (
+                draw_id,
+                player['id'],
+                player['name'],
+                ",".join(map(str, player['chosen_numbers'])),
+                ",".join(map(str, player['chosen_stars'])),
+                player['gains'],
+                ",".join(map(str, player['matching_numbers'])),
+                ",".join(map(str, player['matching_stars'])),
+                player['proximity_numbers'],
+                player['proximity_stars'],
+                player.get('rank_position'),
+                player.get('tie_group')
+            )
+            for player in players
+        ]
+
+    def create_draw(self, winning_numbers, winning_stars, prize, ticket_count=0):
+        cursor = self.cursor()
+        cursor.execute(self._sql("""
+            INSERT INTO draws (winning_numbers, winning_stars, prize, created_at, ticket_count)
+            VALUES (%s, %s, %s, %s, %s)
+        """), (winning_numbers, winning_stars, prize, int(time.time()), ticket_count))
+        draw_id = cursor.lastrowid
+        self.connection().commit()
+        return draw_id
+
+    def set_ticket_count(self, draw_id, ticket_count):
+        cursor = self.cursor()
+        cursor.execute(self._sql("UPDATE draws SET ticket_count = %s WHERE id = %s"), (ticket_count, draw_id))
+        self.connection().commit()
+
+    # Insertions multi-lignes par lots : aucune ligne de players ni d'un autre tirage n'est réécrite
+    def add_results(self, draw_id, players):
+        cursor = self.cursor()
+        columns = ['draw_id', 'player_id', 'name', 'chosen_numbers', 'chosen_stars'] + self._result_columns()
+        placeholders = ", ".join(["%s"] * len(columns))
+        query = self._sql(f"INSERT INTO draw_results ({', '.join(columns)}) VALUES ({placeholders})")
+        progress = self._sql("UPDATE draws SET player_count = player_count + %s WHERE id = %s")
+        players = iter(players)
+        while True:
+            rows = self._result_rows(draw_id, list(itertools.islice(players, self.batch_size)))
+            if not rows:
+                break
+            cursor.executemany(query, rows)
+            cursor.execute(progress, (len(rows), draw_id))
+            self.connection().commit()
+
+    def publish_draw(self, draw_id):
+        cursor = self.cursor()
+        cursor.execute(self._sql("UPDATE draws SET published_at = %s, status = 'published' WHERE id = %s"),
+                       (int(time.time()), draw_id))
+        cursor.execute(self._sql("UPDATE loto_state SET current_draw_id = %s WHERE id = 1"), (draw_id,))
+        self._record_write(cursor)
+        self.connection().commit()
+
+    def set_draw_status(self, draw_id, status, error=None):
+        cursor = self.cursor()
+        cursor.execute(self._sql("UPDATE draws SET status = %s, error = %s WHERE id = %s AND published_at IS NULL"),
+                       (status, error and error[:255], draw_id))
+        self.connection().commit()
+
+    def delete_results(self, draw_id):
+        cursor = self.cursor()
+        cursor.execute(self._sql("DELETE FROM draw_results WHERE draw_id = %s"), (draw_id,))
+        cursor.execute(self._sql("UPDATE draws SET player_count = 0 WHERE id = %s"), (draw_id,))
+        self.connection().commit()
+
+    def current_draw_id(self):
+        cursor = self.cursor()
+        cursor.execute("SELECT current_draw_id FROM loto_state WHERE id = 1")
+        result = cursor.fetchone()
+        return result[0] if result else None
+
+    def get_draw(self, draw_id=None):
+        if draw_id is None:
+            draw_id = self.current_draw_id()
+            if draw_id is None:
+                return None
+        cursor = self.cursor()
+        cursor.execute(self._sql(f"SELECT {', '.join(DRAW_FIELDS)} FROM draws WHERE id = %s"), (draw_id,))
+        result = cursor.fetchone()
+        return draw_entry(result) if result else None
+
+    def list_draws(self, before=None, limit=20):
+        query = f"SELECT {', '.join(DRAW_FIELDS)} FROM draws WHERE published_at IS NOT NULL"
+        params = []
+        if before is not None:
+            query += " AND id < %s"
+            params.append(before)
+        query += " ORDER BY id DESC LIMIT %s"
+        params.append(limit)
+        cursor = self.cursor()
+        cursor.execute(self._sql(query), params)
+        return [draw_entry(row) for row in cursor.fetchall()]
+
+    def _existing_columns(self, table='players'):
+        raise NotImplementedError
+
+    def _ensure_index(self, name, columns, unique=False):
+        raise NotImplementedError
+
+    def _add_missing_columns(self, columns, table='players'):
+        cursor = self.cursor()
+        existing = self._existing_columns(table)
+        for column, column_type in columns:
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        self.connection().commit()
+
+    def migrate_bitmask(self):
+        cursor = self.cursor()
+        self._add_missing_columns(MASK_COLUMNS[self.name])
+
+        # Remplissage par lots, dans l'ordre de la clé primaire
+        select = self._sql("""
+            SELECT id, chosen_numbers, chosen_stars, matching_numbers, matching_stars
+            FROM players
+            WHERE numbers_mask IS NULL AND id > %s
+            ORDER BY id
+            LIMIT %s
+        """)
+        update = self._sql("""
+            UPDATE players
+            SET numbers_mask = %s, stars_mask = %s, matching_numbers_mask = %s, matching_stars_mask = %s,
+                matching_numbers_count = %s, matching_stars_count = %s
+            WHERE id = %s
+        """)
+        migrated = 0
+        last_id = 0
+        while True:
+            cursor.execute(select, (last_id, self.batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            updates = []
+            for player_id, chosen_numbers, chosen_stars, matching_numbers, matching_stars in rows:
+                matching_numbers_mask = csv_to_mask(matching_numbers)
+                matching_stars_mask = csv_to_mask(matching_stars)
+                updates.append((
+                    csv_to_mask(chosen_numbers), csv_to_mask(chosen_stars),
+                    matching_numbers_mask, matching_stars_mask,
+                    mask_count(matching_numbers_mask), mask_count(matching_stars_mask),
+                    player_id
+                ))
+            cursor.executemany(update, updates)
+            self.connection().commit()
+            migrated += len(rows)
+            last_id = rows[-1][0]
+
+        # Résultats des tirages, par lots dans l'ordre de la clé (draw_id, player_id)
+        select = self._sql("""
+            SELECT draw_id, player_id, chosen_numbers, chosen_stars, matching_numbers, matching_stars
+            FROM draw_results
+            WHERE matching_numbers_mask IS NULL AND (draw_id > %s OR (draw_id = %s AND player_id > %s))
+            ORDER BY draw_id, player_id
+            LIMIT %s
+        """)
+        update = self._sql("""
+            UPDATE draw_results
+            SET numbers_mask = %s, stars_mask = %s, matching_numbers_mask = %s, matching_stars_mask = %s,
+                matching_numbers_count = %s, matching_stars_count = %s
+            WHERE draw_id = %s AND player_id = %s
+        """)
+        last_key = (0, 0)
+        while True:
+            cursor.execute(select, (last_key[0], last_key[0], last_key[1], self.batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            updates = []
+            for draw_id, player_id, chosen_numbers, chosen_stars, matching_numbers, matching_stars in rows:
+                matching_numbers_mask = csv_to_mask(matching_numbers)
+                matching_stars_mask = csv_to_mask(matching_stars)
+                updates.append((
+                    csv_to_mask(chosen_numbers), csv_to_mask(chosen_stars),
+                    matching_numbers_mask, matching_stars_mask,
+                    mask_count(matching_numbers_mask), mask_count(matching_stars_mask),
+                    draw_id, player_id
+                ))
+            cursor.executemany(update, updates)
+            self.connection().commit()
+            last_key = rows[-1][:2]
+        return migrated
+
+    def get_prize(self):
+        cursor = self.cursor()
+        cursor.execute("SELECT amount FROM prize LIMIT 1")
+        result = cursor.fetchone()
+        return result[0] if result else DEFAULT_PRIZE
+
+    def set_prize(self, amount):
+        cursor = self.cursor()
+        cursor.execute(self._sql("UPDATE prize SET amount = %s WHERE id = 1"), (amount,))
+        self._record_write(cursor)
+        self.connection().commit()
+
+
+# Stockage MySQL : la connexion est fournie par l'application (pool ou connexion par requête)
+class MySQLStorage(SQLStorage):
+    name = 'mysql'
+    schema = MYSQL_SCHEMA
+    def __init__(self, get_connection, batch_size=1000, ticket_encoding='csv'):
+        self._get_connection = get_connection
+        self.batch_size = batch_size
+        self.ticket_encoding = ticket_encoding
+        self._schema_checked = False
+        self._schema_lock = threading.Lock()
+
+    def connection(self):
+        connection = self._get_connection()
+        if not self._schema_checked:
+            self._check_schema(connection)
+        return connection
+
+    # Au premier accès : créer les tables manquantes (base créée avant loto_state, draws et draw_results),
+    # comme le fait « flask init-db »
+    def _check_schema(self, connection):
+        with self._schema_lock:
+            if self._schema_checked:
+                return
+            # Marqué avant init_schema, qui repasse par connection()
+            self._schema_checked = True
+            try:
+                cursor = connection.cursor(buffered=True)
+                cursor.execute("SHOW TABLES")
+                existing = {row[0] for row in cursor.fetchall()}
+                if not existing.issuperset(SCHEMA_TABLES):
+                    self.init_schema()
+            except Exception as error:
+                self._schema_checked = False
+                raise RuntimeError(
+                    "Impossible d'initialiser le schéma MySQL, lancez « flask init-db » : " + str(error)
+                ) from error
+
+    def cursor(self):
+        return self.connection().cursor(buffered=True)
+
+    # Curseur non bufferisé : les lignes restent côté serveur jusqu'au fetchmany
+    def stream_cursor(self):
+        return self.connection().cursor(buffered=False)
+
+    def _existing_columns(self, table='players'):
+        cursor = self.cursor()
+        cursor.execute(f"SHOW COLUMNS FROM {table}")
+        return {row[0] for row in cursor.fetchall()}
+
+    def _ensure_index(self, name, columns, unique=False):
+        cursor = self.cursor()
+        cursor.execute("SHOW INDEX FROM players WHERE Key_name = %s", (name,))
+        if cursor.fetchone() is None:
+            cursor.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON players ({columns})")
+
+    def _is_duplicate(self, error):
+        # ER_DUP_ENTRY
+        return getattr(error, 'errno', None) == 1062
+
+
+# Stockage SQLite en mode WAL, une connexion par thread
+class SQLiteStorage(SQLStorage):
+    name = 'sqlite'
+    placeholder = '?'
+    schema = SQLITE_SCHEMA
+    def __init__(self, path, batch_size=1000, ticket_encoding='csv'):
+        self.path = path
+        self.batch_size = batch_size
+        self.ticket_encoding = ticket_encoding
+        self._local = threading.local()
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _existing_columns(self, table='players'):
+        cursor = self.cursor()
+        cursor.execute(f"PRAGMA table_info({table})")
+        return {row[1] for row in cursor.fetchall()}
+
+    def _ensure_index(self, name, columns, unique=False):
+        self.connection().execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON players ({columns})")
+
+    def _is_duplicate(self, error):
+        return isinstance(error, sqlite3.IntegrityError) and 'UNIQUE' in str(error)
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# Stockage en mémoire, sans serveur de base de données
+class MemoryStorage(Storage):
+    name = 'memory'
+
+    def __init__(self, ticket_encoding='csv'):
+        self.ticket_encoding = ticket_encoding
+        self._lock = threading.Lock()
+        self._players = []
+        self._names = set()
+        self._next_id = 1
+        self._prize = DEFAULT_PRIZE
+        # Tirages : id -> dictionnaire ; résultats : id du tirage -> {id du joueur -> résultat}
+        self._draws = {}
+        self._results = {}
+        # Résultats classés de chaque tirage, triés par rang (équivalent de l'index (draw_id, rank_position))
+        self._rankings = {}
+        self._next_draw_id = 1
+        self._current_draw_id = None
+        self._data_version = 1
+        self._updated_at = int(time.time())
+
+    def init_schema(self):
+        pass
+
+    def migrate_bitmask(self):
+        with self._lock:
+            for player in self._players:
+                player['numbers_mask'] = csv_to_mask(player['chosen_numbers'])
+                player['stars_mask'] = csv_to_mask(player['chosen_stars'])
+            for results in self._results.values():
+                for result in results.values():
+                    result['numbers_mask'] = csv_to_mask(result['chosen_numbers'])
+                    result['stars_mask'] = csv_to_mask(result['chosen_stars'])
+                    result['matching_numbers_mask'] = csv_to_mask(result['matching_numbers'])
+                    result['matching_stars_mask'] = csv_to_mask(result['matching_stars'])
+        return len(self._players)
+
+    # Grille et correspondances brutes selon l'encodage
+    def _ticket(self, p):
+        if self.ticket_encoding == 'bitmask':
+            return p['numbers_mask'], p['stars_mask']
+        return p['chosen_numbers'], p['chosen_stars']
+
+    def _matching(self, r):
+        if self.ticket_encoding == 'bitmask':
+            return r['matching_numbers_mask'] or 0, r['matching_stars_mask'] or 0
+        return r['matching_numbers'] or '', r['matching_stars'] or ''
+
+    def _ranking_row(self, p, r):
+        return (
+            (p['name'],) + self._ticket(p) + (r['gains'],) + self._matching(r) +
+            (r['proximity_numbers'], r['proximity_stars'])
+        )
+
+    def count_players(self):
+        return len(self._players)
+
+    def recount_players(self):
+        return len(self._players)
+
+    def get_data_version(self):
+        return self._data_version, self._updated_at
+
+    def _record_write(self):
+        self._data_version += 1
+        self._updated_at = int(time.time())
+
+    def add_player(self, name, chosen_numbers, chosen_stars, gains=0.0):
+        self.add_players([(name, chosen_numbers, chosen_stars, gains)])
+
+    def add_players(self, rows):
+        rows = list(rows)
+        with self._lock:
+            # Même garantie que l'index unique : tout ou rien
+            names = [row[0] for row in rows]
+            if len(set(names)) != len(names) or not self._names.isdisjoint(names):
+                duplicates = [name for name in names if name in self._names or names.count(name) > 1]
+                raise DuplicatePlayerError(duplicates[0])
+            self._names.update(names)
+            for name, chosen_numbers, chosen_stars, gains in rows:
+                self._players.append({
+                    'id': self._next_id,
+                    'name': name,
+                    'chosen_numbers': chosen_numbers,
+                    'chosen_stars': chosen_stars,
+                    'numbers_mask': None,
+                    'stars_mask': None,
+                })
+                if self.ticket_encoding == 'bitmask':
+                    self._players[-1]['numbers_mask'] = csv_to_mask(chosen_numbers)
+                    self._players[-1]['stars_mask'] = csv_to_mask(chosen_stars)
+                self._next_id += 1
+            self._record_write()
+        return len(rows)
+
+    def max_player_id(self):
+        return self._players[-1]['id'] if self._players else 0
+
+    def existing_names(self, names):
+        with self._lock:
+            return {name for name in names if name in self._names}
+
+    def delete_players(self):
+        with self._lock:
+            self._players = []
+            self._names = set()
+            self._current_draw_id = None
+            self._record_write()
+
+    def get_players(self, limit=None):
+        results = self._results.get(self._current_draw_id, {})
+        return [
+            (p['id'], p['name']) + self._ranking_row(p, results.get(p['id'], NO_RESULT))[1:]
+            for p in self._players[:limit]
+        ]
+
+    def iter_players(self, after=None, limit=None, chunk_size=1000):
+        players = self._players
+        start = bisect.bisect_right(players, after or 0, key=lambda p: p['id'])
+        end = len(players) if limit is None else min(len(players), start + limit)
+        for offset in range(start, end, chunk_size):
+            yield [(p['id'], p['name']) + self._ticket(p) for p in players[offset:min(end, offset + chunk_size)]]
+
+    def get_tickets(self):
+        return [(p['id'], p['name']) + self._ticket(p) for p in self._players]
+
+    def iter_ranking(self, limit=10, chunk_size=1000, draw_id=None):
+        current = self._current_draw_id
+        if draw_id is None:
+            draw_id = current
+        results = self._results.get(draw_id, {})
+        # Nom et grille recopiés dans chaque résultat : r tient lieu de joueur
+        rows = [self._ranking_row(r, r) for r in self._rankings.get(draw_id, [])[:limit]]
+        # Les joueurs non classés ne sont parcourus que si le classement ne suffit pas
+        if len(rows) < limit:
+            if draw_id == current:
+                unranked = (
+                    (p, results.get(p['id'], NO_RESULT)) for p in self._players
+                    if results.get(p['id'], NO_RESULT)['rank_position'] is None
+                )
+            else:
+                unranked = (
+                    (r, r) for r in sorted(results.values(), key=lambda r: r['player_id'])
+                    if r['rank_position'] is None
+                )
+            rows += (self._ranking_row(p, r) for p, r in itertools.islice(unranked, limit - len(rows)))
+        for offset in range(0, len(rows), chunk_size):
+            yield rows[offset:offset + chunk_size]
+
+    def create_draw(self, winning_numbers, winning_stars, prize, ticket_count=0):
+        with self._lock:
+            draw_id = self._next_draw_id
+            self._next_draw_id += 1
+            self._draws[draw_id] = {
+                'id': draw_id,
+                'winning_numbers': winning_numbers,
+                'winning_stars': winning_stars,
+                'prize': float(prize),
+                'player_count': 0,
+                'created_at': int(time.time()),
+                'published_at': None,
+                'status': 'pending',
+                'ticket_count': ticket_count,
+                'error': None,
+            }
+            self._results[draw_id] = {}
+        return draw_id
+
+    def set_ticket_count(self, draw_id, ticket_count):
+        with self._lock:
+            self._draws[draw_id]['ticket_count'] = ticket_count
+
+    def add_results(self, draw_id, players):
+        with self._lock:
+            results = self._results[draw_id]
+            for player in players:
+                results[player['id']] = {
+                    'player_id': player['id'],
+                    'name': player['name'],
+                    'chosen_numbers': ",".join(map(str, player['chosen_numbers'])),
+                    'chosen_stars': ",".join(map(str, player['chosen_stars'])),
+                    'numbers_mask': to_mask(player['chosen_numbers']),
+                    'stars_mask': to_mask(player['chosen_stars']),
+                    'gains': player['gains'],
+                    'matching_numbers': ",".join(map(str, player['matching_numbers'])),
+                    'matching_stars': ",".join(map(str, player['matching_stars'])),
+                    'matching_numbers_mask': to_mask(player['matching_numbers']),
+                    'matching_stars_mask': to_mask(player['matching_stars']),
+                    'proximity_numbers': player['proximity_numbers'],
+                    'proximity_stars': player['proximity_stars'],
+                    'rank_position': player.get('rank_position'),
+                    'tie_group': player.get('tie_group'),
+                }
+            self._rankings[draw_id] = sorted(
+                (r for r in results.values() if r['rank_position'] is not None),
+                key=lambda r: r['rank_position']
+            )
+            self._draws[draw_id]['player_count'] = len(results)
+
+    def publish_draw(self, draw_id):
+        with self._lock:
+            self._draws[draw_id]['published_at'] = int(time.time())
+            self._draws[draw_id]['status'] = 'published'
+            self._current_draw_id = draw_id
+            self._record_write()
+
+    def set_draw_status(self, draw_id, status, error=None):
+        with self._lock:
+            draw = self._draws[draw_id]
+            if draw['published_at'] is None:
+                draw['status'] = status
+                draw['error'] = error and error[:255]
+
+    def delete_results(self, draw_id):
+        with self._lock:
+            self._results[draw_id] = {}
+            self._rankings.pop(draw_id, None)
+            self._draws[draw_id]['player_count'] = 0
+
+    def current_draw_id(self):
+        return self._current_draw_id
+
+    def get_draw(self, draw_id=None):
+        draw = self._draws.get(self._current_draw_id if draw_id is None else draw_id)
+        if draw is None:
+            return None
+        return draw_entry(tuple(draw[field] for field in DRAW_FIELDS))
+
+    def list_draws(self, before=None, limit=20):
+        draws = [
+            draw for draw_id, draw in sorted(self._draws.items(), reverse=True)
+            if draw['published_at'] is not None and (before is None or draw_id < before)
+        ]
+        return [draw_entry(tuple(draw[field] for field in DRAW_FIELDS)) for draw in draws[:limit]]
+
+    def get_prize(self):
+        return self._prize
+
+    def set_prize(self, amount):
+        with self._lock:
+            self._prize = float(amount)
+            self._record_write()
+
+
+# Créer le stockage choisi par la configuration (STORAGE_BACKEND)
+def create_storage(config, get_connection=None):
+    backend = config.get('STORAGE_BACKEND', 'mysql')
+    batch_size = config.get('BULK_INSERT_BATCH_SIZE', 1000)
+    encoding = config.get('TICKET_ENCODING', 'csv')
+    if encoding not in ('csv', 'bitmask'):
+        raise ValueError(f"Encodage des grilles inconnu : {encoding}")
+    if backend == 'mysql':
+        return MySQLStorage(get_connection, batch_size=batch_size, ticket_encoding=encoding)
+    if backend == 'sqlite':
+        storage = SQLiteStorage(config.get('SQLITE_PATH', 'loto.db'), batch_size=batch_size, ticket_encoding=encoding)
+        storage.init_schema()
+        return storage
+    if backend == 'memory':
+        return MemoryStorage(ticket_encoding=encoding)
+    raise ValueError(f"Stockage inconnu : {backend}")
@@ -0,0 +1,72 @@
+# tests/backends.py
+
+import os
+import tempfile
+from app import app, reset_storage
+
+
+class StorageAppMixin:
+    """Application de test sur un stockage sans serveur MySQL (choisi par une classe *Backend)."""
+
+    backend = None
+
+    def setUp(self):
+        app.config['TESTING'] = True
+        app.config['STORAGE_BACKEND'] = self.backend
+        self.configure()
+        self.storage = reset_storage()
+        self.app = app.test_client()
+        self.app_context = app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+        app.config['STORAGE_BACKEND'] = 'mysql'
+        reset_storage()
+
+    def configure(self):
+        pass
+
+    def add_player(self, name, numbers, stars):
+        return self.app.post('/add_player', data={
+            'name': name,
+            'chosen_numbers': numbers,
+            'chosen_stars': stars
+        })
+
+
+# Stockages sur lesquels chaque module de tests est exécuté
+class MemoryBackend:
+    backend = 'memory'
+
+
+class SQLiteBackend:
+    backend = 'sqlite'
+
+    def configure(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        app.config['SQLITE_PATH'] = os.path.join(self.tmpdir.name, 'loto_test.db')
+
+    def tearDown(self):
+        self.storage.close()
+        super().tearDown()
+        self.tmpdir.cleanup()
+
+
+class MemoryBitmaskBackend(MemoryBackend):
+    def configure(self):
+        app.config['TICKET_ENCODING'] = 'bitmask'
+
+    def tearDown(self):
+        app.config['TICKET_ENCODING'] = 'csv'
+        super().tearDown()
+
+
+class SQLiteBitmaskBackend(SQLiteBackend):
+    def configure(self):
+        super().configure()
+        app.config['TICKET_ENCODING'] = 'bitmask'
+
+    def tearDown(self):
+        app.config['TICKET_ENCODING'] = 'csv'
+        super().tearDown()
@@ -1,7 +1,8 @@
 # tests/test_app.py
 
 import unittest
-from app import app, get_db, get_cursor
+from app import app, get_db, get_cursor, reset_storage
+from storage import MYSQL_SCHEMA
 import mysql.connector
 import json
 from bs4 import BeautifulSoup
@@ -11,6 +12,8 @@ class LotoAppTestCase(unittest.TestCase):
         # Configuration de l'application pour le test
         app.config['TESTING'] = True
         app.config['DB_NAME'] = 'loto_test_db'  # Utiliser une base de données de test
+        app.config['STORAGE_BACKEND'] = 'mysql'
+        reset_storage()
         self.app = app.test_client()
 
         # Pousser le contexte d'application
@@ -34,9 +37,11 @@ class LotoAppTestCase(unittest.TestCase):
         # Nettoyer les tables
         self.cursor.execute("DELETE FROM players")
         self.cursor.execute("DELETE FROM prize")
-        self.cursor.execute("DELETE FROM jackpot")
+        self.cursor.execute("DELETE FROM draw_results")
+        self.cursor.execute("DELETE FROM draws")
         self.cursor.execute("INSERT INTO prize (id, amount) VALUES (1, 3000000)")
-        self.cursor.execute("INSERT INTO jackpot (id, winning_numbers, winning_stars) VALUES (1, '', '')")
+        self.cursor.execute("DELETE FROM loto_state")
+        self.cursor.execute("INSERT INTO loto_state (id, player_count, data_version) VALUES (1, 0, 1)")
         self.connection.commit()
 
     def tearDown(self):
@@ -49,35 +54,9 @@ class LotoAppTestCase(unittest.TestCase):
         # self.cursor.execute('DROP DATABASE loto_test_db')
 
     def create_tables(self):
-        # Créer la table 'players'
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS players (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(255) NOT NULL,
-                chosen_numbers VARCHAR(255) NOT NULL,
-                chosen_stars VARCHAR(255) NOT NULL,
-                gains FLOAT DEFAULT 0.0,
-                matching_numbers VARCHAR(255),
-                matching_stars VARCHAR(255),
-                proximity_numbers INT DEFAULT 0,
-                proximity_stars INT DEFAULT 0
-            )
-        ''')
-        # Créer la table 'prize'
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS prize (
-                id INT PRIMARY KEY,
-                amount FLOAT
-            )
-        ''')
-        # Créer la table 'jackpot'
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS jackpot (
-                id INT PRIMARY KEY,
-                winning_numbers VARCHAR(255),
-                winning_stars VARCHAR(255)
-            )
-        ''')
+        # Créer les tables 'players', 'prize', 'draws' et 'draw_results' à partir du schéma de l'application
+        for statement in MYSQL_SCHEMA:
+            self.cursor.execute(statement)
         self.connection.commit()
 
     def extract_text(self, response):
@@ -217,5 +196,20 @@ class LotoAppTestCase(unittest.TestCase):
         data = json.loads(response.get_data(as_text=True))
         self.assertEqual(len(data), 5)
 
+    def test_missing_tables_created_on_first_use(self):
+        # Base créée avant l'ajout de loto_state, draws et draw_results (sans « flask init-db »)
+        self.cursor.execute("DROP TABLE draw_results")
+        self.cursor.execute("DROP TABLE draws")
+        self.cursor.execute("DROP TABLE loto_state")
+        self.connection.commit()
+        reset_storage()
+
+        response = self.app.get('/draws')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.get_data(as_text=True)), [])
+        self.cursor.execute("SHOW TABLES")
+        tables = {row[0] for row in self.cursor.fetchall()}
+        self.assertTrue({'loto_state', 'draws', 'draw_results'} <= tables)
+
 if __name__ == '__main__':
     unittest.main()
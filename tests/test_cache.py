@@ -0,0 +1,60 @@
+# tests/test_cache.py
+
+import time
+import unittest
+from cache import ResponseCache
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    def test_hit_and_miss(self):
+        cache = ResponseCache(max_entries=2)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', (b'[1]', 'application/json', []))
+        self.assertEqual(cache.get('a'), (b'[1]', 'application/json', []))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['bytes'], 3)
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put('a', (b'a',))
+        cache.put('b', (b'b',))
+        cache.get('a')
+        cache.put('c', (b'c',))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_byte_budget(self):
+        cache = ResponseCache(max_entries=10, max_bytes=6, max_entry_bytes=4)
+        cache.put('big', (b'12345',))
+        self.assertIsNone(cache.get('big'))
+        cache.put('a', (b'aaa',))
+        cache.put('b', (b'bbb',))
+        cache.put('c', (b'cc',))
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('b'))
+        cache.put('b', (b'b',))
+        stats = cache.stats()
+        self.assertEqual((stats['bytes'], stats['oversized'], stats['evictions']), (3, 1, 1))
+
+    def test_expired_entry_is_dropped(self):
+        cache = ResponseCache(ttl=0.01)
+        cache.put('a', (b'a',))
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('a'))
+        stats = cache.stats()
+        self.assertEqual(stats['expirations'], 1)
+        self.assertEqual(stats['entries'], 0)
+
+    def test_clear(self):
+        cache = ResponseCache()
+        cache.put('a', (b'a',))
+        cache.clear()
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['invalidations'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
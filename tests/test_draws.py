@@ -0,0 +1,184 @@
+# tests/test_draws.py
+
+import json
+import time
+import unittest
+from app import app, compareResultsWithJackpot, new_draw, run_draw
+from tests.backends import (MemoryBackend, MemoryBitmaskBackend, SQLiteBackend, SQLiteBitmaskBackend,
+                            StorageAppMixin)
+
+
+class DrawRoutesMixin(StorageAppMixin):
+    """Tirages, classement et historique des tirages."""
+
+    def test_draw_history(self):
+        self.app.post('/generate_players', data={'num_players': '8'})
+        first = json.loads(self.app.get('/generate_jackpot').get_data(as_text=True))
+        first_ranking = json.loads(self.app.get('/ranking').get_data(as_text=True))
+        second = json.loads(self.app.get('/generate_jackpot').get_data(as_text=True))
+        self.assertEqual(second['draw_id'], first['draw_id'] + 1)
+
+        # Le tirage précédent reste consultable et les grilles ne changent pas
+        past = json.loads(self.app.get(f"/ranking?draw={first['draw_id']}").get_data(as_text=True))
+        self.assertEqual(past, first_ranking)
+        self.assertEqual(self.app.get('/ranking?draw=999').status_code, 404)
+
+        draws = json.loads(self.app.get('/draws').get_data(as_text=True))
+        self.assertEqual([d['id'] for d in draws], [second['draw_id'], first['draw_id']])
+        self.assertEqual(draws[1]['winning_numbers'], first['winning_numbers'])
+        self.assertEqual(draws[1]['player_count'], 8)
+        response = self.app.get('/draws?limit=1')
+        self.assertEqual(response.headers['X-Next-Cursor'], str(second['draw_id']))
+        older = json.loads(self.app.get(f"/draws?before={second['draw_id']}").get_data(as_text=True))
+        self.assertEqual([d['id'] for d in older], [first['draw_id']])
+
+        # Un tirage non publié n'est pas visible
+        self.storage.create_draw('1,2,3,4,5', '1,2', 3000000)
+        self.assertEqual(len(json.loads(self.app.get('/draws').get_data(as_text=True))), 2)
+        self.assertEqual(self.storage.get_draw()['id'], second['draw_id'])
+
+        # Après suppression des joueurs, les tirages publiés gardent leur classement
+        second_ranking = json.loads(self.app.get(f"/ranking?draw={second['draw_id']}&limit=8").get_data(as_text=True))
+        self.app.post('/delete_players')
+        self.assertEqual(self.app.get('/ranking').get_json(), [])
+        self.assertEqual(json.loads(self.app.get(f"/ranking?draw={first['draw_id']}").get_data(as_text=True)),
+                         first_ranking)
+        self.assertEqual(
+            json.loads(self.app.get(f"/ranking?draw={second['draw_id']}&limit=8").get_data(as_text=True)),
+            second_ranking
+        )
+        self.assertEqual(len(json.loads(self.app.get('/draws').get_data(as_text=True))), 2)
+
+        # Nouveaux joueurs (ids éventuellement réutilisés) : l'historique ne change pas
+        self.app.post('/generate_players', data={'num_players': '3'})
+        self.assertEqual(json.loads(self.app.get(f"/ranking?draw={first['draw_id']}").get_data(as_text=True)),
+                         first_ranking)
+
+    def test_generate_jackpot_and_ranking(self):
+        self.add_player('Alice', '10,20,30,40,49', '1,2')
+        self.add_player('Bob', '5,15,25,35,45', '3,4')
+        response = self.app.get('/generate_jackpot')
+        data = json.loads(response.get_data(as_text=True))
+        self.assertEqual(len(data['winning_numbers']), 5)
+
+        ranking = json.loads(self.app.get('/ranking').get_data(as_text=True))
+        self.assertEqual(len(ranking), 2)
+        expected = compareResultsWithJackpot(data['winning_numbers'], data['winning_stars'])
+        self.assertEqual({p['name'] for p in ranking}, {p['name'] for p in expected})
+        self.assertAlmostEqual(sum(p['gains'] for p in ranking), 3000000, delta=0.05)
+
+    def wait_for_draw(self, status_url):
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            draw = json.loads(self.app.get(status_url).get_data(as_text=True))
+            if draw['status'] in ('published', 'failed'):
+                return draw
+            time.sleep(0.01)
+        self.fail("Le tirage n'a pas abouti")
+
+    def test_background_draw(self):
+        self.app.post('/generate_players', data={'num_players': '20'})
+        response = self.app.post('/draws')
+        self.assertEqual(response.status_code, 202)
+        data = json.loads(response.get_data(as_text=True))
+        self.assertEqual(response.headers['Location'], data['status_url'])
+
+        draw = self.wait_for_draw(data['status_url'])
+        self.assertEqual((draw['status'], draw['progress'], draw['player_count']), ('published', 1.0, 20))
+        self.assertEqual(self.storage.current_draw_id(), data['draw_id'])
+        expected = compareResultsWithJackpot(data['winning_numbers'], data['winning_stars'])
+        ranking = json.loads(self.app.get('/ranking').get_data(as_text=True))
+        self.assertEqual([p['name'] for p in ranking], [p['name'] for p in expected[:10]])
+        self.assertEqual(self.app.get('/draws/999').status_code, 404)
+
+    def test_progress_counts_tickets_when_draw_runs(self):
+        self.app.post('/generate_players', data={'num_players': '5'})
+        draw_id, winning_numbers, winning_stars = new_draw()
+        # Inscriptions entre la création du tirage et son calcul
+        self.app.post('/generate_players', data={'num_players': '3'})
+        add_results = self.storage.add_results
+        progress = []
+
+        def checked_add_results(draw_id, players):
+            add_results(draw_id, players)
+            progress.append(json.loads(self.app.get(f'/draws/{draw_id}').get_data(as_text=True))['progress'])
+
+        self.storage.add_results = checked_add_results
+        try:
+            run_draw(draw_id, winning_numbers, winning_stars)
+        finally:
+            self.storage.add_results = add_results
+        self.assertEqual(progress, [1.0])
+        self.assertEqual(self.storage.get_draw(draw_id)['ticket_count'], 8)
+
+    def test_failed_draw_is_not_published(self):
+        self.app.post('/generate_players', data={'num_players': '5'})
+        published = json.loads(self.app.get('/generate_jackpot').get_data(as_text=True))['draw_id']
+        add_results = self.storage.add_results
+
+        def failing_add_results(draw_id, players):
+            add_results(draw_id, players[:2])
+            raise RuntimeError("écriture interrompue")
+
+        self.storage.add_results = failing_add_results
+        try:
+            data = json.loads(self.app.post('/draws').get_data(as_text=True))
+            draw = self.wait_for_draw(data['status_url'])
+        finally:
+            self.storage.add_results = add_results
+        self.assertEqual((draw['status'], draw['error'], draw['player_count']), ('failed', "écriture interrompue", 0))
+        self.assertEqual(self.storage.current_draw_id(), published)
+        self.assertEqual(self.storage.get_ranking(draw_id=data['draw_id']), [])
+        self.assertEqual([d['id'] for d in json.loads(self.app.get('/draws').get_data(as_text=True))], [published])
+        self.assertEqual(self.app.get(f"/ranking?draw={data['draw_id']}").status_code, 404)
+
+    def test_unpublished_draw_ranking_is_hidden(self):
+        self.app.post('/generate_players', data={'num_players': '5'})
+        draw_id, winning_numbers, winning_stars = new_draw()
+        self.assertEqual(self.app.get(f'/ranking?draw={draw_id}').status_code, 404)
+
+        # Résultats à moitié écrits d'un tirage en cours : ni servis, ni mis en cache
+        self.storage.set_draw_status(draw_id, 'running')
+        players = compareResultsWithJackpot(winning_numbers, winning_stars)
+        self.storage.add_results(draw_id, players[:1])
+        self.assertEqual(self.app.get(f'/ranking?draw={draw_id}').status_code, 404)
+        self.assertEqual(self.app.get(f'/ranking?draw={draw_id}&stream=1').status_code, 404)
+
+        self.storage.delete_results(draw_id)
+        run_draw(draw_id, winning_numbers, winning_stars)
+        ranking = json.loads(self.app.get(f'/ranking?draw={draw_id}').get_data(as_text=True))
+        self.assertEqual(len(ranking), 5)
+
+    def test_ranking_follows_draw_order(self):
+        self.app.post('/generate_players', data={'num_players': '25'})
+        data = json.loads(self.app.get('/generate_jackpot').get_data(as_text=True))
+        expected = compareResultsWithJackpot(data['winning_numbers'], data['winning_stars'])
+
+        # Un joueur inscrit après le tirage apparaît après les joueurs classés
+        self.add_player('Zoe', '1,2,3,4,5', '1,2')
+        ranking = json.loads(self.app.get('/ranking').get_data(as_text=True))
+        self.assertEqual([p['name'] for p in ranking], [p['name'] for p in expected[:10]])
+        self.storage.delete_players()
+        self.add_player('Zoe', '1,2,3,4,5', '1,2')
+        ranking = json.loads(self.app.get('/ranking').get_data(as_text=True))
+        self.assertEqual([p['name'] for p in ranking], ['Zoe'])
+
+
+class MemoryDrawRoutesTestCase(MemoryBackend, DrawRoutesMixin, unittest.TestCase):
+    pass
+
+
+class SQLiteDrawRoutesTestCase(SQLiteBackend, DrawRoutesMixin, unittest.TestCase):
+    pass
+
+
+class MemoryBitmaskDrawRoutesTestCase(MemoryBitmaskBackend, DrawRoutesMixin, unittest.TestCase):
+    pass
+
+
+class SQLiteBitmaskDrawRoutesTestCase(SQLiteBitmaskBackend, DrawRoutesMixin, unittest.TestCase):
+    pass
+
+
+if __name__ == '__main__':
+    unittest.main()
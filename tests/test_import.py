@@ -0,0 +1,84 @@
+# tests/test_import.py
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from app import app
+from tests.backends import (MemoryBackend, MemoryBitmaskBackend, SQLiteBackend, SQLiteBitmaskBackend,
+                            StorageAppMixin)
+
+
+class ImportMixin(StorageAppMixin):
+    """Import de fichiers de grilles (route /import_players et commande import-players)."""
+
+    def test_import_players(self):
+        app.config['IMPORT_BATCH_SIZE'] = 3
+        self.add_player('Alice', '1,2,3,4,5', '1,2')
+        lines = ['name,chosen_numbers,chosen_stars',
+                 'Bob,"5,4,3,2,1","1,2"',
+                 'Alice,"1,2,3,4,5","1,2"',
+                 'Carl,"1,2,3,4",\'1,2\'',
+                 'Dan,"6,7,8,9,10","3,4"',
+                 'Dan,"6,7,8,9,10","3,4"',
+                 'Eve,"6,7,8,9,10","3,4"\r',
+                 'Fred']
+        response = self.app.post('/import_players', data={
+            'file': (io.BytesIO("\n".join(lines).encode()), 'grilles.csv')
+        })
+        report = json.loads(response.get_data(as_text=True))
+        self.assertEqual((report['read'], report['inserted'], report['rejected']), (7, 3, 4))
+        self.assertEqual([error['line'] for error in report['errors']], [3, 4, 6, 8])
+        self.assertIn('rows_per_second', report)
+
+        ndjson = "\n".join([json.dumps({'name': 'Gina', 'chosen_numbers': [1, 2, 3, 4, 5], 'chosen_stars': '1,2'}),
+                            '', 'pas du json',
+                            json.dumps({'name': 'Bob', 'chosen_numbers': '1,2,3,4,5', 'chosen_stars': '1,2'})])
+        response = self.app.post('/import_players?format=ndjson', data=ndjson)
+        report = json.loads(response.get_data(as_text=True))
+        self.assertEqual((report['read'], report['inserted'], report['rejected']), (3, 1, 2))
+        names = [p['name'] for p in json.loads(self.app.get('/all_players').get_data(as_text=True))]
+        self.assertEqual(names, ['Alice', 'Bob', 'Dan', 'Eve', 'Gina'])
+
+        self.assertEqual(self.app.post('/import_players?format=csv', data='nom\nBob').status_code, 400)
+        self.assertEqual(self.app.post('/import_players?format=xml', data='').status_code, 400)
+
+        # Commande CLI équivalente
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'grilles.ndjson')
+            with open(path, 'w') as f:
+                f.write(json.dumps({'name': 'Hugo', 'chosen_numbers': '1,2,3,4,5', 'chosen_stars': '1,2'}) + "\n")
+            result = app.test_cli_runner().invoke(args=['import-players', path])
+            self.assertIn("1 joueurs importés, 0 lignes rejetées sur 1", result.output)
+
+            # En-tête CSV invalide : message d'erreur, pas de trace
+            path = os.path.join(tmpdir, 'grilles.csv')
+            with open(path, 'w') as f:
+                f.write("nom\nBob\n")
+            result = app.test_cli_runner().invoke(args=['import-players', path])
+            self.assertEqual(result.exit_code, 1)
+            self.assertIsInstance(result.exception, SystemExit)
+            self.assertIn("Error:", result.output)
+        self.assertEqual(self.storage.count_players(), 6)
+        app.config['IMPORT_BATCH_SIZE'] = 5000
+
+
+class MemoryImportTestCase(MemoryBackend, ImportMixin, unittest.TestCase):
+    pass
+
+
+class SQLiteImportTestCase(SQLiteBackend, ImportMixin, unittest.TestCase):
+    pass
+
+
+class MemoryBitmaskImportTestCase(MemoryBitmaskBackend, ImportMixin, unittest.TestCase):
+    pass
+
+
+class SQLiteBitmaskImportTestCase(SQLiteBitmaskBackend, ImportMixin, unittest.TestCase):
+    pass
+
+
+if __name__ == '__main__':
+    unittest.main()
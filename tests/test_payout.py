@@ -0,0 +1,108 @@
+# tests/test_payout.py
+
+from fractions import Fraction
+import random
+import unittest
+from app import app, reset_storage, are_players_equal, distribute_gains, pay_players, compareResultsWithJackpot
+from payout import GAIN_PERCENTAGES, PAYOUT_TABLES, distribute_payout, payout_cents, to_cents
+
+
+def ranked_players(groups):
+    # Classement trié : un groupe d'égalité par taille donnée, proximités croissantes d'un groupe à l'autre
+    players = []
+    for proximity, size in enumerate(groups):
+        for _ in range(size):
+            players.append({
+                'id': len(players) + 1,
+                'matching_numbers': [], 'matching_stars': [],
+                'proximity_numbers': proximity, 'proximity_stars': 0,
+                'gains': 0.00,
+            })
+    return players
+
+
+class PayoutTestCase(unittest.TestCase):
+    def setUp(self):
+        app.config['TESTING'] = True
+        app.config['STORAGE_BACKEND'] = 'memory'
+        self.storage = reset_storage()
+        self.app_context = app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+        app.config['PAYOUT_ENGINE'] = 'float'
+        app.config['STORAGE_BACKEND'] = 'mysql'
+        reset_storage()
+
+    def payouts(self, groups, prize):
+        self.storage.set_prize(prize)
+        expected = [p['gains'] for p in distribute_gains(ranked_players(groups))]
+        actual = [p['gains'] for p in distribute_payout(ranked_players(groups), prize, are_players_equal)]
+        return expected, actual
+
+    def test_tables_allocate_whole_prize(self):
+        for count in range(1, len(GAIN_PERCENTAGES) + 1):
+            self.assertEqual(len(PAYOUT_TABLES[count]), count)
+            self.assertEqual(sum(PAYOUT_TABLES[count]), 100)
+        self.assertEqual(PAYOUT_TABLES[2], (Fraction(200, 3), Fraction(100, 3)))
+
+    def test_matches_distribute_gains_on_whole_cents(self):
+        for groups in ([1] * 12, [1] * 5, [3, 2, 1, 1, 1, 4], [1, 1]):
+            expected, actual = self.payouts(groups, 3000000)
+            self.assertEqual(actual, expected, groups)
+
+    def test_within_one_cent_of_distribute_gains(self):
+        rng = random.Random(23)
+        for _ in range(500):
+            groups = [rng.choice([1, 1, 1, 2, 3, 7]) for _ in range(rng.randint(1, 12))]
+            prize = round(rng.uniform(1, 5000000), 2)
+            expected, actual = self.payouts(groups, prize)
+            for old, new in zip(expected, actual):
+                self.assertLessEqual(abs(to_cents(old) - to_cents(new)), 1, (groups, prize))
+
+            # Même montant pour tous les membres d'un groupe d'égalité classés dans les places payées
+            position = 0
+            for size in groups:
+                self.assertLessEqual(len(set(actual[position:min(position + size, 10)])), 1, (groups, prize))
+                position += size
+
+            # Jamais plus que la cagnotte ; quand aucun groupe ne dépasse la 10e place, il en manque
+            # moins d'un centime par membre du plus grand groupe (centimes non partageables)
+            total = sum(to_cents(gain) for gain in actual)
+            self.assertLessEqual(total, to_cents(prize))
+            boundaries = {sum(groups[:i]) for i in range(len(groups) + 1)}
+            if 10 in boundaries or sum(groups) < 10:
+                self.assertGreater(total, to_cents(prize) - max(groups), (groups, prize))
+                if max(groups) == 1:
+                    self.assertEqual(total, to_cents(prize), (groups, prize))
+
+    def test_tie_members_are_paid_equally(self):
+        # 100 centimes partagés à trois : le centime restant ne se partage pas
+        self.assertEqual(payout_cents(ranked_players([3]), 100, are_players_equal), [33, 33, 33])
+        # Centimes restants rendus par groupes entiers, aux plus grands restes d'abord
+        cents = payout_cents(ranked_players([1, 2, 7]), 1001, are_players_equal)
+        self.assertEqual(cents[1], cents[2])
+        self.assertEqual(len(set(cents[3:])), 1)
+        self.assertLessEqual(1001 - sum(cents), 6)
+
+    def test_tie_across_tenth_place_is_not_paid(self):
+        expected, actual = self.payouts([8, 5], 1000)
+        self.assertEqual(actual[10:], [0.0, 0.0, 0.0])
+        self.assertEqual(actual[:8], expected[:8])
+
+    def test_cents_engine(self):
+        app.config['PAYOUT_ENGINE'] = 'cents'
+        rng = random.Random(4)
+        self.storage.add_players([
+            (f"Joueur_{i}", ",".join(map(str, rng.sample(range(1, 50), 5))),
+             ",".join(map(str, rng.sample(range(1, 10), 2))), 0.0)
+            for i in range(1, 300)
+        ])
+        self.storage.set_prize(1234567.89)
+        expected = distribute_payout(compareResultsWithJackpot([5, 10, 15, 20, 25], [3, 4]), 1234567.89, are_players_equal)
+        actual = pay_players(compareResultsWithJackpot([5, 10, 15, 20, 25], [3, 4]))
+        self.assertEqual({p['id']: p['gains'] for p in actual}, {p['id']: p['gains'] for p in expected})
+
+if __name__ == '__main__':
+    unittest.main()
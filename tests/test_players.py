@@ -0,0 +1,173 @@
+# tests/test_players.py
+
+import json
+import threading
+import unittest
+from app import app
+from tests.backends import (MemoryBackend, MemoryBitmaskBackend, SQLiteBackend, SQLiteBitmaskBackend,
+                            StorageAppMixin)
+
+
+class PlayerRoutesMixin(StorageAppMixin):
+    """Routes d'inscription, de liste et de suppression des joueurs."""
+
+    def test_add_player_and_duplicate(self):
+        response = self.add_player('TestPlayer', '1,2,3,4,5', '1,2')
+        self.assertIn("a été ajouté avec succès", response.get_data(as_text=True))
+        response = self.add_player('TestPlayer', '6,7,8,9,10', '3,4')
+        self.assertIn("existe déjà", response.get_data(as_text=True))
+        self.assertEqual(self.storage.count_players(), 1)
+
+    def test_add_players_batch(self):
+        self.add_player('Alice', '1,2,3,4,5', '1,2')
+        tickets = [
+            {'name': 'Bob', 'chosen_numbers': [5, 4, 3, 2, 1], 'chosen_stars': '9,8'},
+            {'name': 'Alice', 'chosen_numbers': '6,7,8,9,10', 'chosen_stars': '3,4'},
+            {'name': 'Carl', 'chosen_numbers': '1,2,3,4,50', 'chosen_stars': '3,4'},
+            {'name': 'Bob', 'chosen_numbers': '6,7,8,9,10', 'chosen_stars': '3,4'},
+            {'name': 'Dan1', 'chosen_numbers': '6,7,8,9,10', 'chosen_stars': '3,4'},
+            {'name': 'Eve', 'chosen_numbers': [1, 1, 2, 3, 4], 'chosen_stars': [1, 2]},
+            'Fred',
+            {'name': 'Gina', 'chosen_numbers': '10,20,30,40,49', 'chosen_stars': [1, 2]},
+        ]
+        response = self.app.post('/add_players', json=tickets)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.get_data(as_text=True))
+        self.assertEqual(data['inserted'], 2)
+        self.assertEqual(data['remaining_slots'], 97)
+        self.assertEqual([(e['index'], e['error_message']) for e in data['errors']], [
+            (1, "Un joueur avec le nom 'Alice' existe déjà."),
+            (2, "Les numéros doivent être entre 1 et 49."),
+            (3, "Un joueur avec le nom 'Bob' existe déjà."),
+            (4, "Le nom doit contenir uniquement des lettres."),
+            (5, "Les numéros doivent être uniques."),
+            (6, "Grille invalide"),
+        ])
+        players = json.loads(self.app.get('/all_players').get_data(as_text=True))
+        self.assertEqual([p['name'] for p in players], ['Alice', 'Bob', 'Gina'])
+        self.assertEqual(players[1]['chosen_stars'], [8, 9] if self.storage.ticket_encoding == 'bitmask' else [9, 8])
+
+        # Places restantes limitées à 100 participants
+        tickets = [{'name': f"Joueur {chr(65 + i // 26)}{chr(65 + i % 26)}", 'chosen_numbers': '1,2,3,4,5',
+                    'chosen_stars': '1,2'} for i in range(100)]
+        data = json.loads(self.app.post('/add_players', json=tickets).get_data(as_text=True))
+        self.assertEqual((data['inserted'], data['rejected'], data['remaining_slots']), (97, 3, 0))
+        self.assertEqual(self.storage.count_players(), 100)
+        self.assertEqual(self.app.post('/add_players', json={'name': 'Bob'}).status_code, 400)
+
+    def test_generate_players_name_collision(self):
+        self.storage.add_players([(f"Joueur_{i}", '1,2,3,4,5', '1,2', 0.0) for i in range(1, 4)])
+        count_players = self.storage.count_players
+        # Compte lu par une requête concurrente avant l'insertion de Joueur_2 et Joueur_3
+        self.storage.count_players = lambda: 1
+        try:
+            response = self.app.post('/generate_players', data={'num_players': '2'})
+        finally:
+            self.storage.count_players = count_players
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("2 joueurs ont été générés avec succès.", response.get_data(as_text=True))
+        self.assertEqual([row[1] for row in self.storage.list_players()],
+                         ['Joueur_1', 'Joueur_2', 'Joueur_3', 'Joueur_4', 'Joueur_5'])
+
+    def test_generate_players_inserts_nothing_on_collision(self):
+        # Nom choisi à la main : aucune nouvelle tentative ne l'évite, rien n'est inséré
+        app.config['BULK_INSERT_BATCH_SIZE'] = 2
+        try:
+            self.storage.add_player('Joueur_5', '1,2,3,4,5', '1,2')
+            response = self.app.post('/generate_players', data={'num_players': '6'})
+        finally:
+            app.config['BULK_INSERT_BATCH_SIZE'] = 1000
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("aucun joueur n&#39;a été ajouté", response.get_data(as_text=True))
+        self.assertEqual(self.storage.count_players(), 1)
+
+    def test_capacity_from_config(self):
+        app.config['MAX_PLAYERS'] = 6
+        app.config['BULK_INSERT_BATCH_SIZE'] = 2
+        try:
+            response = self.app.post('/generate_players', data={'num_players': '5'})
+            self.assertIn("Il reste <strong id=\"remaining-slots\">1</strong>", response.get_data(as_text=True))
+            self.assertEqual([row[1] for row in self.storage.list_players()], [f"Joueur_{i}" for i in range(1, 6)])
+            self.add_player('Alice', '1,2,3,4,5', '1,2')
+            response = self.add_player('Bob', '1,2,3,4,5', '1,2')
+            self.assertIn("Le nombre maximum de 6 participants a été atteint.", response.get_data(as_text=True))
+            response = self.app.post('/delete_players')
+            self.assertIn("Il reste <strong id=\"remaining-slots\">6</strong>", response.get_data(as_text=True))
+        finally:
+            app.config['MAX_PLAYERS'] = 100
+            app.config['BULK_INSERT_BATCH_SIZE'] = 1000
+
+    def test_concurrent_duplicate_submissions(self):
+        # Plusieurs soumissions simultanées du même nom : une seule doit réussir
+        barrier = threading.Barrier(8)
+        messages = []
+
+        def submit():
+            client = app.test_client()
+            barrier.wait()
+            response = client.post('/add_player', data={
+                'name': 'Concurrent',
+                'chosen_numbers': '1,2,3,4,5',
+                'chosen_stars': '1,2'
+            })
+            messages.append(response.get_data(as_text=True))
+
+        threads = [threading.Thread(target=submit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum("a été ajouté avec succès" in m for m in messages), 1)
+        self.assertEqual(sum("existe déjà" in m for m in messages), 7)
+        self.assertEqual(self.storage.count_players(), 1)
+
+    def test_generate_players_and_list(self):
+        self.app.post('/generate_players', data={'num_players': '12'})
+        self.assertEqual(self.storage.count_players(), 12)
+        data = json.loads(self.app.get('/all_players').get_data(as_text=True))
+        self.assertEqual([player['name'] for player in data], [f"Joueur_{i}" for i in range(1, 13)])
+
+    def test_all_players_keyset_pagination(self):
+        self.app.post('/generate_players', data={'num_players': '12'})
+        names = []
+        after = 0
+        while True:
+            response = self.app.get(f'/all_players?after={after}&limit=5')
+            names += [player['name'] for player in json.loads(response.get_data(as_text=True))]
+            after = response.headers.get('X-Next-Cursor')
+            if after is None:
+                break
+        self.assertEqual(names, [f"Joueur_{i}" for i in range(1, 13)])
+        self.assertEqual(self.app.get('/all_players?limit=0').status_code, 400)
+        self.assertEqual(self.app.get('/all_players?after=abc').status_code, 400)
+
+    def test_update_prize_and_delete(self):
+        response = self.app.post('/update_prize', data=json.dumps({'prize': '5000000'}),
+                                 content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.storage.get_prize(), 5000000)
+
+        self.add_player('TestPlayer', '1,2,3,4,5', '1,2')
+        self.app.post('/delete_players')
+        self.assertEqual(self.storage.count_players(), 0)
+
+
+class MemoryPlayerRoutesTestCase(MemoryBackend, PlayerRoutesMixin, unittest.TestCase):
+    pass
+
+
+class SQLitePlayerRoutesTestCase(SQLiteBackend, PlayerRoutesMixin, unittest.TestCase):
+    pass
+
+
+class MemoryBitmaskPlayerRoutesTestCase(MemoryBitmaskBackend, PlayerRoutesMixin, unittest.TestCase):
+    pass
+
+
+class SQLiteBitmaskPlayerRoutesTestCase(SQLiteBitmaskBackend, PlayerRoutesMixin, unittest.TestCase):
+    pass
+
+
+if __name__ == '__main__':
+    unittest.main()
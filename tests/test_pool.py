@@ -0,0 +1,93 @@
+# tests/test_pool.py
+
+import threading
+import time
+import unittest
+from pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    """Connexion factice pour tester le pool sans serveur MySQL."""
+
+    def __init__(self):
+        self.closed = False
+        self.alive = True
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise Exception("connexion perdue")
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+
+    def connect(self):
+        conn = FakeConnection()
+        self.created.append(conn)
+        return conn
+
+    def test_connection_is_reused(self):
+        pool = ConnectionPool(self.connect, size=2, max_overflow=0)
+        conn = pool.checkout()
+        pool.checkin(conn)
+        self.assertIs(pool.checkout(), conn)
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(conn.rollbacks, 1)
+
+    def test_overflow_connections_are_closed(self):
+        pool = ConnectionPool(self.connect, size=1, max_overflow=1)
+        first = pool.checkout()
+        second = pool.checkout()
+        pool.checkin(first)
+        pool.checkin(second)
+        self.assertTrue(second.closed)
+        self.assertEqual(pool.stats()['open'], 1)
+
+    def test_exhausted_pool_times_out(self):
+        pool = ConnectionPool(self.connect, size=1, max_overflow=0, timeout=0.05)
+        pool.checkout()
+        with self.assertRaises(PoolTimeoutError):
+            pool.checkout()
+        stats = pool.stats()
+        self.assertEqual(stats['exhausted'], 1)
+        self.assertEqual(stats['timeouts'], 1)
+
+    def test_exhausted_pool_waits_for_checkin(self):
+        pool = ConnectionPool(self.connect, size=1, max_overflow=0, timeout=2)
+        conn = pool.checkout()
+        timer = threading.Timer(0.05, pool.checkin, args=(conn,))
+        timer.start()
+        self.assertIs(pool.checkout(), conn)
+        timer.join()
+        stats = pool.stats()
+        self.assertEqual(stats['exhausted'], 1)
+        self.assertGreater(stats['wait_time_max'], 0)
+
+    def test_dead_connection_is_replaced(self):
+        pool = ConnectionPool(self.connect, size=1, max_overflow=0)
+        conn = pool.checkout()
+        pool.checkin(conn)
+        conn.alive = False
+        new_conn = pool.checkout()
+        self.assertIsNot(new_conn, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()['ping_failures'], 1)
+
+    def test_old_connection_is_recycled(self):
+        pool = ConnectionPool(self.connect, size=1, max_overflow=0, recycle=0.01)
+        conn = pool.checkout()
+        pool.checkin(conn)
+        time.sleep(0.02)
+        self.assertIsNot(pool.checkout(), conn)
+        self.assertEqual(pool.stats()['connections_recycled'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
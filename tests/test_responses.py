@@ -0,0 +1,120 @@
+# tests/test_responses.py
+
+import json
+import unittest
+from app import app
+from tests.backends import (MemoryBackend, MemoryBitmaskBackend, SQLiteBackend, SQLiteBitmaskBackend,
+                            StorageAppMixin)
+
+
+class ResponseMixin(StorageAppMixin):
+    """Réponses en flux, requêtes conditionnelles et cache des réponses."""
+
+    def test_streaming_responses(self):
+        app.config['STREAM_CHUNK_SIZE'] = 4
+        self.app.post('/generate_players', data={'num_players': '10'})
+        expected = json.loads(self.app.get('/all_players').get_data(as_text=True))
+
+        response = self.app.get('/all_players?stream=1')
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(json.loads(response.get_data(as_text=True)), expected)
+
+        response = self.app.get('/all_players?format=ndjson')
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], expected)
+
+        self.app.get('/generate_jackpot')
+        expected = json.loads(self.app.get('/ranking?limit=10').get_data(as_text=True))
+        streamed = json.loads(self.app.get('/ranking?limit=10&stream=1').get_data(as_text=True))
+        self.assertEqual(streamed, expected)
+        # Au-delà de PLAYERS_PAGE_MAX, seul le flux est accepté
+        limit = app.config['PLAYERS_PAGE_MAX'] + 1
+        self.assertEqual(self.app.get(f'/ranking?limit={limit}').status_code, 400)
+        self.assertEqual(self.app.get(f'/ranking?limit={limit}&stream=1').status_code, 200)
+
+        self.storage.delete_players()
+        self.assertEqual(json.loads(self.app.get('/all_players?stream=1').get_data(as_text=True)), [])
+        app.config['STREAM_CHUNK_SIZE'] = 1000
+
+    def test_conditional_get(self):
+        self.add_player('Alice', '1,2,3,4,5', '1,2')
+        for url in ['/ranking', '/all_players', '/classement', '/index']:
+            response = self.app.get(url)
+            etag = response.headers['ETag']
+            last_modified = response.headers['Last-Modified']
+            self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+            response = self.app.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.get_data(), b'')
+            # If-Modified-Since seul n'est pas suffisant : précision à la seconde
+            response = self.app.get(url, headers={'If-Modified-Since': last_modified})
+            self.assertEqual(response.status_code, 200)
+
+        # Des paramètres différents donnent une autre ressource
+        etag = self.app.get('/ranking').headers['ETag']
+        self.assertNotEqual(self.app.get('/ranking?limit=5').headers['ETag'], etag)
+
+        # Toute écriture change la version
+        for write in [lambda: self.add_player('Bob', '6,7,8,9,10', '3,4'),
+                      lambda: self.app.post('/generate_players', data={'num_players': '2'}),
+                      lambda: self.app.get('/generate_jackpot'),
+                      lambda: self.app.post('/update_prize', data=json.dumps({'prize': '4000000'}),
+                                            content_type='application/json'),
+                      lambda: self.app.post('/delete_players')]:
+            write()
+            response = self.app.get('/ranking', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response.headers['ETag'], etag)
+            etag = response.headers['ETag']
+
+    def test_conditional_get_after_write_in_same_second(self):
+        response = self.app.get('/all_players')
+        self.assertEqual(json.loads(response.get_data(as_text=True)), [])
+        last_modified = response.headers['Last-Modified']
+        etag = response.headers['ETag']
+        self.add_player('Alice', '1,2,3,4,5', '1,2')
+        for headers in ({'If-Modified-Since': last_modified}, {'If-None-Match': etag},
+                        {'If-None-Match': etag, 'If-Modified-Since': last_modified}):
+            response = self.app.get('/all_players', headers=headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([p['name'] for p in json.loads(response.get_data(as_text=True))], ['Alice'])
+
+    def test_response_cache(self):
+        self.app.post('/generate_players', data={'num_players': '5'})
+        first = self.app.get('/all_players?limit=2')
+        second = self.app.get('/all_players?limit=2')
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.headers['X-Next-Cursor'], first.headers['X-Next-Cursor'])
+        stats = json.loads(self.app.get('/cache_stats').get_data(as_text=True))
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+        # Une route d'écriture vide le cache et la nouvelle version donne une nouvelle entrée
+        self.add_player('Alice', '1,2,3,4,5', '1,2')
+        self.assertEqual(json.loads(self.app.get('/cache_stats').get_data(as_text=True))['entries'], 0)
+        players = json.loads(self.app.get('/all_players').get_data(as_text=True))
+        self.assertEqual(players[-1]['name'], 'Alice')
+
+        # Une écriture hors des routes change aussi la version : pas de réponse périmée
+        self.storage.delete_players()
+        self.assertEqual(json.loads(self.app.get('/all_players').get_data(as_text=True)), [])
+
+
+class MemoryResponseTestCase(MemoryBackend, ResponseMixin, unittest.TestCase):
+    pass
+
+
+class SQLiteResponseTestCase(SQLiteBackend, ResponseMixin, unittest.TestCase):
+    pass
+
+
+class MemoryBitmaskResponseTestCase(MemoryBitmaskBackend, ResponseMixin, unittest.TestCase):
+    pass
+
+
+class SQLiteBitmaskResponseTestCase(SQLiteBitmaskBackend, ResponseMixin, unittest.TestCase):
+    pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+# tests/test_scoring.py
+
+from itertools import permutations
+import random
+import unittest
+from app import (
+    app, reset_storage, compareResultsWithJackpot, distribute_gains, assign_ranks, new_draw, run_draw
+)
+from scoring import (
+    NUMBER_PENALTY, STAR_PENALTY, counting_sort_players, fixed_width, greedy_distance, parse_fixed_grid, parse_grid
+)
+
+
+# Boucle gloutonne d'origine de compareResultsWithJackpot, conservée comme référence
+def reference_distance(player_values, winning_values, penalty):
+    proximity = 0
+    temp_player_values = list(player_values)
+    for win in winning_values:
+        if not temp_player_values:
+            proximity += penalty
+            continue
+        closest = min(temp_player_values, key=lambda x: abs(win - x))
+        proximity += abs(win - closest)
+        temp_player_values.remove(closest)
+    return proximity
+
+
+class ScoringEngineTestCase(unittest.TestCase):
+    def setUp(self):
+        app.config['TESTING'] = True
+        app.config['STORAGE_BACKEND'] = 'memory'
+        self.storage = reset_storage()
+        self.app_context = app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+        app.config['SCORING_ENGINE'] = 'python'
+        app.config['SCORING_WORKERS'] = None
+        app.config['SCORING_MIN_SHARD'] = 50000
+        app.config['BULK_INSERT_BATCH_SIZE'] = 1000
+        app.config['RANKING_SORT'] = 'sort'
+        app.config['TICKET_ENCODING'] = 'csv'
+        app.config['STORAGE_BACKEND'] = 'mysql'
+        reset_storage()
+
+    def seed(self, count, rng):
+        rows = [
+            (f"Joueur_{i}",
+             ",".join(map(str, rng.sample(range(1, 50), 5))),
+             ",".join(map(str, rng.sample(range(1, 10), 2))),
+             0.0)
+            for i in range(1, count + 1)
+        ]
+        self.storage.add_players(rows)
+
+    def score(self, engine, winning_numbers, winning_stars):
+        app.config['SCORING_ENGINE'] = engine
+        return distribute_gains(compareResultsWithJackpot(winning_numbers, winning_stars))
+
+    def assert_engines_agree(self, winning_numbers, winning_stars, engine='numpy'):
+        expected = self.score('python', winning_numbers, winning_stars)
+        actual = self.score(engine, winning_numbers, winning_stars)
+        self.assertEqual(actual, expected)
+
+    def use_parallel_shards(self):
+        # Trois processus même pour un petit pool
+        app.config['SCORING_WORKERS'] = 3
+        app.config['SCORING_MIN_SHARD'] = 1
+
+    def test_numpy_engine_matches_python_engine(self):
+        rng = random.Random(42)
+        self.seed(500, rng)
+        for _ in range(50):
+            self.assert_engines_agree(rng.sample(range(1, 50), 5), rng.sample(range(1, 10), 2))
+
+    def test_numpy_engine_matches_python_engine_with_masks(self):
+        app.config['TICKET_ENCODING'] = 'bitmask'
+        self.storage = reset_storage()
+        rng = random.Random(3)
+        self.seed(300, rng)
+        for _ in range(20):
+            self.assert_engines_agree(rng.sample(range(1, 50), 5), rng.sample(range(1, 10), 2))
+
+    def test_numpy_engine_without_any_match(self):
+        # Aucun numéro ni étoile commun : tri par somme de proximité
+        self.storage.add_players([
+            ('Joueur_1', '1,2,3,4,5', '1,2', 0.0),
+            ('Joueur_2', '6,7,8,9,10', '1,2', 0.0),
+            ('Joueur_3', '45,46,47,48,49', '3,4', 0.0),
+        ])
+        self.assert_engines_agree([20, 21, 22, 23, 24], [8, 9])
+
+    def test_numpy_engine_with_ties(self):
+        self.storage.add_players([(f"Joueur_{i}", '1,2,3,4,5', '1,2', 0.0) for i in range(1, 15)])
+        self.assert_engines_agree([3, 10, 20, 30, 40], [2, 9])
+
+    def test_parallel_engine_matches_python_engine(self):
+        self.use_parallel_shards()
+        rng = random.Random(19)
+        self.seed(400, rng)
+        for _ in range(10):
+            self.assert_engines_agree(rng.sample(range(1, 50), 5), rng.sample(range(1, 10), 2), 'parallel')
+
+    def test_parallel_engine_with_masks(self):
+        app.config['TICKET_ENCODING'] = 'bitmask'
+        self.storage = reset_storage()
+        self.use_parallel_shards()
+        rng = random.Random(12)
+        self.seed(200, rng)
+        for _ in range(5):
+            self.assert_engines_agree(rng.sample(range(1, 50), 5), rng.sample(range(1, 10), 2), 'parallel')
+
+    def test_fixed_width_parse_matches_parse_grid(self):
+        rng = random.Random(8)
+        values = [",".join(map(str, rng.sample(range(1, 50), 5))) for _ in range(1000)] + ['1,2,3,4,5', '45,46,47,48,49']
+        self.assertEqual(parse_fixed_grid(fixed_width(values), 5).tolist(), parse_grid(values, 5).tolist())
+        with self.assertRaises(ValueError):
+            parse_fixed_grid(fixed_width(['1,2,3,4']), 5)
+
+    def test_parallel_engine_without_any_match(self):
+        # Le tri par somme de proximité dépend de l'ensemble du pool, pas de chaque tranche
+        self.use_parallel_shards()
+        self.storage.add_players([
+            ('Joueur_1', '1,2,3,4,5', '1,2', 0.0),
+            ('Joueur_2', '45,46,47,48,49', '3,4', 0.0),
+            ('Joueur_3', '6,7,8,9,10', '1,2', 0.0),
+            ('Joueur_4', '11,12,13,14,15', '3,4', 0.0),
+            ('Joueur_5', '20,21,22,23,24', '8,9', 0.0),
+            ('Joueur_6', '31,32,33,34,35', '1,3', 0.0),
+        ])
+        self.assert_engines_agree([25, 26, 27, 28, 29], [5, 6], 'parallel')
+        self.assert_engines_agree([1, 26, 27, 28, 29], [5, 6], 'parallel')
+
+    def assert_sorts_agree(self, winning_numbers, winning_stars):
+        app.config['RANKING_SORT'] = 'sort'
+        expected = self.score('python', winning_numbers, winning_stars)
+        app.config['RANKING_SORT'] = 'counting'
+        self.assertEqual(self.score('python', winning_numbers, winning_stars), expected)
+
+    def test_counting_sort_matches_list_sort(self):
+        rng = random.Random(21)
+        self.seed(500, rng)
+        for _ in range(30):
+            self.assert_sorts_agree(rng.sample(range(1, 50), 5), rng.sample(range(1, 10), 2))
+
+    def test_counting_sort_without_any_match(self):
+        self.storage.add_players([
+            ('Joueur_1', '1,2,3,4,5', '1,2', 0.0),
+            ('Joueur_2', '45,46,47,48,49', '3,4', 0.0),
+            ('Joueur_3', '6,7,8,9,10', '1,2', 0.0),
+            ('Joueur_4', '10,9,8,7,6', '3,4', 0.0),
+        ])
+        self.assert_sorts_agree([20, 21, 22, 23, 24], [8, 9])
+
+    def test_counting_sort_key_bounds(self):
+        # Valeurs extrêmes de chaque critère : la clé compacte garde l'ordre et la stabilité
+        rng = random.Random(7)
+        players = [
+            {'matching_numbers': [0] * rng.randint(0, 5), 'matching_stars': [0] * rng.randint(0, 2),
+             'proximity_numbers': rng.choice([0, 1, 48, 244, 245]), 'proximity_stars': rng.choice([0, 1, 17, 18]),
+             'sum_proximity': 0, 'id': i}
+            for i in range(2000)
+        ]
+        expected = sorted(players, key=lambda x: (
+            -len(x['matching_numbers']), -len(x['matching_stars']), x['proximity_numbers'], x['proximity_stars']))
+        self.assertEqual(counting_sort_players(players), expected)
+
+    def test_array_draw_records_same_ranking(self):
+        # Classement construit par paquets de 7 : le groupe d'égalité payé déborde du premier paquet
+        app.config['BULK_INSERT_BATCH_SIZE'] = 7
+        rng = random.Random(11)
+        self.seed(150, rng)
+        self.storage.add_players([(f"Egal_{i}", '1,2,3,4,6', '1,3', 0.0) for i in range(1, 15)])
+        for winning_numbers, winning_stars in (([1, 2, 3, 4, 5], [1, 2]), ([7, 14, 21, 28, 35], [3, 6])):
+            rankings = []
+            for engine in ('python', 'numpy', 'parallel'):
+                app.config['SCORING_ENGINE'] = engine
+                self.use_parallel_shards()
+                draw_id, _, _ = new_draw()
+                run_draw(draw_id, winning_numbers, winning_stars)
+                self.assertEqual(self.storage.get_draw(draw_id)['player_count'], 164)
+                rankings.append(self.storage.get_ranking(limit=164, draw_id=draw_id))
+            self.assertEqual(rankings[1], rankings[0])
+            self.assertEqual(rankings[2], rankings[0])
+
+    def test_assign_ranks_groups_ties(self):
+        self.storage.add_players([
+            ('Joueur_1', '1,2,3,4,5', '1,2', 0.0),
+            ('Joueur_2', '1,2,3,4,5', '1,2', 0.0),
+            ('Joueur_3', '1,2,3,4,6', '1,2', 0.0),
+        ])
+        players = assign_ranks(compareResultsWithJackpot([1, 2, 3, 4, 5], [1, 2]))
+        self.assertEqual([p['rank_position'] for p in players], [1, 2, 3])
+        self.assertEqual([p['tie_group'] for p in players], [1, 1, 3])
+
+    def test_numpy_engine_empty_pool(self):
+        app.config['SCORING_ENGINE'] = 'numpy'
+        self.assertEqual(compareResultsWithJackpot([1, 2, 3, 4, 5], [1, 2]), [])
+
+
+class GreedyDistanceTestCase(unittest.TestCase):
+    def assert_same_distance(self, player_values, winning_values, penalty):
+        self.assertEqual(
+            greedy_distance(player_values, winning_values, penalty),
+            reference_distance(player_values, winning_values, penalty),
+            (player_values, winning_values)
+        )
+
+    def test_all_star_grids(self):
+        # Toutes les grilles d'étoiles ordonnées contre tous les tirages ordonnés, y compris les restes partiels
+        grids = [list(p) for size in range(3) for p in permutations(range(1, 10), size)]
+        for player_values in grids:
+            for winning_values in grids:
+                self.assert_same_distance(player_values, winning_values, STAR_PENALTY)
+
+    def test_all_small_grids(self):
+        # Univers réduit mais exhaustif : jusqu'à 3 valeurs parmi 1..8, toutes les longueurs et tous les ordres
+        grids = [list(p) for size in range(4) for p in permutations(range(1, 9), size)]
+        for player_values in grids:
+            for winning_values in grids:
+                self.assert_same_distance(player_values, winning_values, NUMBER_PENALTY)
+
+    def test_random_number_grids(self):
+        rng = random.Random(20)
+        for _ in range(50000):
+            size = rng.randint(0, 5)
+            self.assert_same_distance(rng.sample(range(1, 50), size), rng.sample(range(1, 50), rng.randint(0, 5)), NUMBER_PENALTY)
+            # Égalités de distance : valeurs symétriques autour d'un numéro gagnant
+            win = rng.randint(6, 44)
+            offsets = rng.sample(range(1, 6), 2)
+            symmetric = [win - offsets[0], win + offsets[0], win + offsets[1], win - offsets[1]]
+            rng.shuffle(symmetric)
+            self.assert_same_distance(symmetric, [win] + rng.sample(range(1, 50), rng.randint(0, 3)), NUMBER_PENALTY)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# tests/test_simulator.py
+
+import json
+import random
+import unittest
+import numpy as np
+from app import app, reset_storage, are_players_equal, compareResultsWithJackpot
+from payout import distribute_payout
+from simulator import random_draws, simulate_draws
+
+
+class SimulatorTestCase(unittest.TestCase):
+    def setUp(self):
+        app.config['TESTING'] = True
+        app.config['STORAGE_BACKEND'] = 'memory'
+        self.storage = reset_storage()
+        self.client = app.test_client()
+        self.app_context = app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+        app.config['STORAGE_BACKEND'] = 'mysql'
+        reset_storage()
+
+    def seed(self, count, rng):
+        self.storage.add_players([
+            (f"Joueur_{i}",
+             ",".join(map(str, rng.sample(range(1, 50), 5))),
+             ",".join(map(str, rng.sample(range(1, 10), 2))),
+             0.0)
+            for i in range(1, count + 1)
+        ])
+
+    def test_matches_draw_pipeline(self):
+        # Mêmes tirages rejoués avec compareResultsWithJackpot et le moteur de gains en centimes
+        self.seed(60, random.Random(24))
+        self.storage.set_prize(1000000)
+        draws = 200
+        report = simulate_draws(self.storage.get_tickets(), 'csv', 1000000, draws, seed=7, batch_rows=60 * 16, top=60)
+
+        # Tirages générés par lots de 16, comme dans simulate_draws
+        rng = np.random.default_rng(7)
+        batches = [random_draws(rng, min(16, draws - offset)) for offset in range(0, draws, 16)]
+        numbers = np.concatenate([batch[0] for batch in batches])
+        stars = np.concatenate([batch[1] for batch in batches])
+        expected = {}
+        zero_match_draws = 0
+        for winning_numbers, winning_stars in zip(numbers.tolist(), stars.tolist()):
+            players = distribute_payout(compareResultsWithJackpot(winning_numbers, winning_stars), 1000000, are_players_equal)
+            if not any(p['matching_numbers'] or p['matching_stars'] for p in players):
+                zero_match_draws += 1
+            for player in players:
+                expected[player['id']] = expected.get(player['id'], 0) + round(player['gains'] * 100)
+
+        self.assertEqual(report['zero_match_draws'], zero_match_draws)
+        actual = {p['id']: round(p['expected_gains'] * draws * 100) for p in report['players']}
+        self.assertEqual(actual, expected)
+        self.assertAlmostEqual(report['payout']['total_paid']['mean'], 1000000, delta=0.01 * 1000000)
+
+    def test_zero_match_pool(self):
+        # Une seule grille : aucune correspondance avec une probabilité C(44,5)/C(49,5) * C(7,2)/C(9,2)
+        report = simulate_draws([(1, 'Joueur_1', '1,2,3,4,5', '1,2')], 'csv', 100, 20000, seed=1)
+        self.assertAlmostEqual(report['zero_match_probability'], 0.334, delta=0.015)
+        self.assertEqual(report['players'][0]['expected_gains'], 100.0)
+        self.assertEqual(report['players'][0]['win_probability'], 1.0)
+
+    def test_simulate_route_writes_nothing(self):
+        self.seed(30, random.Random(1))
+        version = self.storage.get_data_version()
+        response = self.client.get('/simulate?draws=500&seed=3&top=5')
+        self.assertEqual(response.status_code, 200)
+        report = response.get_json()
+        self.assertEqual(report['draws'], 500)
+        self.assertEqual(len(report['players']), 5)
+        self.assertEqual(self.client.get('/simulate?draws=500&seed=3&top=5').get_json()['players'], report['players'])
+        self.assertEqual(self.storage.get_data_version(), version)
+        self.assertIsNone(self.storage.current_draw_id())
+        self.assertEqual(self.storage.list_draws(), [])
+
+    def test_simulate_route_rejects_invalid_parameters(self):
+        self.assertEqual(self.client.get('/simulate').status_code, 400)  # aucun joueur
+        self.seed(5, random.Random(2))
+        for query in ('draws=0', 'draws=abc', f"draws={app.config['SIMULATION_MAX_DRAWS'] + 1}", 'top=-1', 'seed=-3'):
+            self.assertEqual(self.client.get(f'/simulate?{query}').status_code, 400, query)
+
+    def test_simulate_command(self):
+        self.seed(10, random.Random(3))
+        result = app.test_cli_runner().invoke(args=['simulate', '--draws', '100', '--seed', '5', '--top', '3'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        report = json.loads(result.output)
+        self.assertEqual(report['draws'], 100)
+        self.assertEqual(len(report['players']), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# tests/test_storage.py
+
+import json
+import unittest
+from app import compareResultsWithJackpot
+from tests.backends import (MemoryBackend, MemoryBitmaskBackend, SQLiteBackend, SQLiteBitmaskBackend,
+                            StorageAppMixin)
+
+
+class StorageMixin(StorageAppMixin):
+    """Méthodes du stockage, exécutées sur chaque stockage sans serveur MySQL."""
+
+    def test_add_players_in_batches(self):
+        self.storage.batch_size = 10
+        rows = [(f"Joueur_{i}", '1,2,3,4,5', '1,2', 0.0) for i in range(1, 26)]
+        self.assertEqual(self.storage.add_players(rows), 25)
+        self.assertEqual(self.storage.count_players(), 25)
+        response = self.app.post('/generate_players', data={'num_players': '5'})
+        self.assertIn("Il reste <strong id=\"remaining-slots\">70</strong>", response.get_data(as_text=True))
+
+    def test_add_results_by_id(self):
+        self.storage.batch_size = 2
+        self.storage.add_players([(f"Joueur_{i}", '1,2,3,4,5', '1,2', 0.0) for i in range(1, 6)])
+        players = compareResultsWithJackpot([1, 2, 10, 11, 12], [1, 3])
+        for position, player in enumerate(players):
+            player['gains'] = float(position)
+        draw_id = self.storage.record_draw('1,2,10,11,12', '1,3', 3000000, players)
+        gains = {row[0]: row[3] for row in self.storage.get_ranking()}
+        self.assertEqual(gains, {p['name']: p['gains'] for p in players})
+        self.assertEqual(self.storage.get_draw()['player_count'], 5)
+        self.assertEqual(self.storage.current_draw_id(), draw_id)
+
+
+class MemoryStorageTestCase(MemoryBackend, StorageMixin, unittest.TestCase):
+    pass
+
+
+class SQLiteStorageTestCase(SQLiteBackend, StorageMixin, unittest.TestCase):
+    def test_count_comes_from_counter(self):
+        self.app.post('/generate_players', data={'num_players': '4'})
+        self.add_player('Alice', '1,2,3,4,5', '1,2')
+        self.assertEqual(self.storage.count_players(), 5)
+        # Une insertion directe ne passe pas par le compteur : recount_players le resynchronise
+        self.storage.connection().execute(
+            "INSERT INTO players (name, chosen_numbers, chosen_stars) VALUES ('Bob', '1,2,3,4,5', '1,2')")
+        self.storage.connection().commit()
+        self.assertEqual(self.storage.count_players(), 5)
+        self.assertEqual(self.storage.recount_players(), 6)
+        self.app.post('/delete_players')
+        self.assertEqual(self.storage.count_players(), 0)
+
+    def test_wal_mode(self):
+        mode = self.storage.connection().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, 'wal')
+
+
+class MemoryBitmaskStorageTestCase(MemoryBitmaskBackend, StorageMixin, unittest.TestCase):
+    pass
+
+
+class SQLiteBitmaskStorageTestCase(SQLiteBitmaskBackend, SQLiteStorageTestCase):
+    def test_ranking_reads_masks(self):
+        self.add_player('Alice', '10,20,30,40,49', '2,1')
+        row = self.storage.get_tickets()[0]
+        self.assertEqual(row[2:], (2 ** 10 + 2 ** 20 + 2 ** 30 + 2 ** 40 + 2 ** 49, 2 ** 1 + 2 ** 2))
+        self.app.get('/generate_jackpot')
+        ranking = json.loads(self.app.get('/ranking').get_data(as_text=True))
+        self.assertEqual(ranking[0]['chosen_numbers'], [10, 20, 30, 40, 49])
+        self.assertEqual(ranking[0]['chosen_stars'], [1, 2])
+
+    def test_migrate_from_csv_columns(self):
+        # Joueurs enregistrés avant l'activation des masques
+        self.storage.ticket_encoding = 'csv'
+        self.storage.add_players([(f"Joueur_{i}", '5,1,9,33,49', '9,1', 0.0) for i in range(1, 8)])
+        self.storage.record_draw('5,49,2,3,4', '2,3', 3000000, [
+            {'id': row[0], 'name': row[1], 'chosen_numbers': [5, 1, 9, 33, 49], 'chosen_stars': [9, 1], 'gains': 0.0,
+             'matching_numbers': [5, 49], 'matching_stars': [], 'proximity_numbers': 3, 'proximity_stars': 4}
+            for row in self.storage.get_tickets()
+        ])
+        self.storage.batch_size = 3
+        self.assertEqual(self.storage.migrate_bitmask(), 7)
+        self.assertEqual(self.storage.migrate_bitmask(), 0)
+
+        self.storage.ticket_encoding = 'bitmask'
+        players = json.loads(self.app.get('/all_players').get_data(as_text=True))
+        self.assertEqual(len(players), 7)
+        self.assertEqual(players[0]['chosen_numbers'], [1, 5, 9, 33, 49])
+        ranking = json.loads(self.app.get('/ranking').get_data(as_text=True))
+        self.assertEqual(ranking[0]['matching_numbers'], [5, 49])
+        self.assertEqual(ranking[0]['chosen_numbers'], [1, 5, 9, 33, 49])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+# tests/test_tickets.py
+
+import random
+import unittest
+from tickets import csv_to_mask, from_mask, mask_count, parse_csv, to_mask
+
+
+class TicketEncodingTestCase(unittest.TestCase):
+    def test_round_trip(self):
+        rng = random.Random(7)
+        for _ in range(1000):
+            numbers = rng.sample(range(1, 50), 5)
+            stars = rng.sample(range(1, 10), 2)
+            self.assertEqual(from_mask(to_mask(numbers)), sorted(numbers))
+            self.assertEqual(from_mask(to_mask(stars)), sorted(stars))
+
+    def test_extreme_values(self):
+        self.assertEqual(from_mask(to_mask([1, 16, 17, 32, 33, 48, 49])), [1, 16, 17, 32, 33, 48, 49])
+        self.assertEqual(from_mask(0), [])
+        self.assertLess(to_mask(range(1, 50)), 2 ** 64)
+        self.assertLess(to_mask(range(1, 10)), 2 ** 16)
+
+    def test_csv_helpers(self):
+        self.assertEqual(parse_csv('3,12,27'), [3, 12, 27])
+        self.assertEqual(parse_csv(''), [])
+        self.assertEqual(csv_to_mask(None), 0)
+        self.assertEqual(mask_count(csv_to_mask('3,12,27')), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# Encodage compact des grilles : un bit par numéro (bits 1 à 49) et par étoile (bits 1 à 9)
+
+# Positions des bits à 1 pour chaque valeur sur 16 bits, construites au premier usage
+_BITS16 = None
+
+
+def _bits16():
+    global _BITS16
+    if _BITS16 is None:
+        table = [()] * 65536
+        for value in range(1, 65536):
+            low = value & -value
+            table[value] = (low.bit_length() - 1,) + table[value ^ low]
+        _BITS16 = table
+    return _BITS16
+
+
+# Liste de numéros -> masque (numéros entre 1 et 63)
+def to_mask(values):
+    mask = 0
+    for value in values:
+        mask |= 1 << value
+    return mask
+
+
+# Masque -> liste croissante des numéros, par consultation de table 16 bits
+def from_mask(mask):
+    if not mask:
+        return []
+    table = _bits16()
+    if mask < 65536:
+        return list(table[mask])
+    return (
+        list(table[mask & 0xFFFF]) +
+        [bit + 16 for bit in table[(mask >> 16) & 0xFFFF]] +
+        [bit + 32 for bit in table[(mask >> 32) & 0xFFFF]] +
+        [bit + 48 for bit in table[(mask >> 48) & 0xFFFF]]
+    )
+
+
+# Chaîne CSV ("3,12,27") -> liste d'entiers
+def parse_csv(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+# Chaîne CSV -> masque (utilisé à l'insertion et lors de la migration)
+def csv_to_mask(value):
+    if not value:
+        return 0
+    return to_mask(parse_csv(value))
+
+
+# Nombre de numéros présents dans un masque
+def mask_count(mask):
+    return bin(mask).count('1')